@@ -0,0 +1,356 @@
+"""
+KoSimCSENewsPipeline 클러스터링 벤치마크
+
+실시간 수집 데이터 없이 군집 설정/백엔드 변경을 비교하기 위한 스위트.
+코퍼스 두 종류에 대해 파이프라인 단계를 그대로(run_clustering → run_methods 병렬 실행·시간 예산 포함) 실행한다.
+  - synthetic : 정규화된 가우시안 혼합(768차원, 크기 1k → 50k), 정답 = 혼합 성분
+  - snapshot  : 이전 실행이 저장한 임베딩 아티팩트(run_*.json manifest, cluster_artifacts)
+측정 항목(코퍼스 × 파이프라인마다 별도 프로세스에서 실행 → 최대 RSS 분리):
+  - 단계별 wall time: load, encode(임베딩 준비), clustering(run_clustering 전체), metrics(analyze 포함), save
+    + clustering 세부(파이프라인 tracer 구간): 방법별 clustering:*, reduce(투영 fit+transform), postprocess
+  - 최대 RSS(MB, 방법 워커 프로세스는 peak_child_rss_mb 로 따로), 단계 종료 시점 RSS
+  - 방법별·최종 품질: silhouette, ARI, purity (정답 = category 컬럼)
+encode 는 모델 추론이 아니라 임베딩 행렬 준비 시간이다(합성 생성 / 스냅샷 로드·정규화).
+필요한 패키지가 설치되지 않은 방법(예: hdbscan 없는 HDBSCAN)은 건너뛰고 결과의 skipped_methods 에 기록한다.
+
+결과는 JSON(기본 model/results/benchmarks/clustering_{ts}.json)으로 저장하고,
+--baseline 으로 이전 결과를 주면 시간 증가·품질 하락이 허용치를 넘을 때 종료 코드 1로 실패한다.
+
+사용 예:
+    python model/benchmarks/clustering_suite.py --sizes 1000,5000
+    python model/benchmarks/clustering_suite.py --pipeline main,test --sizes 1000,5000,10000,20000,50000
+    python model/benchmarks/clustering_suite.py --snapshot model/results/cluster_results --sizes ""
+    python model/benchmarks/clustering_suite.py --sizes 1000,5000 --baseline prev.json --tolerance 0.25
+"""
+import os
+import sys
+import json
+import time
+import argparse
+import resource
+import importlib.util
+import tempfile
+import subprocess
+from datetime import datetime
+from pathlib import Path
+
+import numpy as np
+
+HERE = Path(__file__).resolve()
+MODEL_DIR = HERE.parents[1]
+PIPE_DIRS = {
+    "main": MODEL_DIR / "main_pipeline",
+    "test": MODEL_DIR / "test_pipeline",
+}
+DEFAULT_OUT_DIR = MODEL_DIR / "results" / "benchmarks"
+DEFAULT_METHODS = {"main": ["HDBSCAN", "K-Means", "DBSCAN"], "test": ["CATEGORY_TOP3"]}
+QUALITY_KEYS = ("silhouette", "ari", "purity")
+# 방법별 선택 의존 패키지(import 이름)
+METHOD_DEPENDENCIES = {"HDBSCAN": ("hdbscan",)}
+
+
+# ---------------------------------------------------------------- 워커(코퍼스 × 파이프라인 1건)
+
+def _rss_mb() -> float:
+    try:
+        with open("/proc/self/status", "r") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) / 1024.0
+    except OSError:
+        pass
+    return _peak_rss_mb()
+
+
+def _peak_rss_mb(who=resource.RUSAGE_SELF) -> float:
+    peak = resource.getrusage(who).ru_maxrss
+    return peak / (1024.0 * 1024.0) if sys.platform == "darwin" else peak / 1024.0
+
+
+def missing_dependencies(method: str) -> list:
+    return [m for m in METHOD_DEPENDENCIES.get(method, ()) if importlib.util.find_spec(m) is None]
+
+
+class _Phases:
+    def __init__(self):
+        self.records = {}
+
+    def run(self, name, fn, *args, **kwargs):
+        t0 = time.perf_counter()
+        out = fn(*args, **kwargs)
+        self.records[name] = {"seconds": round(time.perf_counter() - t0, 4), "rss_mb": round(_rss_mb(), 1)}
+        return out
+
+    def add_detail(self, name, seconds, **fields):
+        """다른 단계 안에서 잰 세부 구간(합계 시간에는 넣지 않음)"""
+        rec = self.records.setdefault(name, {"seconds": 0.0, "detail": True})
+        rec["seconds"] = round(rec["seconds"] + float(seconds), 4)
+        rec.update(fields)
+
+    @property
+    def total_seconds(self) -> float:
+        return round(sum(r["seconds"] for r in self.records.values() if not r.get("detail")), 4)
+
+
+def _synthetic_corpus(n: int, dim: int, seed: int, spread: float = 1.2, noise_frac: float = 0.05):
+    import pandas as pd
+    rng = np.random.default_rng(seed)
+    k = min(200, max(10, int(np.sqrt(n))))
+    centers = rng.normal(size=(k, dim))
+    y = rng.integers(0, k, n)
+    X = centers[y] + spread * rng.normal(size=(n, dim))
+    outliers = rng.random(n) < noise_frac
+    X[outliers] = rng.normal(size=(int(outliers.sum()), dim)) * 1.5
+    X /= np.linalg.norm(X, axis=1, keepdims=True)
+    cats = np.where(outliers, "noise", np.char.add("c", y.astype(str)))
+    lengths = rng.integers(80, 1000, n)
+    df = pd.DataFrame({
+        "title": [f"합성 기사 {i} (성분 {c})" for i, c in enumerate(cats)],
+        "content": "",
+        "category": cats,
+        "fullText": "",
+        "textLength": lengths.astype("int32"),
+        "index": np.arange(n, dtype="int32"),
+    })
+    return df, X.astype(np.float32), {"clusters": int(k), "spread": spread, "noise_frac": noise_frac}
+
+
+def _snapshot_corpus(path: str):
+    from cluster_artifacts import latest_manifest, load_run_artifacts
+    manifest = Path(path)
+    if manifest.is_dir():
+        manifest = latest_manifest(manifest)
+        if manifest is None:
+            raise FileNotFoundError(f"run_*.json manifest 가 없습니다: {path}")
+    art = load_run_artifacts(manifest, mmap=True)
+    return art["articles"], art["embeddings"], {"manifest": str(manifest)}
+
+
+def _quality(X, labels, true, scoring_params):
+    from sklearn.metrics import adjusted_rand_score
+    from cluster_scoring import ScoringContext
+    from cluster_analytics import purity
+    valid = labels != -1
+    out = {"n_clusters": int(len(set(labels[valid].tolist()))), "noise_ratio": round(float(1 - valid.mean()), 4)}
+    if out["n_clusters"] > 1:
+        sil = ScoringContext(X, scoring_params).silhouette(labels, valid)
+        out["silhouette"] = round(float(sil["score"]), 4)
+        out["ari"] = round(float(adjusted_rand_score(true[valid], labels[valid])), 4)
+        out["purity"] = round(float(purity(labels[valid], true[valid])), 4)
+    return out
+
+
+def run_worker(spec: dict) -> dict:
+    """하나의 (코퍼스, 파이프라인) 조합 실행 → 단계별 기록"""
+    import pandas as pd
+    pipe_dir = PIPE_DIRS[spec["pipeline"]]
+    sys.path.insert(0, str(pipe_dir))
+    import news_cluster as nc
+
+    phases = _Phases()
+    corpus = spec["corpus"]
+
+    def load():
+        if corpus["kind"] == "synthetic":
+            return _synthetic_corpus(corpus["n"], corpus["dim"], corpus["seed"], corpus["spread"])
+        return _snapshot_corpus(corpus["path"])
+
+    def encode(E):
+        E = np.asarray(E, dtype=np.float32)
+        return E / (np.linalg.norm(E, axis=1, keepdims=True) + 1e-12)
+
+    df, E, corpus_info = phases.run("load", load)
+    E = phases.run("encode", encode, E)
+    df = df.reset_index(drop=True)
+
+    out_dir = Path(spec["work_dir"])
+    # 차원 축소 투영은 조합마다 새로 fit(다른 코퍼스의 저장된 투영 재사용 방지) → "reduce" 세부 구간에 fit 시간 포함
+    config = {"clustering_methods": spec["methods"], "trace": True,
+              "reduction_state_dir": str(out_dir / "reduction_state")}
+    config.update(spec.get("config") or {})
+    pipeline = nc.KoSimCSENewsPipeline(config)
+    pipeline.output_dir = out_dir
+    pipeline.articles_df = df
+    pipeline.embeddings = E
+    true = pd.factorize(df["category"])[0]
+
+    methods = {}
+    if spec["pipeline"] == "test":
+        if "top_category" not in df.columns:
+            codes = pd.factorize(df["category"])[0]
+            df["top_category"] = np.asarray(nc.TARGET_CATEGORIES, dtype=object)[codes % len(nc.TARGET_CATEGORIES)]
+        phases.run("clustering:CATEGORY_TOP3", pipeline.run_clustering)
+        methods["CATEGORY_TOP3"] = _quality(E, pipeline.cluster_labels, true, pipeline.config.get("scoring_params"))
+    else:
+        # 운영 경로 그대로: 축소 → run_methods(방법별 워커·시간 예산) → 실루엣 선택 → 후처리
+        results = phases.run("clustering", pipeline.run_clustering)
+        details = {"fit_reduction": "reduce", "reduce_dims": "reduce", "postprocess_labels": "postprocess"}
+        for span in pipeline.tracer.spans:
+            name = span["name"]
+            if name.startswith("cluster:"):
+                phases.add_detail(f"clustering:{name[len('cluster:'):]}", span["wall_s"], status=span.get("status"))
+            elif name in details:
+                phases.add_detail(details[name], span["wall_s"])
+        for name in spec["methods"]:
+            if name in results:
+                methods[name] = _quality(E, results[name], true, pipeline.config["scoring_params"])
+            else:
+                methods[name] = {"status": phases.records.get(f"clustering:{name}", {}).get("status", "error")}
+
+    def metrics():
+        pipeline.analyze_clusters()
+        return pipeline.calculate_metrics()
+
+    final = phases.run("metrics", metrics)
+    phases.run("save", pipeline.save_results)
+
+    return {
+        "pipeline": spec["pipeline"],
+        "corpus": {**corpus, **corpus_info, "n": int(len(df)), "dim": int(E.shape[1])},
+        "best_method": pipeline.best_method,
+        "phases": phases.records,
+        "total_seconds": phases.total_seconds,
+        "peak_rss_mb": round(_peak_rss_mb(), 1),
+        "peak_child_rss_mb": round(_peak_rss_mb(resource.RUSAGE_CHILDREN), 1),
+        "skipped_methods": spec.get("skipped_methods", {}),
+        "methods": methods,
+        "final": {k: (round(float(v), 4) if isinstance(v, (int, float)) else v)
+                  for k, v in (final or {}).items() if k in QUALITY_KEYS + ("n_clusters", "noise_ratio")},
+    }
+
+
+# ---------------------------------------------------------------- 오케스트레이션
+
+def _launch(spec: dict, timeout_s: float) -> dict:
+    """별도 인터프리터에서 워커 실행(최대 RSS 가 조합별로 분리되도록)"""
+    with tempfile.TemporaryDirectory(prefix="news_bench_") as work:
+        spec = {**spec, "work_dir": work}
+        spec_path = Path(work) / "spec.json"
+        result_path = Path(work) / "result.json"
+        spec_path.write_text(json.dumps(spec), encoding="utf-8")
+        t0 = time.perf_counter()
+        try:
+            proc = subprocess.run([sys.executable, str(HERE), "--worker", str(spec_path), str(result_path)],
+                                  capture_output=True, text=True, timeout=timeout_s)
+        except subprocess.TimeoutExpired:
+            return {"pipeline": spec["pipeline"], "corpus": spec["corpus"], "status": "timeout",
+                    "elapsed_s": round(time.perf_counter() - t0, 1)}
+        if proc.returncode != 0 or not result_path.exists():
+            return {"pipeline": spec["pipeline"], "corpus": spec["corpus"], "status": "error",
+                    "error": proc.stderr[-2000:]}
+        result = json.loads(result_path.read_text(encoding="utf-8"))
+        result["status"] = "ok"
+        return result
+
+
+def _case_key(r: dict) -> str:
+    c = r["corpus"]
+    name = f"synthetic-{c['n']}" if c["kind"] == "synthetic" else f"snapshot-{Path(c['path']).name}"
+    return f"{r['pipeline']}/{name}"
+
+
+def compare(current: dict, baseline: dict, tolerance: float) -> list:
+    """baseline 대비 회귀 목록(시간은 (1+tol)배 초과, 품질은 tol 절대값 초과 하락)"""
+    base = {_case_key(r): r for r in baseline.get("runs", []) if r.get("status") == "ok"}
+    problems = []
+    for r in current["runs"]:
+        b = base.get(_case_key(r))
+        if b is None or r.get("status") != "ok":
+            continue
+        key = _case_key(r)
+        for phase, rec in r["phases"].items():
+            old = b["phases"].get(phase, {}).get("seconds")
+            # 아주 짧은 단계는 측정 잡음이 커서 0.5초 미만 차이는 무시
+            if old is not None and rec["seconds"] > old * (1 + tolerance) and rec["seconds"] - old > 0.5:
+                problems.append(f"{key} {phase}: {old:.2f}s → {rec['seconds']:.2f}s")
+        if b.get("peak_rss_mb") and r["peak_rss_mb"] > b["peak_rss_mb"] * (1 + tolerance):
+            problems.append(f"{key} peak RSS: {b['peak_rss_mb']:.0f}MB → {r['peak_rss_mb']:.0f}MB")
+        for q in QUALITY_KEYS:
+            old, new = b["final"].get(q), r["final"].get(q)
+            if old is not None and new is not None and new < old - tolerance * max(abs(old), 0.05):
+                problems.append(f"{key} {q}: {old:.3f} → {new:.3f}")
+    return problems
+
+
+def print_report(report: dict):
+    print(f"\n{'case':<28}{'status':>8}{'total(s)':>10}{'peakMB':>9}{'sil':>8}{'ARI':>8}{'purity':>8}  best")
+    for r in report["runs"]:
+        if r.get("status") != "ok":
+            print(f"{_case_key(r):<28}{r.get('status'):>8}")
+            continue
+        f = r["final"]
+        fmt = lambda v: f"{v:>8.3f}" if isinstance(v, (int, float)) else f"{'-':>8}"
+        print(f"{_case_key(r):<28}{'ok':>8}{r['total_seconds']:>10.2f}{r['peak_rss_mb']:>9.0f}"
+              f"{fmt(f.get('silhouette'))}{fmt(f.get('ari'))}{fmt(f.get('purity'))}  {r['best_method']}")
+        slow = sorted(r["phases"].items(), key=lambda kv: -kv[1]["seconds"])[:4]
+        print("    " + ", ".join(f"{k} {v['seconds']:.2f}s" for k, v in slow))
+
+
+def main():
+    ap = argparse.ArgumentParser(description="KoSimCSENewsPipeline 클러스터링 벤치마크")
+    ap.add_argument("--pipeline", default="main", help="main,test 중 쉼표 구분")
+    ap.add_argument("--sizes", default="1000,5000,10000,20000,50000", help="합성 코퍼스 크기(쉼표 구분, 빈 값이면 생략)")
+    ap.add_argument("--dim", type=int, default=768)
+    ap.add_argument("--seed", type=int, default=42)
+    ap.add_argument("--spread", type=float, default=1.2, help="합성 코퍼스 군집 내 표준편차(차원당, 클수록 어려움)")
+    ap.add_argument("--snapshot", action="append", default=[],
+                    help="run_*.json manifest 또는 그 디렉토리(최신 manifest). 여러 번 지정 가능")
+    ap.add_argument("--methods", default=None, help="main 파이프라인 방법(기본 HDBSCAN,K-Means,DBSCAN)")
+    ap.add_argument("--config", default=None, help="파이프라인 config 덮어쓰기(JSON 문자열)")
+    ap.add_argument("--timeout", type=float, default=3600, help="조합당 제한 시간(초)")
+    ap.add_argument("--out", default=None, help="결과 JSON 경로")
+    ap.add_argument("--baseline", default=None, help="비교할 이전 결과 JSON")
+    ap.add_argument("--tolerance", type=float, default=0.2)
+    ap.add_argument("--worker", nargs=2, metavar=("SPEC", "RESULT"), help=argparse.SUPPRESS)
+    args = ap.parse_args()
+
+    if args.worker:
+        spec = json.loads(Path(args.worker[0]).read_text(encoding="utf-8"))
+        # 파이프라인 진행 로그는 stdout 으로 나가므로 결과는 파일로 전달
+        result = run_worker(spec)
+        Path(args.worker[1]).write_text(json.dumps(result, ensure_ascii=False), encoding="utf-8")
+        return
+
+    pipelines = [p.strip() for p in args.pipeline.split(",") if p.strip()]
+    sizes = [int(s) for s in args.sizes.split(",") if s.strip()]
+    config = json.loads(args.config) if args.config else None
+    corpora = [{"kind": "synthetic", "n": n, "dim": args.dim, "seed": args.seed, "spread": args.spread}
+               for n in sizes]
+    corpora += [{"kind": "snapshot", "path": str(Path(p).resolve())} for p in args.snapshot]
+
+    report = {"created_at": datetime.now().isoformat(), "python": sys.version.split()[0],
+              "cpu_count": os.cpu_count(), "config": config, "runs": []}
+    for pipeline in pipelines:
+        methods = args.methods.split(",") if (args.methods and pipeline == "main") else DEFAULT_METHODS[pipeline]
+        skipped = {m: missing_dependencies(m) for m in methods if missing_dependencies(m)}
+        for m, deps in skipped.items():
+            print(f"⚠️ {pipeline}: {m} 건너뜀 (미설치: {', '.join(deps)})")
+        methods = [m for m in methods if m not in skipped]
+        if not methods:
+            continue
+        for corpus in corpora:
+            spec = {"pipeline": pipeline, "corpus": corpus, "methods": methods, "config": config,
+                    "skipped_methods": skipped}
+            print(f"▶ {pipeline} / {corpus.get('n', corpus.get('path'))} ...", flush=True)
+            report["runs"].append(_launch(spec, args.timeout))
+
+    print_report(report)
+    out = Path(args.out) if args.out else DEFAULT_OUT_DIR / f"clustering_{datetime.now():%Y%m%d_%H%M%S}.json"
+    out.parent.mkdir(parents=True, exist_ok=True)
+    with open(out, "w", encoding="utf-8") as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    print(f"\n결과 저장: {out}")
+
+    if args.baseline:
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            problems = compare(report, json.load(f), args.tolerance)
+        if problems:
+            print(f"\n❌ 회귀 {len(problems)}건 (허용치 {args.tolerance:.0%})")
+            for p in problems:
+                print(f"   - {p}")
+            sys.exit(1)
+        print("\n✅ baseline 대비 회귀 없음")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+"""
+롤링 윈도우 임베딩 저장 정밀도(float32 / float16 / int8) 벤치마크
+
+정밀도 설정(window_precision)이 실제로 쓰이는 경로는 embedding_window 의 과거 기사 보관이다.
+정규화된 가우시안 혼합 임베딩(KoSimCSE 와 같은 768차원)을 정밀도별 EmbeddingWindow 에 넣고
+  - 저장 메모리(bytes, float32 대비 비율), 윈도우 파일(window.npz) 크기, save / load 소요 시간
+  - 재사용 오차: 저장 후 다시 읽어 역양자화한 임베딩과 원본의 최대 절대 오차(윈도우에 있는 기사는 재임베딩 없이 재사용)
+  - 배정 일치도: 같은 새 기사들을 감쇠 가중 중심에 배정(EmbeddingWindow.assign)한 결과가 float32 윈도우와 같은 비율
+  - 재군집 일치도: 역양자화한 과거 임베딩으로 float32 초기 중심에서 K-Means 를 돌린 라벨과의 ARI
+를 측정해 표와 JSON 으로 출력한다.
+
+사용 예:
+    python model/benchmarks/embedding_precision.py
+    python model/benchmarks/embedding_precision.py --n 20000 --k 40 --json precision.json
+"""
+import sys
+import json
+import time
+import argparse
+import tempfile
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import numpy as np
+
+HERE = Path(__file__).resolve()
+sys.path.insert(0, str(HERE.parents[1] / "main_pipeline"))
+
+from embedding_window import ARRAYS_FILE, EmbeddingWindow  # noqa: E402
+from quantized_embeddings import PRECISIONS  # noqa: E402
+
+MODEL_NAME = 'benchmark'
+HALF_LIFE_HOURS = 12.0
+ASSIGN_THRESHOLD = 0.6
+
+
+def make_mixture(n: int, k: int, dim: int, spread: float, seed: int):
+    rng = np.random.default_rng(seed)
+    centers = rng.normal(size=(k, dim))
+    y = rng.integers(0, k, n)
+    X = centers[y] + spread * rng.normal(size=(n, dim))
+    X /= np.linalg.norm(X, axis=1, keepdims=True)
+    return X.astype(np.float32), y
+
+
+def fill_window(path: Path, precision: str, X: np.ndarray, labels: np.ndarray, now: datetime) -> EmbeddingWindow:
+    """과거 기사를 72시간에 걸쳐 나눠 넣은 윈도우(감쇠 가중치가 행마다 다르게)"""
+    win = EmbeddingWindow(path, MODEL_NAME, precision)
+    for h, part in enumerate(np.array_split(np.arange(len(X)), 6)):
+        keys = [f"u{i}" for i in part]
+        win.add(X[part], labels[part], keys, keys, now - timedelta(hours=12 * (5 - h)))
+    return win
+
+
+def run(n: int, k: int, dim: int, spread: float, seed: int) -> dict:
+    from sklearn.cluster import KMeans
+    from sklearn.metrics import adjusted_rand_score
+
+    X, _ = make_mixture(n + n // 10, k, dim, spread, seed)
+    X, probe = X[:n], X[n:]              # probe = 이번 실행의 새 기사
+    ref_km = KMeans(n_clusters=k, n_init=1, random_state=seed).fit(X)
+    ref_labels = ref_km.labels_.astype(np.int64)
+    now = datetime.now()
+
+    rows, ref = [], None
+    with tempfile.TemporaryDirectory() as tmp:
+        for precision in PRECISIONS:
+            path = Path(tmp) / precision
+            win = fill_window(path, precision, X, ref_labels, now)
+            t0 = time.perf_counter()
+            win.save()
+            save_s = time.perf_counter() - t0
+            t0 = time.perf_counter()
+            loaded = EmbeddingWindow.load(path, MODEL_NAME, precision)
+            load_s = time.perf_counter() - t0
+
+            Xq = loaded.store.dequantize()
+            assigned = loaded.assign(probe, ASSIGN_THRESHOLD, now, HALF_LIFE_HOURS)
+            if ref is None:
+                ref = {'bytes': loaded.store.nbytes, 'assigned': assigned}
+            labels = KMeans(n_clusters=k, init=ref_km.cluster_centers_, n_init=1).fit(Xq).labels_
+            rows.append({
+                'precision': precision,
+                'bytes': loaded.store.nbytes,
+                'memory_ratio': loaded.store.nbytes / ref['bytes'],
+                'file_bytes': (path / ARRAYS_FILE).stat().st_size,
+                'save_seconds': save_s,
+                'load_seconds': load_s,
+                'max_abs_reuse_error': float(np.abs(Xq - X).max()),
+                'assign_agreement': float((assigned == ref['assigned']).mean()),
+                'kmeans_ari_vs_float32': float(adjusted_rand_score(ref_labels, labels)),
+            })
+    return {'n': n, 'k': k, 'dim': dim, 'spread': spread, 'seed': seed, 'probe': len(probe), 'results': rows}
+
+
+def main():
+    ap = argparse.ArgumentParser(description="롤링 윈도우 임베딩 저장 정밀도 벤치마크")
+    ap.add_argument("--n", type=int, default=10000, help="윈도우에 보관할 과거 기사 수")
+    ap.add_argument("--k", type=int, default=30)
+    ap.add_argument("--dim", type=int, default=768)
+    ap.add_argument("--spread", type=float, default=0.08, help="군집 내 표준편차(차원당)")
+    ap.add_argument("--seed", type=int, default=42)
+    ap.add_argument("--json", type=str, default=None, help="결과 JSON 저장 경로")
+    args = ap.parse_args()
+
+    report = run(args.n, args.k, args.dim, args.spread, args.seed)
+    print(f"N={report['n']} (새 기사 {report['probe']}), K={report['k']}, dim={report['dim']}")
+    print(f"{'precision':<10}{'MB':>8}{'ratio':>7}{'file MB':>9}{'save(s)':>9}{'load(s)':>9}"
+          f"{'max|Δx|':>11}{'assign agr':>12}{'ARI':>8}")
+    for r in report['results']:
+        print(f"{r['precision']:<10}{r['bytes'] / 2**20:>8.1f}{r['memory_ratio']:>7.2f}"
+              f"{r['file_bytes'] / 2**20:>9.1f}{r['save_seconds']:>9.3f}{r['load_seconds']:>9.3f}"
+              f"{r['max_abs_reuse_error']:>11.2e}{r['assign_agreement']:>12.4f}{r['kmeans_ari_vs_float32']:>8.4f}")
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+"""
+news_cluster 모듈 import 시간 측정 (python -X importtime)
+
+오케스트레이터(main.py / test.py)는 단계마다 새 프로세스에서 모듈을 import 하므로
+import 시간이 곧 콜드 스타트 비용이다. 예산을 넘기거나 무거운 의존성이
+import 시점에 로드되면 종료 코드 1로 실패한다.
+
+사용 예:
+    python model/benchmarks/import_time.py
+    python model/benchmarks/import_time.py --pipeline test --budget-ms 800
+"""
+import os
+import re
+import sys
+import argparse
+import subprocess
+from pathlib import Path
+
+HERE = Path(__file__).resolve()
+MODEL_DIR = HERE.parents[1]
+PIPE_DIRS = {
+    "main": MODEL_DIR / "main_pipeline",
+    "test": MODEL_DIR / "test_pipeline",
+}
+
+# 모듈 import 시점에는 절대 로드되면 안 되는 무거운 의존성 (실제 사용 시점에 지연 로드)
+FORBIDDEN_MODULES = ["sentence_transformers", "torch", "transformers", "hdbscan", "sklearn", "matplotlib"]
+
+DEFAULT_BUDGET_MS = float(os.getenv("NEWS_CLUSTER_IMPORT_BUDGET_MS", "1500"))
+DEFAULT_REPEAT = 3
+
+_LINE_RE = re.compile(r"^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)\s*$")
+
+
+def measure_once(pipe_dir: Path, module: str) -> dict:
+    """새 인터프리터에서 module을 import 하고 -X importtime 출력을 파싱"""
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join([str(pipe_dir), env.get("PYTHONPATH", "")]).rstrip(os.pathsep)
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=str(pipe_dir), env=env, capture_output=True, text=True
+    )
+    if proc.returncode != 0:
+        raise RuntimeError(f"import {module} 실패:\n{proc.stderr[-2000:]}")
+
+    total_us = None
+    loaded = set()
+    for line in proc.stderr.splitlines():
+        m = _LINE_RE.match(line)
+        if not m:
+            continue
+        cumulative_us, name = int(m.group(2)), m.group(4)
+        loaded.add(name.split(".")[0])
+        if name == module:
+            total_us = cumulative_us
+    if total_us is None:
+        raise RuntimeError(f"importtime 출력에서 {module} 항목을 찾지 못했습니다.")
+    return {"total_ms": total_us / 1000.0, "loaded": loaded}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="news_cluster import 시간 회귀 체크")
+    parser.add_argument("--pipeline", choices=sorted(PIPE_DIRS), default="main")
+    parser.add_argument("--module", default="news_cluster")
+    parser.add_argument("--budget-ms", type=float, default=DEFAULT_BUDGET_MS)
+    parser.add_argument("--repeat", type=int, default=DEFAULT_REPEAT)
+    args = parser.parse_args()
+
+    pipe_dir = PIPE_DIRS[args.pipeline]
+    runs = [measure_once(pipe_dir, args.module) for _ in range(max(1, args.repeat))]
+    # 첫 실행은 .pyc 생성/디스크 캐시 영향이 있어 최솟값을 대표값으로 사용
+    best_ms = min(r["total_ms"] for r in runs)
+    heavy = sorted(set().union(*(r["loaded"] for r in runs)) & set(FORBIDDEN_MODULES))
+
+    print(f"📦 {args.pipeline}_pipeline/{args.module}.py import 시간")
+    samples = ", ".join(f"{r['total_ms']:.1f}ms" for r in runs)
+    print(f"   측정값: {samples} (best {best_ms:.1f}ms)")
+    print(f"   예산: {args.budget_ms:.0f}ms")
+
+    ok = True
+    if heavy:
+        print(f"   ❌ import 시점에 무거운 의존성이 로드됨: {heavy}")
+        ok = False
+    if best_ms > args.budget_ms:
+        print(f"   ❌ 예산 초과: {best_ms:.1f}ms > {args.budget_ms:.0f}ms")
+        ok = False
+    if ok:
+        print("   ✅ 통과")
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
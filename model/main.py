@@ -11,27 +11,28 @@ sys.path.insert(0, str(PIPE_DIR))
 
 def run_collector():
     mod = importlib.import_module("news_collector")
-    print("\n[1/4] 뉴스 수집 시작")
+    print("\n[1/5] 뉴스 수집 시작")
     mod.main()
-    print("[1/4] 뉴스 수집 완료")
+    print("[1/5] 뉴스 수집 완료")
 
 def run_cluster():
     mod = importlib.import_module("news_cluster")
-    print("\n[2/4] 임베딩 + 군집화 시작")
+    print("\n[2/5] 임베딩 + 군집화 시작")
     mod.main()
-    print("[2/4] 임베딩 + 군집화 완료")
+    print("[2/5] 임베딩 + 군집화 완료")
 
 def run_generator():
     mod = importlib.import_module("articles_generator")
-    print("\n[3/4] GPT 요약 생성 시작")
+    print("\n[3/5] GPT 요약 생성 시작")
     if not os.getenv("OPENAI_API_KEY"):
         raise RuntimeError("OPENAI_API_KEY가 없어 요약 단계를 진행할 수 없습니다.")
-    mod.main()
-    print("[3/4] GPT 요약 생성 완료")
+    articles_csv = mod.main()
+    print("[3/5] GPT 요약 생성 완료 (이미지는 백그라운드 생성 중)")
+    return mod, articles_csv
 
 def run_db_save():
     mod = importlib.import_module("database_saver")
-    print("\n[4/4] DB 저장 시작 (MySQL / Cloud SQL)")
+    print("\n[4/5] DB 저장 시작 (MySQL / Cloud SQL)")
     mode = "Cloud SQL Connector" if os.getenv("INSTANCE_CONNECTION_NAME") else "PyMySQL direct/proxy"
     print(f" - 연결 모드: {mode}")
     if not os.getenv("INSTANCE_CONNECTION_NAME"):
@@ -39,8 +40,15 @@ def run_db_save():
         missing = [k for k in required if not os.getenv(k)]
         if missing:
             print(f"   경고: 환경변수 누락 {missing} → .env 또는 환경변수로 설정하세요.")
-    mod.main()
-    print("[4/4] DB 저장 완료")
+    tmpid_to_real = mod.main()
+    print("[4/5] DB 저장 완료")
+    return mod, tmpid_to_real
+
+def run_image_patch(gen_mod, db_mod, tmpid_to_real):
+    print("\n[5/5] 기사 이미지 완료 대기 + URL 반영")
+    image_urls = gen_mod.wait_for_images()
+    db_mod.update_image_urls(image_urls, tmpid_to_real or {})
+    print("[5/5] 기사 이미지 반영 완료")
 
 def main():
     results_dir = PROJECT_ROOT / "model" / "results"
@@ -50,11 +58,21 @@ def main():
     try:
         run_collector()
         run_cluster()
-        run_generator()
-        run_db_save()
+        gen_mod, articles_csv = run_generator()
+        if articles_csv is None:
+            # 이어진 스토리 구성이 모두 그대로 → 지난 CSV 를 다시 넣지 않도록 DB 단계 생략
+            print("\n[4/5] 새 기사 없음 → DB 저장/이미지 반영 생략")
+            return
+        db_mod, tmpid_to_real = run_db_save()
+        run_image_patch(gen_mod, db_mod, tmpid_to_real)
     except Exception as e:
         print(f"\n❌ 파이프라인 실패: {type(e).__name__}: {e}")
         raise
+    finally:
+        # DB 저장 등이 실패하면 이미지 워커(non-daemon 스레드)가 반영되지 못할 이미지를 끝까지 만들지 않도록 취소
+        gen_mod = sys.modules.get("articles_generator")
+        if gen_mod is not None:
+            gen_mod.cancel_images()
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
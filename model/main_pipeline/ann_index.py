@@ -0,0 +1,248 @@
+"""
+기사 임베딩(L2 정규화된 KoSimCSE 벡터) 근사 최근접 이웃(ANN) 인덱스
+
+백엔드 우선순위(backend='auto'):
+  1) hnswlib (pip install hnswlib)       - HNSW, 내적 공간
+  2) faiss   (pip install faiss-cpu)     - IndexHNSWFlat, METRIC_INNER_PRODUCT
+  3) NumPy IVF 폴백(추가 의존성 없음)     - k-means 조대 양자화 + nprobe 개 리스트 정확 탐색
+둘 다 선택 의존성이므로 설치되어 있지 않으면 자동으로 IVF 폴백을 사용한다.
+
+유사도는 모두 코사인(= 정규화 벡터 내적)으로 반환한다.
+  index.knn(Q, k)            -> (indices[q×k], sims[q×k])  (유사도 내림차순, 부족하면 -1 / -inf)
+  index.knn_graph(k, mutual) -> scipy.sparse.csr_matrix (N×N, 자기 자신 제외, 대칭)
+  index.save(dir) / load_index(dir)
+"""
+import json
+from pathlib import Path
+from typing import Dict, Tuple
+
+import numpy as np
+
+DEFAULT_ANN_PARAMS = {
+    'backend': 'auto',        # auto | hnswlib | faiss | ivf
+    'M': 16,
+    'ef_construction': 200,
+    'ef_search': 64,
+    'nlist': None,            # IVF 리스트 수(None → 약 4·√N)
+    'nprobe': 8,
+    'train_iters': 10,
+    'seed': 42,
+}
+
+META_FILE = 'meta.json'
+
+
+def _as_f32(X: np.ndarray) -> np.ndarray:
+    return np.ascontiguousarray(X, dtype=np.float32)
+
+
+class _HnswlibBackend:
+    name = 'hnswlib'
+    file = 'hnsw.bin'
+
+    def __init__(self, dim: int, params: Dict):
+        import hnswlib
+        self.params = params
+        self.index = hnswlib.Index(space='ip', dim=dim)
+
+    def build(self, X: np.ndarray):
+        self.index.init_index(max_elements=len(X), ef_construction=self.params['ef_construction'],
+                              M=self.params['M'], random_seed=self.params['seed'])
+        self.index.add_items(X, np.arange(len(X)))
+
+    def search(self, Q: np.ndarray, k: int) -> Tuple[np.ndarray, np.ndarray]:
+        self.index.set_ef(max(self.params['ef_search'], k))
+        idx, dist = self.index.knn_query(Q, k=k)
+        return idx.astype(np.int64), 1.0 - dist  # ip 공간 거리 = 1 - 내적
+
+    def save(self, path: Path):
+        self.index.save_index(str(path / self.file))
+
+    def load(self, path: Path, n: int):
+        self.index.load_index(str(path / self.file), max_elements=n)
+
+
+class _FaissBackend:
+    name = 'faiss'
+    file = 'faiss.index'
+
+    def __init__(self, dim: int, params: Dict):
+        import faiss
+        self.faiss = faiss
+        self.params = params
+        self.index = faiss.IndexHNSWFlat(dim, params['M'], faiss.METRIC_INNER_PRODUCT)
+        self.index.hnsw.efConstruction = params['ef_construction']
+
+    def build(self, X: np.ndarray):
+        self.index.add(X)
+
+    def search(self, Q: np.ndarray, k: int) -> Tuple[np.ndarray, np.ndarray]:
+        self.index.hnsw.efSearch = max(self.params['ef_search'], k)
+        sims, idx = self.index.search(Q, k)
+        return idx.astype(np.int64), sims
+
+    def save(self, path: Path):
+        self.faiss.write_index(self.index, str(path / self.file))
+
+    def load(self, path: Path, n: int):
+        self.index = self.faiss.read_index(str(path / self.file))
+
+
+class _IVFBackend:
+    """NumPy IVF: 조대 중심 nlist 개로 분할, 질의마다 가까운 nprobe 개 리스트만 정확 탐색"""
+    name = 'ivf'
+    file = 'ivf.npz'
+
+    def __init__(self, dim: int, params: Dict):
+        self.params = params
+        self.X = None
+        self.centroids = None
+        self.assign = None
+
+    def build(self, X: np.ndarray):
+        n = len(X)
+        nlist = self.params['nlist'] or int(4 * np.sqrt(n))
+        nlist = max(1, min(nlist, n))
+        rng = np.random.default_rng(self.params['seed'])
+        train = X[rng.choice(n, size=min(n, nlist * 64), replace=False)]
+        C = train[rng.choice(len(train), size=nlist, replace=False)].copy()
+        # 구면 k-means (내적 최대 중심으로 배정 후 평균·재정규화)
+        for _ in range(self.params['train_iters']):
+            a = np.argmax(train @ C.T, axis=1)
+            sums = np.zeros_like(C)
+            np.add.at(sums, a, train)
+            empty = ~np.bincount(a, minlength=nlist).astype(bool)
+            sums[empty] = C[empty]
+            C = sums / (np.linalg.norm(sums, axis=1, keepdims=True) + 1e-12)
+        self.X = X
+        self.centroids = C.astype(np.float32)
+        self.assign = self._nearest_lists(X, 1)[:, 0]
+
+    def _nearest_lists(self, Q: np.ndarray, nprobe: int) -> np.ndarray:
+        S = Q @ self.centroids.T
+        nprobe = min(nprobe, S.shape[1])
+        part = np.argpartition(-S, nprobe - 1, axis=1)[:, :nprobe]
+        return part
+
+    def search(self, Q: np.ndarray, k: int) -> Tuple[np.ndarray, np.ndarray]:
+        q = len(Q)
+        best_idx = np.full((q, k), -1, dtype=np.int64)
+        best_sim = np.full((q, k), -np.inf, dtype=np.float32)
+        probes = self._nearest_lists(Q, self.params['nprobe'])
+        order = np.argsort(self.assign, kind='stable')
+        bounds = np.searchsorted(self.assign[order], np.arange(len(self.centroids) + 1))
+        # 리스트 단위로 그 리스트를 탐색하는 질의들을 모아 한 번에 행렬곱 후 top-k 병합
+        for lst in range(len(self.centroids)):
+            members = order[bounds[lst]:bounds[lst + 1]]
+            if len(members) == 0:
+                continue
+            qs = np.where((probes == lst).any(axis=1))[0]
+            if len(qs) == 0:
+                continue
+            S = Q[qs] @ self.X[members].T
+            cand_sim = np.concatenate([best_sim[qs], S], axis=1)
+            cand_idx = np.concatenate([best_idx[qs], np.broadcast_to(members, S.shape)], axis=1)
+            top = np.argpartition(-cand_sim, k - 1, axis=1)[:, :k]
+            best_sim[qs] = np.take_along_axis(cand_sim, top, axis=1)
+            best_idx[qs] = np.take_along_axis(cand_idx, top, axis=1)
+        srt = np.argsort(-best_sim, axis=1)
+        return np.take_along_axis(best_idx, srt, axis=1), np.take_along_axis(best_sim, srt, axis=1)
+
+    def save(self, path: Path):
+        np.savez(path / self.file, centroids=self.centroids, assign=self.assign)
+
+    def load(self, path: Path, n: int):
+        data = np.load(path / self.file)
+        self.centroids, self.assign = data['centroids'], data['assign']
+
+
+_BACKENDS = {'hnswlib': _HnswlibBackend, 'faiss': _FaissBackend, 'ivf': _IVFBackend}
+
+
+def _make_backend(name: str, dim: int, params: Dict):
+    if name != 'auto':
+        return _BACKENDS[name](dim, params)
+    for cand in ('hnswlib', 'faiss'):
+        try:
+            return _BACKENDS[cand](dim, params)
+        except ImportError:
+            continue
+    return _IVFBackend(dim, params)
+
+
+class ANNIndex:
+    """정규화 임베딩 X 위의 kNN 인덱스"""
+
+    def __init__(self, backend, X: np.ndarray, params: Dict):
+        self.backend = backend
+        self.X = X
+        self.params = params
+
+    @property
+    def backend_name(self) -> str:
+        return self.backend.name
+
+    def knn(self, Q: np.ndarray, k: int) -> Tuple[np.ndarray, np.ndarray]:
+        k = max(1, min(k, len(self.X)))
+        idx, sims = self.backend.search(_as_f32(Q), k)
+        sims = np.where(idx < 0, -np.inf, sims).astype(np.float32)
+        return idx, sims
+
+    def knn_graph(self, k: int, mutual: bool = False, min_sim: float = None):
+        """자기 자신을 제외한 kNN 코사인 유사도 그래프(csr, 대칭).
+        mutual=True 면 서로의 kNN 에 모두 들어간 쌍만 남긴다(mutual kNN)."""
+        from scipy.sparse import csr_matrix
+        n = len(self.X)
+        idx, sims = self.knn(self.X, k + 1)
+        rows = np.repeat(np.arange(n), idx.shape[1])
+        cols, data = idx.ravel(), sims.ravel()
+        keep = (cols >= 0) & (cols != rows)
+        if min_sim is not None:
+            keep &= data >= min_sim
+        rows, cols, data = rows[keep], cols[keep], data[keep]
+
+        G = csr_matrix((data, (rows, cols)), shape=(n, n))
+        P = csr_matrix((np.ones(len(rows), dtype=np.int8), (rows, cols)), shape=(n, n))
+        # 양방향 모두 있는 간선은 두 유사도의 평균(부동소수 오차 제거), 한쪽만 있는 간선은 그 값으로 대칭화
+        S = (G + G.T).tocsr()
+        cnt = (P + P.T).astype(np.float32).tocsr()
+        if mutual:
+            cnt = cnt.multiply(P.multiply(P.T)).tocsr()
+        G = S.multiply(cnt.power(-1)).tocsr()
+        G.eliminate_zeros()
+        return G
+
+    def save(self, path) -> Path:
+        path = Path(path)
+        path.mkdir(parents=True, exist_ok=True)
+        self.backend.save(path)
+        meta = {'backend': self.backend.name, 'n': int(len(self.X)), 'dim': int(self.X.shape[1]),
+                'params': self.params}
+        with open(path / META_FILE, 'w', encoding='utf-8') as f:
+            json.dump(meta, f, ensure_ascii=False, indent=2)
+        return path
+
+
+def build_index(X: np.ndarray, params: Dict = None) -> ANNIndex:
+    p = dict(DEFAULT_ANN_PARAMS)
+    if params:
+        p.update(params)
+    X = _as_f32(X)
+    backend = _make_backend(p['backend'], X.shape[1], p)
+    backend.build(X)
+    return ANNIndex(backend, X, p)
+
+
+def load_index(path, X: np.ndarray) -> ANNIndex:
+    """save() 로 저장한 인덱스 로드. X 는 같은 순서의 임베딩(IVF 정확 탐색·그래프 생성에 사용)"""
+    path = Path(path)
+    with open(path / META_FILE, 'r', encoding='utf-8') as f:
+        meta = json.load(f)
+    X = _as_f32(X)
+    if len(X) != meta['n']:
+        raise ValueError(f"인덱스 크기({meta['n']})와 임베딩 수({len(X)})가 다릅니다.")
+    backend = _BACKENDS[meta['backend']](meta['dim'], meta['params'])
+    backend.load(path, meta['n'])
+    if isinstance(backend, _IVFBackend):
+        backend.X = X
+    return ANNIndex(backend, X, meta['params'])
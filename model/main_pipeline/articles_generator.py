@@ -1,13 +1,18 @@
-import os, json, time, random, re, base64, hashlib
+import os, csv, json, time, random, re, base64, hashlib, asyncio
 from datetime import datetime, timezone, timedelta
 from pathlib import Path
-from typing import Dict, Any, List, Tuple
+from typing import Dict, Any, List, Optional, Tuple
 from urllib.parse import urlparse
 from dotenv import load_dotenv, find_dotenv
 
 import pandas as pd
-from tenacity import retry, stop_after_attempt, wait_exponential, retry_if_exception_type
-from openai import OpenAI
+from cluster_handoff import latest_cluster_results, read_cluster_results
+from category_rules import FOREIGN_MATCHER, ECON_TOPIC_MATCHER, SOCIETY_TOPIC_MATCHER
+from run_manifest import DEFAULT_SEED, derive_seed, find_run_manifest, hash_file, stable_hash
+from llm_cache import LLMCache, prompt_key
+from image_cache import ImageCache, image_key, story_key
+from api_scheduler import BackgroundPool, RateLimiter, gather_ordered, retry_after_seconds
+from openai import AsyncOpenAI, RateLimitError
 
 HERE = Path(__file__).resolve()
 PROJECT_ROOT = HERE.parents[2]
@@ -15,15 +20,17 @@ IN_BASE  = PROJECT_ROOT / "model" / "results" / "cluster_results"
 OUT_BASE = PROJECT_ROOT / "model" / "results" / "generate_results"
 OUT_BASE.mkdir(parents=True, exist_ok=True)
 
-def _latest_cluster_csv() -> str:
-    files = sorted(
-        IN_BASE.glob("clustering_results_detailed_*.csv"),
-        key=lambda p: p.stat().st_mtime,
-        reverse=True
-    )
-    return str(files[0]) if files else str(IN_BASE / "clustering_results_detailed.csv")
+def _latest_cluster_input() -> str:
+    """최근 군집 결과(Parquet 우선, 없으면 CSV)"""
+    latest = latest_cluster_results(IN_BASE)
+    return str(latest) if latest else str(IN_BASE / "clustering_results_detailed.csv")
+
+INPUT_PATH = _latest_cluster_input()
 
-INPUT_CSV = _latest_cluster_csv()
+# 생성 단계에서 실제로 쓰는 컬럼만 읽는다(Parquet 컬럼 프로젝션)
+REQUIRED_COLUMNS = {"title","originalUrl","naverUrl","description","pubDate","category","content",
+                    "contentLength","isQualityContent","fullText","textLength","index","cluster","method"}
+OPTIONAL_COLUMNS = {"source","cluster_majority_raw","cluster_majority_ko","story_status"}
 
 IMG_DIR = OUT_BASE / "images"
 IMG_DIR.mkdir(parents=True, exist_ok=True)
@@ -36,7 +43,6 @@ OPENAI_MODEL = os.getenv("OPENAI_MODEL", "gpt-4o-mini")
 OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
 if not OPENAI_API_KEY:
     raise RuntimeError("OPENAI_API_KEY가 설정되어 있지 않습니다. .env 또는 환경변수를 확인하세요.")
-client = OpenAI(api_key=OPENAI_API_KEY)
 
 TITLE_MAX_CHARS   = 60
 SUMMARY_MAX_CHARS = 300
@@ -46,10 +52,37 @@ ENABLE_IMAGE_GEN = True
 IMAGE_MODEL  = "dall-e-3"
 IMAGE_SIZE   = "1792x1024"
 IMAGE_FORMAT = "png"
+# 이미지 생성은 텍스트 생성/DB 저장과 분리된 백그라운드 워커 풀: 동시 실행 상한 + 분당 이미지 예산
+IMAGE_CONCURRENCY = int(os.getenv("IMAGE_CONCURRENCY", "3"))
+IMAGE_RPM = float(os.getenv("IMAGE_RPM", "5"))
+IMAGE_MAX_RETRIES = 2
 
 MAX_ARTICLES_PER_CLUSTER = 5
 MIN_BODY_CHARS = 200
-SLEEP_BETWEEN_CALLS = 0.4
+LLM_TEMPERATURE = 0.2
+
+# 요약 생성은 군집별 비동기 동시 호출: 동시 실행 상한 + 분당 요청/토큰 예산(계정 한도에 맞춰 조정)
+LLM_CONCURRENCY = int(os.getenv("LLM_CONCURRENCY", "8"))
+LLM_RPM = float(os.getenv("LLM_RPM", "500"))
+LLM_TPM = float(os.getenv("LLM_TPM", "200000"))
+LLM_MAX_RETRIES = 3
+LLM_COMPLETION_TOKENS_EST = 1200   # TPM 예산 추정용 출력 토큰(제목+요약+재가공 본문)
+LLM_TOKENS_PER_CHAR_EST = 1.5      # TPM 예산 추정용 글자당 입력 토큰(cl100k 기준 한국어는 글자당 1토큰을 넘기 쉬움)
+
+# LLM 응답 캐시(SQLite): 모델·시스템/사용자 프롬프트·temperature 가 같으면 API 호출 없이 저장된 응답 사용
+LLM_CACHE_PATH = Path(os.getenv("LLM_CACHE_PATH", str(OUT_BASE / "llm_cache.sqlite")))
+LLM_CACHE_TTL_HOURS = float(os.getenv("LLM_CACHE_TTL_HOURS", "72"))
+LLM_CACHE_MAX_MB = float(os.getenv("LLM_CACHE_MAX_MB", "200"))
+LLM_RESPONSE_KEYS = ("title", "summary", "rewritten_body")
+
+# 증분 군집(story_status 컬럼 있음)에서 이어진 스토리의 구성 기사가 지난 생성 때와 같으면 다시 생성하지 않음
+GENERATED_STORIES_PATH = Path(os.getenv("GENERATED_STORIES_PATH", str(OUT_BASE / "generated_stories.json")))
+GENERATED_STORIES_TTL_HOURS = float(os.getenv("GENERATED_STORIES_TTL_HOURS", "48"))
+
+# 이미지 캐시: 모델·크기·이미지 프롬프트(또는 같은 스토리·카테고리의 같은 제목)가 같으면 생성 없이 기존 썸네일 재사용
+# 예산은 캐시 폴더에만 적용(저장할 때마다 LRU 정리), IMG_DIR 의 게시 사본(하드링크)은 예산 밖
+IMAGE_CACHE_DIR = Path(os.getenv("IMAGE_CACHE_DIR", str(OUT_BASE / "image_cache")))
+IMAGE_CACHE_MAX_MB = float(os.getenv("IMAGE_CACHE_MAX_MB", "500"))
 
 CATS = {"국내경제","해외경제","사회","트렌드"}
 
@@ -57,10 +90,7 @@ RAW2KO_BASE = {
     "society": "사회",
     "entertainment": "트렌드",
 }
-GLOBAL_HINTS = [
-    "미국","중국","일본","유럽","EU","글로벌","세계","월가","연준","Fed","ECB","BOJ",
-    "해외","국제","달러","엔","유로","위안","수입","수출","환율"
-]
+# 해외 힌트/주제 키워드 규칙은 category_rules 에서 news_cluster 와 공유
 
 SYSTEM_PROMPT = (
     "당신은 한국어 뉴스 다문서 요약 어시스턴트입니다. "
@@ -140,7 +170,8 @@ def clamp(s: str, limit: int) -> str:
 
 def build_items(df_sel: pd.DataFrame) -> Tuple[str, str, List[int], List[str], List[str], List[str]]:
     metas, bodies, indices, urls, titles, sources = [], [], [], [], [], []
-    for _, r in df_sel.iterrows():
+    # 프롬프트에는 입력 파일 행 번호(index) 대신 선택 순번만 넣는다 → 같은 기사 묶음이면 같은 프롬프트(LLM 캐시 적중)
+    for no, (_, r) in enumerate(df_sel.iterrows(), start=1):
         idx = int(r.get("index")) if pd.notna(r.get("index")) else None
         title = (r.get("title") or "").strip()
         url = (r.get("originalUrl") or r.get("naverUrl") or "").strip()
@@ -148,10 +179,10 @@ def build_items(df_sel: pd.DataFrame) -> Tuple[str, str, List[int], List[str], L
         body = prefer_body(r)
 
         metas.append({
-            "index": idx, "title": clamp(title, 140), "url": url,
+            "no": no, "title": clamp(title, 140), "url": url,
             "pubDate": r.get("pubDate"), "source": src, "length": len(body)
         })
-        bodies.append(f"[{idx}] {title}\n{clamp(body,1200)}\n")
+        bodies.append(f"[{no}] {title}\n{clamp(body,1200)}\n")
 
         indices.append(idx); urls.append(url); titles.append(title); sources.append(src)
 
@@ -175,17 +206,16 @@ def normalize_category(raw_cat: str, title: str, body: str,
     if raw in RAW2KO_BASE:
         return RAW2KO_BASE[raw]
     if raw == "economy":
-        if any(k.lower() in txt.lower() for k in GLOBAL_HINTS):
+        if FOREIGN_MATCHER.search(txt):
             return "해외경제"
         return "국내경제"
 
     # ---- 이하: 기존 규칙 기반 백업 ----
-    t = txt.lower()
-    if any(k in t for k in ["수출","환율","금리","경기","주가","증시","기업","채권","물가","부동산","고용"]):
-        if any(k.lower() in t for k in GLOBAL_HINTS):
+    if ECON_TOPIC_MATCHER.search(txt):
+        if FOREIGN_MATCHER.search(txt):
             return "해외경제"
         return "국내경제"
-    if any(k in t for k in ["범죄","사건","사고","경찰","검찰","재판","복지","교육청","지자체","주거","임대","저소득"]):
+    if SOCIETY_TOPIC_MATCHER.search(txt):
         return "사회"
     return "트렌드"
 
@@ -232,17 +262,63 @@ def ensure_3_sentences(text: str) -> str:
             fixed += "."
     return clamp(fixed, SUMMARY_MAX_CHARS)
 
-@retry(reraise=True, stop=stop_after_attempt(3), wait=wait_exponential(multiplier=1, min=1, max=8),
-       retry=retry_if_exception_type(Exception))
-def call_llm(user_prompt: str) -> Dict[str, Any]:
-    resp = client.chat.completions.create(
-        model=OPENAI_MODEL,
-        messages=[{"role":"system","content":SYSTEM_PROMPT},
-                  {"role":"user","content":user_prompt}],
-        temperature=0.2,
-        response_format={"type":"json_object"},
-    )
-    return json.loads(resp.choices[0].message.content)
+def estimate_tokens(text: str) -> int:
+    """TPM 예산용 입력 토큰 추정(글자 수 × 1.5 로 넉넉히 잡고, 응답 usage 로 보정)"""
+    return int(len(text) * LLM_TOKENS_PER_CHAR_EST)
+
+async def call_llm(aclient: AsyncOpenAI, user_prompt: str, limiter: RateLimiter) -> Dict[str, Any]:
+    """예산 확보 후 호출, 실패 시 최대 LLM_MAX_RETRIES 회 재시도(429 는 retry-after 동안 전체 호출 정지)"""
+    estimated = estimate_tokens(SYSTEM_PROMPT + user_prompt) + LLM_COMPLETION_TOKENS_EST
+    for attempt in range(LLM_MAX_RETRIES):
+        await limiter.acquire(estimated)
+        try:
+            resp = await aclient.chat.completions.create(
+                model=OPENAI_MODEL,
+                messages=[{"role":"system","content":SYSTEM_PROMPT},
+                          {"role":"user","content":user_prompt}],
+                temperature=LLM_TEMPERATURE,
+                response_format={"type":"json_object"},
+            )
+            limiter.settle(estimated, getattr(resp.usage, "total_tokens", None))
+            return json.loads(resp.choices[0].message.content)
+        except Exception as e:
+            if attempt + 1 == LLM_MAX_RETRIES:
+                raise
+            backoff = min(2 ** attempt, 8)
+            if isinstance(e, RateLimitError):
+                limiter.pause(retry_after_seconds(e) or backoff)
+            else:
+                await asyncio.sleep(backoff)
+
+async def generate_texts(prompts: List[str], cache: LLMCache) -> List[Tuple[Any, bool]]:
+    """군집 순서 그대로 [(응답 dict | 실패 시 None, 캐시 적중 여부)].
+       캐시 적중은 호출 없이 바로 채우고, 나머지(같은 프롬프트는 1회)만 동시 호출 후 캐시에 저장"""
+    keys = [prompt_key(OPENAI_MODEL, SYSTEM_PROMPT, p, LLM_TEMPERATURE) for p in prompts]
+    results: List[Tuple[Any, bool]] = [(None, False)] * len(prompts)
+    pending = {}  # key -> 해당 프롬프트를 쓰는 군집 위치들
+    for i, key in enumerate(keys):
+        hit = cache.get(key) if key not in pending else None
+        if hit is not None:
+            results[i] = (hit, True)
+        else:
+            pending.setdefault(key, []).append(i)
+    if not pending:
+        return results
+
+    limiter = RateLimiter(rpm=LLM_RPM, tpm=LLM_TPM)
+    # 재시도는 위 call_llm 이 예산/429 를 보며 처리하므로 SDK 자체 재시도는 끔
+    async with AsyncOpenAI(api_key=OPENAI_API_KEY, max_retries=0) as aclient:
+        outs = await gather_ordered(list(pending), lambda key: call_llm(aclient, prompts[pending[key][0]], limiter),
+                                    LLM_CONCURRENCY)
+    for key, out in zip(pending, outs):
+        if isinstance(out, BaseException):
+            print(f"[WARN] LLM 생성 실패(군집 {len(pending[key])}개 폴백): {type(out).__name__}: {out}")
+            continue
+        if isinstance(out, dict) and all(out.get(k) for k in LLM_RESPONSE_KEYS):   # 빈/불완전 응답은 저장 안 함
+            cache.put(key, OPENAI_MODEL, {k: out[k] for k in LLM_RESPONSE_KEYS})
+        for i in pending[key]:
+            results[i] = (out, False)
+    return results
 
 def build_image_prompt(title: str, body: str, category: str) -> str:
     """뉴스 썸네일용 포토리얼 프롬프트(장면/구도/조명 가변화)"""
@@ -315,29 +391,137 @@ def build_image_prompt(title: str, body: str, category: str) -> str:
         f"- 결과물은 일반 뉴스 포털 카드형 썸네일에 적합해야 하며, 실사 사진처럼 보일 것."
     )
 
-def generate_article_image(title: str, body: str, category: str, cluster_id: int) -> str:
-    """DALL·E 3로 이미지 생성 → 파일 저장 → 프로젝트 상대경로 문자열 리턴.
-       실패/비활성화 시 빈 문자열 리턴."""
+async def request_image(aclient: AsyncOpenAI, limiter: RateLimiter, prompt: str) -> Optional[bytes]:
+    """DALL·E 3 호출 → 이미지 바이트(실패 시 None). 429 는 retry-after 동안 워커 전체를 멈춘 뒤 재시도."""
+    for attempt in range(IMAGE_MAX_RETRIES + 1):
+        await limiter.acquire()
+        try:
+            resp = await aclient.images.generate(
+                model=IMAGE_MODEL,
+                prompt=prompt,
+                size=IMAGE_SIZE,
+                response_format="b64_json",   # 파일 저장에 유리
+            )
+            return base64.b64decode(resp.data[0].b64_json)
+        except RateLimitError as e:
+            if attempt == IMAGE_MAX_RETRIES:
+                return None
+            limiter.pause(retry_after_seconds(e) or 60.0 / max(IMAGE_RPM, 1e-6))
+        except Exception:
+            return None
+    return None
+
+# 같은 키(프롬프트 키 또는 별칭 키)를 동시에 처리 중인 워커는 진행 중인 생성 결과를 기다림
+# (중복 호출 방지; 워커 루프 안에서만 접근)
+_image_inflight: Dict[str, "asyncio.Future"] = {}
+
+async def generate_article_image(aclient: AsyncOpenAI, limiter: RateLimiter, cache: ImageCache,
+                                 title: str, body: str, category: str, cluster_id: int,
+                                 story_ref: str = None) -> str:
+    """캐시 조회(프롬프트 키 → 스토리·제목 별칭 키) → 없으면 DALL·E 3로 생성해 캐시에 저장
+       → 게시 경로에 링크 → 프로젝트 상대경로 문자열 리턴. 실패/비활성화 시 빈 문자열 리턴."""
     if not ENABLE_IMAGE_GEN:
         return ""
-    try:
-        prompt = build_image_prompt(title, body, category)
-        resp = client.images.generate(
-            model=IMAGE_MODEL,
-            prompt=prompt,
-            size=IMAGE_SIZE,
-            response_format="b64_json",   # 파일 저장에 유리
-        )
-        b64 = resp.data[0].b64_json
-        raw = base64.b64decode(b64)
-        fname = f"article_{cluster_id}_{int(time.time())}.{IMAGE_FORMAT}"
-        fpath = IMG_DIR / fname
-        with open(fpath, "wb") as f:
-            f.write(raw)
-
-        return f"{PUBLIC_MEDIA_ROUTE}/{fname}"
-    except Exception:
-        return ""
+    prompt = build_image_prompt(title, body, category)
+    key = image_key(IMAGE_MODEL, IMAGE_SIZE, prompt)
+    story = story_key(IMAGE_MODEL, IMAGE_SIZE, title, category, story_ref)
+    src = cache.get(key, story)
+    if src is None:
+        pending = _image_inflight.get(key) or _image_inflight.get(story)
+        if pending is None:
+            async def fetch() -> Optional[Path]:
+                raw = await request_image(aclient, limiter, prompt)
+                return None if raw is None else cache.put(key, raw, story, model=IMAGE_MODEL, image_size=IMAGE_SIZE)
+
+            def release(fut):
+                for k in (key, story):
+                    if _image_inflight.get(k) is fut:
+                        del _image_inflight[k]
+
+            pending = _image_inflight[key] = _image_inflight[story] = asyncio.ensure_future(fetch())
+            pending.add_done_callback(release)
+        src = await pending
+        if src is None:
+            return ""
+    fname = f"article_{cluster_id}_{int(time.time())}.{IMAGE_FORMAT}"
+    ImageCache.link_to(src, IMG_DIR / fname)
+    return f"{PUBLIC_MEDIA_ROUTE}/{fname}"
+
+# 백그라운드 이미지 워커 풀(main 에서 시작, wait_for_images 에서 종료 후 기사 CSV 패치)
+_image_pool: Optional[BackgroundPool] = None
+_image_outputs: Dict[str, Path] = {}
+_image_cache: Optional[ImageCache] = None
+
+def start_image_pool(images_csv: Path) -> Optional[BackgroundPool]:
+    """(title, body, category, cluster_id, story_ref) 작업을 소비하는 워커 풀 시작.
+       이미지는 끝나는 대로 저장하고 images_csv 에 (article_tmp_id, cluster, url) 한 줄씩 추가"""
+    global _image_cache
+    if not ENABLE_IMAGE_GEN:
+        return None
+    aclient = AsyncOpenAI(api_key=OPENAI_API_KEY, max_retries=0)
+    limiter = RateLimiter(rpm=IMAGE_RPM)
+    cache = _image_cache = ImageCache(IMAGE_CACHE_DIR, int(IMAGE_CACHE_MAX_MB * 1024 * 1024), ext=IMAGE_FORMAT)
+    evicted = cache.evict()
+    if evicted:
+        print(f"이미지 캐시 정리: {evicted}건 삭제")
+
+    async def work(job: Dict[str, Any]) -> str:
+        return await generate_article_image(aclient, limiter, cache, job["title"], job["body"], job["category"],
+                                            job["cluster_id"], job.get("story_ref"))
+
+    async def close():
+        await aclient.close()
+        cache.close()
+
+    def record(job: Dict[str, Any], url):
+        if not isinstance(url, str) or not url:
+            return
+        is_new = not images_csv.exists()
+        with open(images_csv, "a", encoding="utf-8", newline="") as f:
+            writer = csv.writer(f)
+            if is_new:
+                writer.writerow(["article_tmp_id", "cluster", "article_image_url"])
+            writer.writerow([job["article_tmp_id"], job["cluster_id"], url])
+
+    return BackgroundPool(work, IMAGE_CONCURRENCY, on_result=record, on_close=close,
+                          name="image-pool").start()
+
+def wait_for_images(timeout: float = None) -> Dict[int, str]:
+    """이미지 워커가 끝날 때까지 대기 → 기사 CSV 의 article_image_url 패치 → {article_tmp_id: url}"""
+    global _image_pool
+    if _image_pool is None:
+        return {}
+    t0 = time.perf_counter()
+    results = _image_pool.join(timeout)
+    if _image_pool.running:
+        # timeout 이 지나도 워커 스레드는 결과를 계속 추가하므로 끝날 때까지 참조 유지(다시 wait/cancel 가능)
+        print(f"이미지 생성: {timeout}s 안에 끝나지 않아 완료된 {len(results)}건만 먼저 반영")
+    else:
+        _image_pool = None
+    urls = {int(job["article_tmp_id"]): url for job, url in results if isinstance(url, str) and url}
+    articles_csv = _image_outputs.get("articles_csv")
+    if urls and articles_csv is not None and articles_csv.exists():
+        arts = pd.read_csv(articles_csv)
+        patched = arts["article_tmp_id"].map(urls)
+        arts["article_image_url"] = patched.fillna(arts["article_image_url"]).fillna("")
+        arts.to_csv(articles_csv, index=False, encoding="utf-8-sig")
+    print(f"이미지 생성: {len(urls)}/{len(results)}건 성공, 대기 {time.perf_counter() - t0:.1f}s "
+          f"(동시 {IMAGE_CONCURRENCY}, {IMAGE_RPM:.0f}/분)")
+    if _image_cache is not None:
+        stats = _image_cache.stats()
+        print(f"이미지 캐시: 적중 {stats['hits']}건, 미적중 {stats['misses']}건 "
+              f"(저장 {stats['entries']}건, {stats['bytes'] / 1024 / 1024:.1f}MB)")
+    return urls
+
+def cancel_images():
+    """남은 이미지 작업을 취소하고 워커 스레드가 끝날 때까지 대기(이후 단계 실패 시 정리용)"""
+    global _image_pool
+    if _image_pool is None:
+        return
+    _image_pool.cancel()
+    results = _image_pool.join()
+    _image_pool = None
+    print(f"이미지 생성 취소: 완료된 {len(results)}건 외 남은 작업 취소")
     
 def enforce_bullet_style(text: str) -> str:
     """
@@ -393,15 +577,48 @@ digest_candidates = []   # {category, cluster_id, article_tmp_id, lines, strengt
 cluster_strength = {}    # (category, cluster_id) -> int
     
 
+def load_generated_stories() -> Dict[str, Dict[str, str]]:
+    """{스토리 ID: {cluster_key, generated_at, article_no}} (TTL 지난 항목 제외, article_no 는 DB 저장 후 기록)"""
+    if not GENERATED_STORIES_PATH.exists():
+        return {}
+    try:
+        with open(GENERATED_STORIES_PATH, "r", encoding="utf-8") as f:
+            stories = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    cutoff = datetime.utcnow() - timedelta(hours=GENERATED_STORIES_TTL_HOURS)
+    return {sid: v for sid, v in stories.items() if datetime.fromisoformat(v["generated_at"]) >= cutoff}
+
+def save_generated_stories(stories: Dict[str, Dict[str, str]]):
+    GENERATED_STORIES_PATH.parent.mkdir(parents=True, exist_ok=True)
+    tmp = GENERATED_STORIES_PATH.with_suffix(".tmp")
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(stories, f, ensure_ascii=False, indent=2)
+    os.replace(tmp, GENERATED_STORIES_PATH)
+
 def main():
-    assert Path(INPUT_CSV).exists(), f"입력 CSV 없음: {INPUT_CSV}"
-    df = pd.read_csv(INPUT_CSV)
+    """군집별 기사 생성 → CSV 저장. 생성 기사 CSV 경로 리턴(새로 생성할 스토리가 없으면 None)"""
+    global _image_pool
+    assert Path(INPUT_PATH).exists(), f"입력 파일 없음: {INPUT_PATH}"
+    df = read_cluster_results(INPUT_PATH, columns=sorted(REQUIRED_COLUMNS | OPTIONAL_COLUMNS))
 
-    required = {"title","originalUrl","naverUrl","description","pubDate","category","content",
-            "contentLength","isQualityContent","fullText","textLength","index","cluster","method"}
-    missing = required - set(df.columns)
+    missing = REQUIRED_COLUMNS - set(df.columns)
     if missing:
-        raise ValueError(f"CSV 컬럼 누락: {missing}")
+        raise ValueError(f"입력 컬럼 누락: {missing}")
+
+    # 군집 실행 manifest 의 시드/run_key 사용 → 같은 시드·같은 구성 기사면 같은 대표 문서·컨텍스트 선택
+    run_info = find_run_manifest(INPUT_PATH) or {}
+    run_seed = run_info.get("seed", DEFAULT_SEED)
+    run_key = run_info.get("run_key") or hash_file(INPUT_PATH)
+    print(f"군집 실행: run_key={run_key}, seed={run_seed}")
+
+    llm_cache = LLMCache(LLM_CACHE_PATH, LLM_CACHE_TTL_HOURS, int(LLM_CACHE_MAX_MB * 1024 * 1024))
+    evicted = llm_cache.evict()
+    if evicted:
+        print(f"LLM 캐시 정리: {evicted}건 삭제")
+
+    # 결과 파일 타임스탬프(이미지 워커가 완료분을 바로 기록할 파일명에도 사용)
+    ts = datetime.utcnow().isoformat().replace(":", "-").replace(".", "-")
 
     # 본문/길이 전처리
     df["__body"] = df.apply(prefer_body, axis=1)
@@ -411,18 +628,31 @@ def main():
     src_unique = {}  # press_name -> source_url (마지막값 유지)
     src_staging_rows = []
 
-    # 군집 루프
-    for cluster_id, grp in df.groupby("cluster"):
-        grp_all = grp.copy()
+    # 증분 군집 결과면 군집 번호 = 실행 간 안정적인 스토리 ID
+    generated = load_generated_stories() if "story_status" in df.columns else None
+    skipped = 0
+
+    # 1) 군집별 입력 준비(대표/컨텍스트 문서 선택, 프롬프트 렌더링)
+    jobs = []
+    for cluster_id, grp in df.groupby("cluster", observed=True):
+        # 군집 번호는 실행마다 달라질 수 있으므로 기사 키(originalUrl, 없으면 제목) 순으로 정렬해 두고
+        # 이후 선택은 모두 구성 기사(cluster_key)로만 결정 → 같은 기사 묶음이면 같은 대표·컨텍스트·프롬프트
+        grp_all = grp.assign(__key=grp["originalUrl"].fillna(grp["title"]).astype(str))
+        grp_all = grp_all.sort_values(["__key", "__body"], kind="stable")
+        cluster_key = stable_hash(grp_all["__key"].tolist())
+        if generated is not None and str(grp_all["story_status"].iloc[0]) == "updated" \
+                and generated.get(str(cluster_id), {}).get("cluster_key") == cluster_key:
+            skipped += 1   # 이어진 스토리인데 구성 기사가 그대로 → 지난번 생성 기사 유지
+            continue
         grp = grp_all[grp_all["__body_len"] >= MIN_BODY_CHARS]
         if grp.empty:
             grp = grp_all.sort_values("__body_len", ascending=False).head(3)
 
-        # 대표 문서: 랜덤
-        rep = grp.sample(1, random_state=random.randint(0, 10**6)).iloc[0]
+        # 대표 문서: 랜덤(실행 시드 + 구성 기사 해시로 고정)
+        rep = grp.sample(1, random_state=derive_seed(run_seed, "representative", cluster_key)).iloc[0]
 
         # 컨텍스트 문서: 무작위 섞은 뒤 상위 N개(품질/최신 섞고 싶으면 규칙 바꿔도 됨)
-        grp_shuffled = grp.sample(frac=1.0, random_state=42)
+        grp_shuffled = grp.sample(frac=1.0, random_state=derive_seed(run_seed, "context", cluster_key))
         df_sel = grp_shuffled.head(MAX_ARTICLES_PER_CLUSTER)
 
         items_meta, items_bodies, used_indices, urls, titles, sources = build_items(df_sel)
@@ -434,9 +664,40 @@ def main():
             summary_max=SUMMARY_MAX_CHARS,
             rewrite_max=REWRITE_MAX_CHARS
         )
+        jobs.append({
+            "cluster_id": cluster_id, "rep": rep, "used_indices": used_indices, "urls": urls, "sources": sources,
+            "user_prompt": user_prompt,
+            "cluster_key": cluster_key,
+            # 이미지 별칭 키용 스토리 식별자: 증분 모드는 실행 간 유지되는 스토리 ID, 아니면 구성 기사 해시
+            "story_ref": f"story-{cluster_id}" if generated is not None else cluster_key,
+        })
+
+    if generated is not None:
+        print(f"스토리: 생성 대상 {len(jobs)}개, 구성 변화 없는 이어진 스토리 {skipped}개 건너뜀")
+    if not jobs:
+        llm_cache.close()
+        print("새로 생성할 스토리가 없습니다.")
+        return None
 
+    # 2) 요약 생성: 캐시 미적중 군집만 비동기 동시 호출(RPM/TPM 예산 내), 결과는 군집 순서 유지
+    t0 = time.perf_counter()
+    texts = asyncio.run(generate_texts([job["user_prompt"] for job in jobs], llm_cache))
+    print(f"요약 생성: {len(jobs)}개 군집, {time.perf_counter() - t0:.1f}s "
+          f"(동시 {LLM_CONCURRENCY}, {LLM_RPM:.0f} RPM / {LLM_TPM:.0f} TPM)")
+
+    cache_stats = llm_cache.stats()
+    llm_cache.close()
+    print(f"LLM 캐시: 적중 {cache_stats['hits']}건, 호출 {cache_stats['misses']}건 "
+          f"(저장 {cache_stats['entries']}건, {cache_stats['bytes'] / 1024:.0f}KB)")
+
+    # 3) 군집 순서대로 후처리·행 구성. 이미지는 작업만 넘기고 기다리지 않음(완료 후 URL 패치)
+    _image_pool = start_image_pool(OUT_BASE / f"article_images_{ts}.csv")
+    for job, (out, _) in zip(jobs, texts):
+        cluster_id, rep = job["cluster_id"], job["rep"]
+        used_indices, urls, sources = job["used_indices"], job["urls"], job["sources"]
         try:
-            out = call_llm(user_prompt)
+            if out is None:
+                raise ValueError("LLM 생성 실패")
             gen_title   = clamp(out.get("title",""), TITLE_MAX_CHARS)
             gen_summary = enforce_bullet_style(out.get("summary",""))
             gen_rewrite = clamp(out.get("rewritten_body",""), REWRITE_MAX_CHARS)
@@ -459,17 +720,19 @@ def main():
         # 기사 등록 시각(KST)
         reg_at = now_kst_iso()
 
-        image_url = generate_article_image(gen_title, gen_rewrite, norm_cat, int(cluster_id))
-
         # 이 생성 아티클의 임시 ID를 먼저 부여(1부터 증가; CSV에도 기록)
         article_tmp_id = len(articles_rows) + 1
 
+        if _image_pool is not None:
+            _image_pool.submit({"article_tmp_id": article_tmp_id, "title": gen_title, "body": gen_rewrite,
+                                "category": norm_cat, "cluster_id": int(cluster_id), "story_ref": job["story_ref"]})
+
         articles_rows.append({
             "article_tmp_id": article_tmp_id,
             "article_title": gen_title,
             "article_summary": gen_summary,
             "article_content": gen_rewrite,
-            "article_image_url": image_url,
+            "article_image_url": "",          # 백그라운드 이미지 완료 후 wait_for_images 에서 채움
             "article_category": norm_cat,
             "article_reg_at": reg_at,
             "article_update_at": "",
@@ -480,6 +743,12 @@ def main():
             "cluster": cluster_id,
             "used_indices": ",".join(str(i) for i in used_indices if i is not None),
             "source_urls": ",".join(sorted(set([u for u in urls if u]))),
+            # 군집 구성 기사 기준 내용 해시(요약/이미지 등 하위 캐시 키)
+            "cluster_key": job["cluster_key"],
+            "run_key": run_key,
+            # 증분 모드: 스토리 ID 와 이전에 저장된 Article 번호(있으면 DB 단계에서 새 행 대신 UPDATE)
+            "story_id": int(cluster_id) if generated is not None else "",
+            "article_no": (generated or {}).get(str(cluster_id), {}).get("article_no", ""),
         })
 
         # --- DailyDigest 후보(3줄) 기록 및 대표성 점수 누적 ---
@@ -508,8 +777,6 @@ def main():
                 "source_url": source_url
             })
 
-        time.sleep(SLEEP_BETWEEN_CALLS)
-
     # === 국내경제 최상위 클러스터 3줄 요약 스테이징 생성 ===
     from datetime import timezone, timedelta
     kst = timezone(timedelta(hours=9))
@@ -538,9 +805,15 @@ def main():
                     "one_line_summary": str(line)[:255],
                 })
 
-    # 결과 저장
-    ts = datetime.utcnow().isoformat().replace(":", "-").replace(".", "-")
+    if generated is not None:
+        now_iso = datetime.utcnow().isoformat()
+        # 기존 항목의 article_no 는 유지(다음 DB 저장도 같은 행을 갱신)
+        generated.update({str(job["cluster_id"]): {**generated.get(str(job["cluster_id"]), {}),
+                                                    "cluster_key": job["cluster_key"], "generated_at": now_iso}
+                          for job in jobs})
+        save_generated_stories(generated)
 
+    # 결과 저장
     out_articles = pd.DataFrame(articles_rows)
     cluster_csv = OUT_BASE / f"cluster_articles_for_db_{ts}.csv"
     out_articles.to_csv(cluster_csv, index=False, encoding="utf-8-sig")
@@ -562,6 +835,12 @@ def main():
     print(f"완료: {uniq_csv} ({len(out_src_unique)} unique sources)")
     print(f"완료: {staging_csv} ({len(out_src_staging)} mappings)")
     print(f"완료: {digest_csv} ({len(out_digest)} rows)")
+
+    _image_outputs["articles_csv"] = cluster_csv
+    if _image_pool is not None:
+        print(f"이미지 생성은 백그라운드 진행 중 → wait_for_images() 가 완료 후 {cluster_csv.name} 의 이미지 URL 패치")
+    return cluster_csv
     
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
+    wait_for_images()
\ No newline at end of file
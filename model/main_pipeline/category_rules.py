@@ -0,0 +1,81 @@
+"""
+카테고리 키워드 규칙 공용 모듈
+
+news_cluster(군집 다수결 한글 매핑 / top_category), articles_generator.normalize_category 가
+같은 키워드 규칙을 쓰도록 한 곳에 모았다. 규칙별 키워드 목록과 대소문자 처리는 기존 그대로 유지한다.
+  - 키워드 목록마다 정규식 하나로 컴파일(길이 내림차순 alternation)해 텍스트당 한 번만 스캔
+  - DataFrame 컬럼 단위(any_hit)로 적용 → 행별 apply + .lower() 반복 제거
+"""
+import re
+from typing import Iterable
+
+import numpy as np
+import pandas as pd
+
+# 해외경제 판별 힌트(군집 다수결 한글 매핑 / normalize_category, 대소문자 무시)
+GLOBAL_HINTS = [
+    "미국","중국","일본","유럽","EU","글로벌","세계","월가","연준","Fed","ECB","BOJ",
+    "해외","국제","달러","엔","유로","위안","수입","수출","환율"
+]
+# test_pipeline top_category 의 해외경제 판별 키워드(대소문자 구분)
+ECON_FOREIGN_KEYWORDS = [
+    "해외", "국제", "세계", "글로벌", "대외", "대외요인", "IMF", "WB", "WTO", "OECD",
+    "미국", "중국", "일본", "유럽", "EU", "유로존", "영국", "독일", "프랑스", "인도",
+    "싱가포르", "베트남", "대만", "홍콩", "러시아", "우크라이나", "중동", "UAE", "사우디",
+    "Fed", "연준", "FOMC", "ECB", "BOJ", "BOE", "달러", "엔화", "위안화"
+]
+
+# 원 카테고리가 없을 때 쓰는 주제 키워드(normalize_category 백업 규칙)
+ECON_TOPIC_KEYWORDS = ["수출","환율","금리","경기","주가","증시","기업","채권","물가","부동산","고용"]
+SOCIETY_TOPIC_KEYWORDS = ["범죄","사건","사고","경찰","검찰","재판","복지","교육청","지자체","주거","임대","저소득"]
+
+
+class KeywordMatcher:
+    """키워드 목록 → 컴파일된 정규식 하나 (부분 문자열 포함 여부, 기본 대소문자 무시)"""
+
+    def __init__(self, keywords: Iterable[str], ignore_case: bool = True):
+        self.keywords = list(dict.fromkeys(keywords))
+        self.flags = re.IGNORECASE if ignore_case else 0
+        alternation = "|".join(re.escape(k) for k in sorted(self.keywords, key=len, reverse=True))
+        self.regex = re.compile(alternation, self.flags)
+
+    def search(self, text: str) -> bool:
+        return bool(text) and self.regex.search(text) is not None
+
+    def any_hit(self, texts: pd.Series) -> np.ndarray:
+        """텍스트 컬럼 전체에 대해 키워드 포함 여부(bool 배열)"""
+        return texts.astype(object).fillna("").astype(str).str.contains(self.regex, regex=True).to_numpy(dtype=bool)
+
+
+FOREIGN_MATCHER = KeywordMatcher(GLOBAL_HINTS)
+ECON_FOREIGN_MATCHER = KeywordMatcher(ECON_FOREIGN_KEYWORDS, ignore_case=False)
+ECON_TOPIC_MATCHER = KeywordMatcher(ECON_TOPIC_KEYWORDS)
+SOCIETY_TOPIC_MATCHER = KeywordMatcher(SOCIETY_TOPIC_KEYWORDS)
+
+
+def majority_to_ko(raw: pd.Series, texts: pd.Series) -> pd.Series:
+    """군집 다수결 원 카테고리 + 텍스트 → 한글 4종(사회/트렌드/해외경제/국내경제), 그 외 None"""
+    r = raw.astype(object).fillna("").astype(str).str.lower().to_numpy()
+    foreign = FOREIGN_MATCHER.any_hit(texts)
+    out = np.select(
+        [r == "society", r == "entertainment", (r == "economy") & foreign, r == "economy"],
+        ["사회", "트렌드", "해외경제", "국내경제"],
+        default=None
+    )
+    return pd.Series(out, index=raw.index, dtype=object)
+
+
+def top_categories(raw: pd.Series, texts: pd.Series) -> pd.Series:
+    """원 카테고리 + 텍스트 → [국내경제, 해외경제, 사회, 연예] (기타는 사회)"""
+    r = raw.astype(object).fillna("").astype(str).str.lower()
+    is_econ = (r.str.contains("economy", regex=False) | r.str.contains("경제", regex=False)).to_numpy()
+    is_soc = (r.str.contains("society", regex=False) | r.str.contains("사회", regex=False)).to_numpy()
+    is_ent = (r.str.contains("entertainment", regex=False) | r.str.contains("연예", regex=False)
+              | r.str.contains("culture", regex=False)).to_numpy()
+    foreign = ECON_FOREIGN_MATCHER.any_hit(texts)
+    out = np.select(
+        [is_econ & foreign, is_econ, is_soc, is_ent],
+        ["해외경제", "국내경제", "사회", "연예"],
+        default="사회"
+    )
+    return pd.Series(out, index=raw.index, dtype=object)
@@ -0,0 +1,89 @@
+"""
+군집 분석/품질 지표용 단일 패스 집계
+
+군집마다 불리언 마스크 → value_counts / nlargest / sample 을 반복하던 방식 대신
+라벨을 한 번 정렬·그룹화해서 모든 군집의 통계를 한꺼번에 계산한다.
+  - contingency   : 군집 × 카테고리 빈도 행렬(bincount 1회)
+  - purity        : contingency 행 최댓값 합 / 전체 수
+  - cluster_summaries : 크기·주 카테고리·순도·상위 카테고리·대표 제목·평균 길이·샘플 제목
+"""
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+
+def contingency(pred: np.ndarray, true: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """(군집 ID 배열, 정답 라벨 배열, K×C 빈도 행렬)"""
+    clusters, p = np.unique(np.asarray(pred), return_inverse=True)
+    classes, t = np.unique(np.asarray(true), return_inverse=True)
+    C = np.bincount(p * len(classes) + t, minlength=len(clusters) * len(classes))
+    return clusters, classes, C.reshape(len(clusters), len(classes))
+
+
+def purity(pred: np.ndarray, true: np.ndarray) -> float:
+    if len(pred) == 0:
+        return 0.0
+    return float(contingency(pred, true)[2].max(axis=1).sum() / len(pred))
+
+
+def _group_ranks(groups: np.ndarray, order: np.ndarray) -> np.ndarray:
+    """order(그룹 내 정렬 포함)로 나열했을 때 각 위치의 그룹 내 순위"""
+    g = groups[order]
+    starts = np.r_[0, np.flatnonzero(g[1:] != g[:-1]) + 1]
+    run = np.diff(np.r_[starts, len(g)])
+    return np.arange(len(g)) - np.repeat(starts, run)
+
+
+def _top_per_group(groups: np.ndarray, key: np.ndarray, n_groups: int, top_n: int) -> list:
+    """그룹별 key 오름차순 상위 top_n 위치(동률은 원래 순서) → 그룹별 인덱스 배열 리스트"""
+    order = np.lexsort((key, groups))
+    keep = order[_group_ranks(groups, order) < top_n]
+    bounds = np.searchsorted(groups[keep], np.arange(n_groups + 1))
+    return [keep[bounds[i]:bounds[i + 1]] for i in range(n_groups)]
+
+
+def cluster_summaries(labels: np.ndarray, articles_df: pd.DataFrame, top_n: int = 3,
+                      seed: Optional[int] = None, include_noise: bool = True) -> Dict[int, Dict]:
+    """모든 군집의 분석 결과를 한 번에 계산 → {cluster_id: {...}} (노이즈 -1 은 크기·샘플 제목만)"""
+    labels = np.asarray(labels)
+    if len(labels) == 0:
+        return {}
+    clusters, g = np.unique(labels, return_inverse=True)
+    K = len(clusters)
+    sizes = np.bincount(g, minlength=K)
+
+    cat_codes, cat_names = pd.factorize(articles_df['category'].astype(object).fillna('Unknown'))
+    ncat = max(len(cat_names), 1)
+    C = np.bincount(g * ncat + cat_codes, minlength=K * ncat).reshape(K, ncat)
+    # value_counts 와 같은 순서(빈도 내림차순, 동률은 먼저 등장한 카테고리)
+    cat_order = np.argsort(-C, axis=1, kind='stable')[:, :top_n]
+
+    lengths = pd.to_numeric(articles_df['textLength'], errors='coerce').fillna(0).to_numpy(dtype=np.float64)
+    avg_len = np.bincount(g, weights=lengths, minlength=K) / np.maximum(sizes, 1)
+
+    titles = articles_df['title'].to_numpy(dtype=object)
+    idx = np.arange(len(labels))
+    longest = _top_per_group(g, -lengths, K, top_n)       # nlargest(textLength)
+    first = _top_per_group(g, idx, K, top_n)              # head()
+    rng = np.random.default_rng(seed)
+    sampled = _top_per_group(g, rng.random(len(labels)), K, top_n)  # sample()
+
+    out = {}
+    for i, cid in enumerate(clusters.tolist()):
+        if cid == -1:
+            if include_noise:
+                out[cid] = {'size': int(sizes[i]), 'type': '노이즈', 'sample_titles': titles[first[i]].tolist()}
+            continue
+        row = C[i]
+        top = [j for j in cat_order[i] if row[j] > 0]
+        out[cid] = {
+            'size': int(sizes[i]),
+            'dominant_category': cat_names[top[0]] if top else 'Unknown',
+            'purity': float(row[top[0]] / sizes[i]) if top else 0.0,
+            'categories': {cat_names[j]: int(row[j]) for j in top},
+            'representative_titles': titles[longest[i]].tolist(),
+            'avg_text_length': float(avg_len[i]),
+            'sample_articles': titles[sampled[i]].tolist(),
+        }
+    return out
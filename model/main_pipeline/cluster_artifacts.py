@@ -0,0 +1,81 @@
+"""
+클러스터링 실행 결과(임베딩·라벨·기사 메타) 바이너리 아티팩트 저장/로드
+
+embeddings_and_clusters_*.json (임베딩 float 을 indent=2 텍스트로 덤프) 대신 아래 파일로 저장한다.
+  embeddings_{ts}.npy   : float16 (N×d), np.load(mmap_mode='r') 로 복사 없이 로드 가능
+  labels_{ts}.npy       : int32 (N,)
+  articles_{ts}.parquet : 기사 메타(pyarrow 가 없으면 articles_{ts}.ndjson)
+  run_{ts}.json         : 위 파일 목록 + 메타데이터(모델, 방법, 차원, 기사 수, 시각)
+"""
+import json
+from pathlib import Path
+from typing import Dict, Optional
+
+import numpy as np
+import pandas as pd
+
+MANIFEST_GLOB = 'run_*.json'
+
+
+def _write_articles(df: pd.DataFrame, out_dir: Path, ts: str) -> str:
+    path = out_dir / f'articles_{ts}.parquet'
+    try:
+        df.to_parquet(path, index=False)
+    except (ImportError, ValueError, TypeError):
+        # pyarrow 미설치 또는 혼합 타입 컬럼 → NDJSON
+        path.unlink(missing_ok=True)
+        path = out_dir / f'articles_{ts}.ndjson'
+        df.to_json(path, orient='records', lines=True, force_ascii=False)
+    return path.name
+
+
+def save_run_artifacts(out_dir, ts: str, embeddings: np.ndarray, labels: np.ndarray,
+                       articles_df: pd.DataFrame, metadata: Dict,
+                       embedding_dtype: str = 'float16') -> Path:
+    """아티팩트 저장 후 manifest(run_{ts}.json) 경로 반환"""
+    out_dir = Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+
+    emb_name = f'embeddings_{ts}.npy'
+    lbl_name = f'labels_{ts}.npy'
+    np.save(out_dir / emb_name, np.ascontiguousarray(embeddings, dtype=embedding_dtype))
+    np.save(out_dir / lbl_name, np.asarray(labels, dtype=np.int32))
+    art_name = _write_articles(articles_df, out_dir, ts)
+
+    manifest = {
+        'files': {'embeddings': emb_name, 'labels': lbl_name, 'articles': art_name},
+        'embedding_dtype': embedding_dtype,
+        **metadata,
+    }
+    manifest_path = out_dir / f'run_{ts}.json'
+    with open(manifest_path, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=2)
+    return manifest_path
+
+
+def latest_manifest(out_dir) -> Optional[Path]:
+    files = sorted(Path(out_dir).glob(MANIFEST_GLOB), key=lambda p: p.stat().st_mtime, reverse=True)
+    return files[0] if files else None
+
+
+def load_run_artifacts(manifest_path, mmap: bool = True, columns=None) -> Dict:
+    """manifest 로 아티팩트 로드 → {'embeddings', 'labels', 'articles', 'metadata'}
+    mmap=True 면 임베딩을 메모리 매핑(읽기 전용)으로 반환. columns 로 기사 컬럼 일부만 읽을 수 있음"""
+    manifest_path = Path(manifest_path)
+    base = manifest_path.parent
+    with open(manifest_path, 'r', encoding='utf-8') as f:
+        manifest = json.load(f)
+    files = manifest['files']
+
+    embeddings = np.load(base / files['embeddings'], mmap_mode='r' if mmap else None)
+    labels = np.load(base / files['labels'])
+    art_path = base / files['articles']
+    if art_path.suffix == '.parquet':
+        articles = pd.read_parquet(art_path, columns=columns)
+    else:
+        articles = pd.read_json(art_path, orient='records', lines=True)
+        if columns is not None:
+            articles = articles[list(columns)]
+
+    metadata = {k: v for k, v in manifest.items() if k != 'files'}
+    return {'embeddings': embeddings, 'labels': labels, 'articles': articles, 'metadata': metadata}
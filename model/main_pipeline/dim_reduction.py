@@ -0,0 +1,147 @@
+"""
+밀도 기반 군집화(HDBSCAN / DBSCAN)용 차원 축소 투영: PCA(항상) → UMAP(선택)
+
+768차원 원본 임베딩에서는 거리 대비가 작아(차원의 저주) 밀도 추정이 둔하고 HDBSCAN 코어 거리 계산도 느리다.
+PCA 로 n_components 차원까지 줄이고(L2 정규화 → 유클리드 거리가 코사인 거리와 단조),
+use_umap 이면 그 위에 UMAP(umap-learn, 미설치 시 PCA 만) 을 한 번 더 적용한다.
+
+투영은 한 번 fit 해서 state_dir 에 저장하고, 이후 실행은 저장된 투영으로 transform 만 한다(새 기사 = 행렬곱 1회).
+다음 경우에만 다시 fit 한다:
+  - 임베딩 모델 또는 축소 파라미터가 바뀜
+  - 마지막 fit 후 refit_hours 경과(None 이면 자동 재학습 안 함)
+  - 지난 fit 표본이 min_fit_items 미만이었고 이번 데이터가 더 큼(첫 실행이 작았던 경우)
+저장 형식: <dir>/reducer.npz (mean, components, explained_variance_ratio) + <dir>/reducer.json (메타) [+ umap.pkl]
+"""
+import json
+import pickle
+import importlib.util
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Optional
+
+import numpy as np
+
+DEFAULT_REDUCTION_PARAMS = {
+    'n_components': 50,
+    'use_umap': False,
+    'umap_params': {'n_components': 10, 'n_neighbors': 15, 'min_dist': 0.0, 'metric': 'cosine',
+                    'random_state': 42},
+    'fit_sample': 20000,        # fit 에 쓰는 최대 기사 수(초과 시 무작위 표본)
+    'min_fit_items': 1000,
+    'refit_hours': 168,
+    'seed': 42,
+}
+
+ARRAYS_FILE = 'reducer.npz'
+META_FILE = 'reducer.json'
+UMAP_FILE = 'umap.pkl'
+
+# 바뀌면 저장된 투영을 버리고 다시 fit 하는 파라미터
+_FIT_KEYS = ('n_components', 'use_umap', 'umap_params')
+
+
+def _normalize(V: np.ndarray) -> np.ndarray:
+    return V / (np.linalg.norm(V, axis=1, keepdims=True) + 1e-12)
+
+
+class DimReducer:
+    def __init__(self, path, model_name: str, params: Dict = None):
+        self.path = Path(path)
+        self.model_name = model_name
+        self.params = dict(DEFAULT_REDUCTION_PARAMS)
+        if params:
+            self.params.update(params)
+        if self.params['use_umap'] and importlib.util.find_spec('umap') is None:
+            print("   ⚠️ umap-learn 미설치 → PCA 만 사용 (pip install umap-learn)")
+            self.params['use_umap'] = False
+        self.mean = None                   # (d,)
+        self.components = None             # (n_components × d)
+        self.explained = None              # 성분별 설명 분산 비율
+        self.umap = None
+        self.fitted_at = None
+        self.n_fit = 0
+
+    @property
+    def fitted(self) -> bool:
+        return self.components is not None
+
+    @property
+    def out_dim(self) -> int:
+        if self.umap is not None:
+            return int(self.params['umap_params'].get('n_components', 2))
+        return 0 if self.components is None else len(self.components)
+
+    @classmethod
+    def load(cls, path, model_name: str, params: Dict = None) -> "DimReducer":
+        red = cls(path, model_name, params)
+        meta_path, arr_path = red.path / META_FILE, red.path / ARRAYS_FILE
+        if not (meta_path.exists() and arr_path.exists()):
+            return red
+        with open(meta_path, 'r', encoding='utf-8') as f:
+            meta = json.load(f)
+        if meta.get('model_name') != model_name or any(meta.get(k) != red.params[k] for k in _FIT_KEYS):
+            print("   ⚠️ 저장된 차원 축소 투영의 모델/파라미터가 달라 다시 학습합니다.")
+            return red
+        if red.params['use_umap']:
+            umap_path = red.path / UMAP_FILE
+            if not umap_path.exists():
+                return red
+            with open(umap_path, 'rb') as f:
+                red.umap = pickle.load(f)
+        arrays = np.load(arr_path)
+        red.mean, red.components, red.explained = arrays['mean'], arrays['components'], arrays['explained']
+        red.fitted_at = datetime.fromisoformat(meta['fitted_at'])
+        red.n_fit = int(meta.get('n_fit', 0))
+        return red
+
+    def needs_fit(self, n_items: int, now: datetime = None) -> bool:
+        if not self.fitted:
+            return True
+        refit_hours = self.params['refit_hours']
+        if refit_hours is not None and ((now or datetime.now()) - self.fitted_at).total_seconds() > refit_hours * 3600:
+            return True
+        return self.n_fit < self.params['min_fit_items'] and n_items > self.n_fit
+
+    def fit(self, X: np.ndarray) -> "DimReducer":
+        from sklearn.decomposition import PCA
+        p = self.params
+        X = np.asarray(X, dtype=np.float32)
+        if len(X) > p['fit_sample']:
+            rng = np.random.default_rng(p['seed'])
+            X = X[np.sort(rng.choice(len(X), p['fit_sample'], replace=False))]
+        n_comp = int(min(p['n_components'], len(X), X.shape[1]))
+        pca = PCA(n_components=n_comp, svd_solver='randomized' if n_comp < min(X.shape) else 'full',
+                  random_state=p['seed']).fit(X)
+        self.mean = pca.mean_.astype(np.float32)
+        self.components = pca.components_.astype(np.float32)
+        self.explained = pca.explained_variance_ratio_.astype(np.float32)
+        self.umap = None
+        if p['use_umap']:
+            import umap
+            self.umap = umap.UMAP(**p['umap_params']).fit(self._pca(X))
+        self.fitted_at = datetime.now()
+        self.n_fit = len(X)
+        return self
+
+    def _pca(self, X: np.ndarray) -> np.ndarray:
+        return _normalize((np.asarray(X, dtype=np.float32) - self.mean) @ self.components.T)
+
+    def transform(self, X: np.ndarray) -> np.ndarray:
+        Z = self._pca(X)
+        if self.umap is not None:
+            Z = self.umap.transform(Z)
+        return np.ascontiguousarray(Z, dtype=np.float32)
+
+    def save(self) -> Optional[Path]:
+        if not self.fitted:
+            return None
+        self.path.mkdir(parents=True, exist_ok=True)
+        np.savez(self.path / ARRAYS_FILE, mean=self.mean, components=self.components, explained=self.explained)
+        if self.umap is not None:
+            with open(self.path / UMAP_FILE, 'wb') as f:
+                pickle.dump(self.umap, f)
+        meta = {'model_name': self.model_name, 'fitted_at': self.fitted_at.isoformat(), 'n_fit': self.n_fit,
+                'explained_variance': float(self.explained.sum()), **{k: self.params[k] for k in _FIT_KEYS}}
+        with open(self.path / META_FILE, 'w', encoding='utf-8') as f:
+            json.dump(meta, f, ensure_ascii=False, indent=2)
+        return self.path
@@ -0,0 +1,141 @@
+"""
+여러 실행(수집 시간대)에 걸친 롤링 임베딩 윈도우
+
+최근 window_hours 동안의 기사 임베딩(양자화 저장)·키·최초 등장 시각·마지막 군집 라벨을 유지한다.
+  - lookup  : 이미 윈도우에 있는 기사(originalUrl 기준)의 임베딩을 재사용 → 과거 기사 재임베딩 없음
+  - weights : 시간 감쇠 가중치 0.5 ** (경과시간 / half_life)
+  - assign  : 감쇠 가중 중심(최근 기사가 중심을 더 끌어당김)에 새 기사 배정, 임계값 미만이면 -1
+  - add / relabel / evict : 이번 실행 결과 반영, 재평가된 과거 노이즈 라벨 갱신, 오래된 기사 제거
+저장 형식: <dir>/window.npz (data, scales, seen_at, labels) + <dir>/window.json (모델명, 정밀도, next_label, keys, titles)
+임베딩 모델이 바뀌면 벡터 공간이 달라지므로 기존 윈도우를 버리고 새로 시작한다.
+"""
+import json
+from datetime import datetime
+from pathlib import Path
+from typing import List, Tuple
+
+import numpy as np
+
+from quantized_embeddings import QuantizedEmbeddings
+from run_manifest import hash_array, stable_hash
+
+ARRAYS_FILE = 'window.npz'
+META_FILE = 'window.json'
+
+
+class EmbeddingWindow:
+    def __init__(self, path, model_name: str, precision: str = 'float16'):
+        self.path = Path(path)
+        self.model_name = model_name
+        self.precision = precision
+        self.store = None                              # QuantizedEmbeddings (N×d)
+        self.seen_at = np.zeros(0, dtype=np.float64)   # 최초 등장 시각(epoch 초)
+        self.labels = np.zeros(0, dtype=np.int64)      # 마지막으로 부여된 군집 라벨(-1 = 노이즈)
+        self.keys: List[str] = []
+        self.titles: List[str] = []
+        self.next_label = 0
+
+    def __len__(self):
+        return len(self.keys)
+
+    @classmethod
+    def load(cls, path, model_name: str, precision: str = 'float16') -> "EmbeddingWindow":
+        win = cls(path, model_name, precision)
+        meta_path, arr_path = win.path / META_FILE, win.path / ARRAYS_FILE
+        if not (meta_path.exists() and arr_path.exists()):
+            return win
+        with open(meta_path, 'r', encoding='utf-8') as f:
+            meta = json.load(f)
+        if meta.get('model_name') != model_name:
+            print(f"   ⚠️ 윈도우 상태의 모델({meta.get('model_name')})이 현재 모델과 달라 초기화합니다.")
+            return win
+        arrays = np.load(arr_path)
+        scales = arrays['scales'] if arrays['scales'].size else None
+        win.precision = meta.get('precision', precision)
+        win.store = QuantizedEmbeddings(arrays['data'], scales, win.precision)
+        win.seen_at, win.labels = arrays['seen_at'], arrays['labels']
+        win.keys, win.titles = meta.get('keys', []), meta.get('titles', [])
+        win.next_label = int(meta.get('next_label', 0))
+        return win
+
+    def state_hash(self) -> str:
+        """재사용·배정에 쓰이는 윈도우 상태(임베딩·시각·라벨·키·next_label) 해시 → 실행 manifest 입력"""
+        data = hash_array(self.store.data) if self.store is not None else None
+        scales = hash_array(self.store.scales) if self.store is not None and self.store.scales is not None else None
+        return stable_hash([data, scales, hash_array(self.seen_at), hash_array(self.labels), self.keys,
+                            self.next_label])
+
+    def lookup(self, keys) -> Tuple[np.ndarray, np.ndarray]:
+        """keys 중 윈도우에 있는 것 → (found 마스크, 윈도우 행 번호(-1 = 없음))"""
+        pos = {k: i for i, k in enumerate(self.keys)}
+        rows = np.array([pos.get(k, -1) for k in keys], dtype=np.int64)
+        return rows >= 0, rows
+
+    def weights(self, now: datetime, half_life_hours: float) -> np.ndarray:
+        age_h = np.maximum(now.timestamp() - self.seen_at, 0.0) / 3600.0
+        return np.power(0.5, age_h / half_life_hours).astype(np.float32)
+
+    def assign(self, E: np.ndarray, threshold: float, now: datetime, half_life_hours: float) -> np.ndarray:
+        """감쇠 가중 군집 중심과의 코사인 >= threshold 이면 그 군집 라벨, 아니면 -1"""
+        member = np.where(self.labels != -1)[0] if len(self) else np.zeros(0, dtype=np.int64)
+        if len(member) == 0:
+            return np.full(len(E), -1, dtype=np.int64)
+        uniq, inv = np.unique(self.labels[member], return_inverse=True)
+        w = self.weights(now, half_life_hours)[member]
+        order = np.argsort(inv, kind='stable')
+        starts = np.searchsorted(inv[order], np.arange(len(uniq)))
+        V = self.store.take(member[order]).dequantize() * w[order, None]
+        centers = np.add.reduceat(V, starts, axis=0)
+        centers /= np.linalg.norm(centers, axis=1, keepdims=True) + 1e-12
+        sims = np.asarray(E, dtype=np.float32) @ centers.T
+        best = np.argmax(sims, axis=1)
+        best_sim = sims[np.arange(len(E)), best]
+        return np.where(best_sim >= threshold, uniq[best], -1).astype(np.int64)
+
+    def add(self, E: np.ndarray, labels: np.ndarray, keys, titles, now: datetime):
+        """이번 실행 기사 추가. 이미 있는 키는 라벨만 갱신(최초 등장 시각·임베딩 유지)"""
+        found, rows = self.lookup(keys)
+        if found.any():
+            self.labels[rows[found]] = labels[found]
+        new = ~found
+        if new.any():
+            q = QuantizedEmbeddings.from_array(np.asarray(E)[new], self.precision)
+            if self.store is None or len(self) == 0:
+                self.store = q
+            else:
+                scales = None if q.scales is None else np.concatenate([self.store.scales, q.scales])
+                self.store = QuantizedEmbeddings(np.vstack([self.store.data, q.data]), scales, self.precision)
+            self.seen_at = np.concatenate([self.seen_at, np.full(int(new.sum()), now.timestamp())])
+            self.labels = np.concatenate([self.labels, np.asarray(labels, dtype=np.int64)[new]])
+            self.keys += [k for k, f in zip(keys, found) if not f]
+            self.titles += [t for t, f in zip(titles, found) if not f]
+        valid = np.asarray(labels)[np.asarray(labels) != -1]
+        if len(valid):
+            self.next_label = max(self.next_label, int(valid.max()) + 1)
+
+    def relabel(self, rows: np.ndarray, labels: np.ndarray):
+        self.labels[rows] = labels
+        valid = labels[labels != -1]
+        if len(valid):
+            self.next_label = max(self.next_label, int(valid.max()) + 1)
+
+    def evict(self, max_age_hours: float, now: datetime) -> int:
+        if len(self) == 0:
+            return 0
+        keep = (now.timestamp() - self.seen_at) <= max_age_hours * 3600.0
+        removed = int((~keep).sum())
+        if removed:
+            self.store = self.store.take(np.where(keep)[0])
+            self.seen_at, self.labels = self.seen_at[keep], self.labels[keep]
+            self.keys = [k for k, f in zip(self.keys, keep) if f]
+            self.titles = [t for t, f in zip(self.titles, keep) if f]
+        return removed
+
+    def save(self):
+        self.path.mkdir(parents=True, exist_ok=True)
+        data = self.store.data if self.store is not None else np.zeros((0, 0), dtype=np.float16)
+        scales = self.store.scales if self.store is not None and self.store.scales is not None else np.zeros(0)
+        np.savez(self.path / ARRAYS_FILE, data=data, scales=scales, seen_at=self.seen_at, labels=self.labels)
+        with open(self.path / META_FILE, 'w', encoding='utf-8') as f:
+            json.dump({'model_name': self.model_name, 'precision': self.precision, 'next_label': self.next_label,
+                       'keys': self.keys, 'titles': self.titles}, f, ensure_ascii=False)
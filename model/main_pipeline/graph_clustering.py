@@ -0,0 +1,117 @@
+"""
+희소 mutual-kNN 코사인 그래프 위의 커뮤니티 탐지 군집화
+
+밀집 임베딩 행렬 전체 거리 계산 없이 ANN 인덱스(ann_index)로 kNN 을 구해
+서로의 kNN 에 모두 들어 있고 코사인 ≥ min_sim 인 간선만 남긴 희소 그래프를 만든 뒤 분할한다.
+간선 수가 O(N·k) 라 그래프 생성·분할 모두 기사 수에 거의 선형이다.
+
+알고리즘(algorithm='auto' 는 설치된 것 중 앞에서부터):
+  1) leiden     : igraph + leidenalg (pip install igraph leidenalg), RB-configuration, resolution 지원
+  2) louvain    : networkx >= 2.8 (pip install networkx)
+  3) components : scipy 연결 요소(임계값 그래프) - 추가 의존성 없음
+min_cluster_size 미만 커뮤니티는 노이즈(-1). mutual 조건 때문에 간선이 없는 고립 기사는
+attach_isolated 면 kNN 중 가장 가까운 군집 기사(코사인 ≥ min_sim)의 커뮤니티로, 없으면 노이즈로 둔다.
+"""
+from typing import Dict
+
+import numpy as np
+
+DEFAULT_GRAPH_PARAMS = {
+    'k': 15,
+    'min_sim': 0.5,
+    'mutual': True,
+    'algorithm': 'auto',       # auto | leiden | louvain | components
+    'resolution': 1.0,
+    'min_cluster_size': 5,
+    'attach_isolated': True,   # mutual 조건으로 고립된 기사를 최근접 이웃(≥ min_sim)의 커뮤니티에 붙임
+    'seed': 42,
+}
+
+
+def _leiden(G, params) -> np.ndarray:
+    import igraph as ig
+    import leidenalg
+    U = G.tocoo()
+    keep = U.row < U.col
+    g = ig.Graph(n=G.shape[0], edges=list(zip(U.row[keep].tolist(), U.col[keep].tolist())))
+    part = leidenalg.find_partition(g, leidenalg.RBConfigurationVertexPartition,
+                                    weights=U.data[keep].astype(float).tolist(),
+                                    resolution_parameter=params['resolution'], seed=params['seed'])
+    return np.asarray(part.membership, dtype=np.int64)
+
+
+def _louvain(G, params) -> np.ndarray:
+    import networkx as nx
+    graph = nx.from_scipy_sparse_array(G)
+    communities = nx.community.louvain_communities(graph, weight='weight', resolution=params['resolution'],
+                                                   seed=params['seed'])
+    labels = np.empty(G.shape[0], dtype=np.int64)
+    for cid, members in enumerate(communities):
+        labels[list(members)] = cid
+    return labels
+
+
+def _components(G, params) -> np.ndarray:
+    from scipy.sparse.csgraph import connected_components
+    _, labels = connected_components(G, directed=False)
+    return labels.astype(np.int64)
+
+
+_ALGORITHMS = {'leiden': _leiden, 'louvain': _louvain, 'components': _components}
+
+
+def _partition(G, params):
+    name = params['algorithm']
+    if name != 'auto':
+        return _ALGORITHMS[name](G, params), name
+    for cand in ('leiden', 'louvain'):
+        try:
+            return _ALGORITHMS[cand](G, params), cand
+        except (ImportError, AttributeError):   # 미설치 / networkx 구버전(louvain 없음)
+            continue
+    return _components(G, params), 'components'
+
+
+def _finalize(raw: np.ndarray, degree: np.ndarray, min_size: int) -> np.ndarray:
+    """고립 노드·작은 커뮤니티 → -1, 나머지는 크기 내림차순으로 0.. 재번호"""
+    raw = np.where(degree > 0, raw, -1)
+    uniq, inv, counts = np.unique(raw, return_inverse=True, return_counts=True)
+    ok = (uniq != -1) & (counts >= min_size)
+    order = np.argsort(-counts[ok], kind='stable')
+    new_ids = np.full(len(uniq), -1, dtype=np.int64)
+    new_ids[np.where(ok)[0][order]] = np.arange(int(ok.sum()))
+    return new_ids[inv.ravel()]
+
+
+def _attach_isolated(X: np.ndarray, labels: np.ndarray, degree: np.ndarray, index, params) -> np.ndarray:
+    lonely = np.where(degree == 0)[0]
+    if len(lonely) == 0 or not (labels != -1).any():
+        return labels
+    idx, sims = index.knn(np.asarray(X)[lonely], min(params['k'], len(X) - 1) + 1)
+    nb = np.where(idx >= 0, labels[np.maximum(idx, 0)], -1)
+    ok = (nb != -1) & (sims >= params['min_sim'])
+    first = np.argmax(ok, axis=1)                 # 유사도 내림차순이므로 첫 번째 유효 이웃이 최근접
+    hit = ok[np.arange(len(lonely)), first]
+    out = labels.copy()
+    out[lonely[hit]] = nb[np.arange(len(lonely)), first][hit]
+    return out
+
+
+def graph_communities(X: np.ndarray, params: Dict = None, ann_params: Dict = None, index=None):
+    """mutual-kNN 그래프 커뮤니티 → (labels, 사용한 알고리즘, 간선 수). index 는 X 위의 ANNIndex(재사용 시)"""
+    p = dict(DEFAULT_GRAPH_PARAMS)
+    if params:
+        p.update(params)
+    n = len(X)
+    if n < 2:
+        return np.full(n, -1, dtype=np.int64), 'none', 0
+    if index is None:
+        from ann_index import build_index
+        index = build_index(X, ann_params)
+    G = index.knn_graph(min(p['k'], n - 1), mutual=p['mutual'], min_sim=p['min_sim'])
+    degree = np.diff(G.indptr)
+    raw, algorithm = _partition(G, p)
+    labels = _finalize(raw, degree, p['min_cluster_size'])
+    if p['attach_isolated']:
+        labels = _attach_isolated(X, labels, degree, index, p)
+    return labels, algorithm, int(G.nnz // 2)
@@ -0,0 +1,134 @@
+"""
+K-Means k 선택 엔진
+
+run_clustering 의 K-Means 분기에서 k_min~k_max 를 전부 full fit + 전체 실루엣으로 훑던 것을
+아래 방식으로 대체한다.
+  - 후보 k를 n_jobs 개씩 묶어(wave) 스레드로 병렬 학습
+  - 다음 wave 는 직전 wave 의 가장 큰 k 중심에서 출발(warm start, farthest-first 로 중심 추가)
+  - 실루엣은 cluster_scoring.ScoringContext 로 계산(거리 블록을 스윕 전체에서 한 번만 계산),
+    데이터가 크면 MiniBatchKMeans 로 스윕
+  - 최고 점수 이후 patience 개의 k가 연속으로 min_delta 이상 개선하지 못하면 스윕 중단
+최종 k는 선택된 중심에서 full KMeans 로 한 번 더 다듬는다.
+"""
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from cluster_scoring import ScoringContext
+
+DEFAULT_SELECT_PARAMS = {
+    'n_jobs': min(4, os.cpu_count() or 1),
+    'patience': 3,
+    'min_delta': 0.005,
+    'minibatch_threshold': 5000,
+    'minibatch_batch_size': 1024,
+}
+
+
+def extend_centers(X: np.ndarray, centers: np.ndarray, k: int) -> np.ndarray:
+    """기존 중심에 가장 먼 점을 차례로 추가해 k개 중심을 만든다(farthest-first)."""
+    centers = np.asarray(centers, dtype=X.dtype)
+    if len(centers) >= k:
+        return centers[:k].copy()
+    x_sq = np.einsum('ij,ij->i', X, X)
+    if len(centers):
+        c_sq = np.einsum('ij,ij->i', centers, centers)
+        d2 = (x_sq[:, None] - 2.0 * (X @ centers.T) + c_sq[None, :]).min(axis=1)
+    else:
+        d2 = np.full(len(X), np.inf)
+    out = list(centers)
+    while len(out) < k:
+        nxt = int(np.argmax(d2))
+        out.append(X[nxt])
+        d2 = np.minimum(d2, x_sq - 2.0 * (X @ X[nxt]) + x_sq[nxt])
+    return np.vstack(out)
+
+
+def _fit_one(X: np.ndarray, k: int, init: Optional[np.ndarray], kmeans_params: Dict,
+             params: Dict, scorer: ScoringContext) -> Tuple[int, float, np.ndarray, np.ndarray]:
+    from sklearn.cluster import KMeans, MiniBatchKMeans
+
+    fit_params = dict(kmeans_params)
+    if init is not None:
+        fit_params.update(init=init, n_init=1)
+
+    if len(X) >= params['minibatch_threshold']:
+        km = MiniBatchKMeans(n_clusters=k, batch_size=params['minibatch_batch_size'],
+                             **{key: v for key, v in fit_params.items() if key != 'max_iter'})
+    else:
+        km = KMeans(n_clusters=k, **fit_params)
+    lbl = km.fit_predict(X)
+
+    if len(set(lbl)) < 2:
+        return k, -1.0, lbl, km.cluster_centers_
+    return k, float(scorer.score(lbl)), lbl, km.cluster_centers_
+
+
+def select_kmeans_k(X: np.ndarray, k_min: int, k_max: int, kmeans_params: Dict,
+                    select_params: Dict = None,
+                    scorer: ScoringContext = None) -> Tuple[Optional[int], float, Optional[np.ndarray], List[Dict]]:
+    """k 스윕 후 (best_k, best_score, best_labels, history) 반환. 후보가 없으면 best_k=None"""
+    params = dict(DEFAULT_SELECT_PARAMS)
+    if select_params:
+        params.update(select_params)
+
+    n = len(X)
+    candidates = [k for k in range(k_min, k_max + 1) if k < n]
+    if not candidates:
+        return None, -1.0, None, []
+
+    if scorer is None:
+        scorer = ScoringContext(X)
+    scorer.prepare()  # 스레드 시작 전에 거리 블록 준비
+
+    from threadpoolctl import threadpool_limits
+
+    n_jobs = max(1, int(params['n_jobs']))
+    n_threads = max(1, (os.cpu_count() or 1) // n_jobs)
+
+    history = []
+    best = None          # (k, score, labels, centers)
+    prev_centers = None  # 직전 wave 에서 가장 큰 k의 중심
+    since_best = 0
+
+    # BLAS/OpenMP 스레드 수는 프로세스 전역 설정이라 워커 스레드마다 바꾸면 진입·복원 순서가 엇갈려
+    # 스윕 뒤에도 줄어든 값이 남을 수 있다 → 스윕 전체를 한 번만 감싸고 끝나면 원래 값으로 복원
+    with threadpool_limits(limits=n_threads), ThreadPoolExecutor(max_workers=n_jobs) as pool:
+        for w in range(0, len(candidates), n_jobs):
+            wave = candidates[w:w + n_jobs]
+            futures = [
+                pool.submit(_fit_one, X, k,
+                            None if prev_centers is None else extend_centers(X, prev_centers, k),
+                            kmeans_params, params, scorer)
+                for k in wave
+            ]
+            outs = sorted((f.result() for f in futures), key=lambda o: o[0])
+
+            stop = False
+            for k, sc, lbl, centers in outs:
+                history.append({'k': k, 'silhouette': sc})
+                if best is None or sc > best[1] + params['min_delta']:
+                    best, since_best = (k, sc, lbl, centers), 0
+                else:
+                    if sc > best[1]:
+                        best = (k, sc, lbl, centers)
+                    since_best += 1
+                    if since_best >= params['patience']:
+                        stop = True
+                        break
+            prev_centers = outs[-1][3]
+            if stop:
+                break
+
+    best_k, best_score, best_labels, best_centers = best
+    if best_score <= -1.0:
+        # 모든 후보가 군집 1개로 붕괴 → 호출 측 안전망에 맡김
+        return None, -1.0, None, history
+    # 선택된 k는 full KMeans 로 마무리(선택 중심에서 warm start)
+    _, sc, lbl, _ = _fit_one(X, best_k, best_centers, kmeans_params,
+                             dict(params, minibatch_threshold=np.inf), scorer)
+    if sc >= best_score:
+        best_score, best_labels = sc, lbl
+    return best_k, best_score, best_labels, history
@@ -0,0 +1,108 @@
+"""
+클러스터링 후보 방법 동시 실행기
+
+HDBSCAN / K-Means / DBSCAN 등은 같은 임베딩만 읽는 독립 작업이므로,
+임베딩을 임시 .npy 파일로 한 번 저장한 뒤 방법마다 별도 프로세스에서
+np.load(mmap_mode='r') 로 공유(복사 없이 페이지 캐시 공유)해 동시에 실행한다.
+방법별 시간 예산을 넘기면 해당 프로세스를 종료하고 'timeout' 으로 보고한다.
+
+각 방법 함수는 fn(X, config) -> payload 형태의 모듈 최상위 함수여야 한다(프로세스 전달용).
+views={방법명: 행렬} 로 일부 방법에만 다른 입력(예: 차원 축소 임베딩)을 줄 수 있다(행렬마다 .npy 하나).
+반환: {name: (status, payload | 오류 메시지, 경과 초)}, status ∈ {'ok', 'error', 'timeout'}
+"""
+import os
+import time
+import tempfile
+import multiprocessing as mp
+from multiprocessing.connection import wait
+from pathlib import Path
+from typing import Callable, Dict, Tuple
+
+import numpy as np
+
+
+def _worker(fn: Callable, mmap_path: str, config: Dict, n_threads: int, conn):
+    try:
+        from threadpoolctl import threadpool_limits
+        X = np.load(mmap_path, mmap_mode='r')
+        with threadpool_limits(limits=n_threads):
+            out = fn(X, config)
+        conn.send(('ok', out))
+    except Exception as e:
+        conn.send(('error', f"{type(e).__name__}: {e}"))
+    finally:
+        conn.close()
+
+
+def _run_inline(methods: Dict[str, Callable], X: np.ndarray, config: Dict, views: Dict) -> Dict[str, Tuple]:
+    outcomes = {}
+    for name, fn in methods.items():
+        t0 = time.perf_counter()
+        try:
+            outcomes[name] = ('ok', fn(views.get(name, X), config), time.perf_counter() - t0)
+        except Exception as e:
+            outcomes[name] = ('error', f"{type(e).__name__}: {e}", time.perf_counter() - t0)
+    return outcomes
+
+
+def run_methods(embeddings: np.ndarray, methods: Dict[str, Callable], config: Dict,
+                parallel: bool = True, time_budget_s: float = None,
+                min_items: int = 0, views: Dict[str, np.ndarray] = None) -> Dict[str, Tuple]:
+    """methods 를 실행해 방법별 (status, payload, elapsed) 반환"""
+    if not methods:
+        return {}
+    views = views or {}
+    if not parallel or len(methods) == 1 or (os.cpu_count() or 1) < 2 or len(embeddings) < min_items:
+        # 방법이 하나이거나 코어가 하나뿐이거나 데이터가 작으면 워커 기동 비용(프로세스당 수 초의 import)이
+        # 더 크므로 현재 프로세스에서 순차 실행(시간 예산 미적용)
+        return _run_inline(methods, embeddings, config, views)
+
+    n_threads = max(1, (os.cpu_count() or 1) // len(methods))
+    # macOS 기본과 동일한 spawn 으로 통일(fork 후 BLAS/OpenMP 스레드 상태 문제 회피)
+    ctx = mp.get_context('spawn')
+    outcomes = {}
+
+    with tempfile.TemporaryDirectory(prefix='news_cluster_') as tmp:
+        mmap_path = str(Path(tmp) / 'embeddings.npy')
+        np.save(mmap_path, np.ascontiguousarray(embeddings, dtype=np.float32))
+        # 같은 view 행렬을 쓰는 방법들은 파일 하나를 공유
+        view_paths = {}
+        for name, V in views.items():
+            if name in methods and id(V) not in view_paths:
+                view_paths[id(V)] = str(Path(tmp) / f'view_{len(view_paths)}.npy')
+                np.save(view_paths[id(V)], np.ascontiguousarray(V, dtype=np.float32))
+
+        running = {}  # conn -> (name, process, t0)
+        for name, fn in methods.items():
+            recv, send = ctx.Pipe(duplex=False)
+            path = view_paths[id(views[name])] if name in views else mmap_path
+            p = ctx.Process(target=_worker, args=(fn, path, config, n_threads, send),
+                            name=f"cluster-{name}", daemon=True)
+            p.start()
+            send.close()
+            running[recv] = (name, p, time.perf_counter())
+
+        deadline = None if time_budget_s is None else time.perf_counter() + time_budget_s
+        while running:
+            timeout = None if deadline is None else max(0.0, deadline - time.perf_counter())
+            ready = wait(list(running), timeout=timeout)
+            if not ready:
+                break  # 남은 방법은 모두 예산 초과
+            for conn in ready:
+                name, p, t0 = running.pop(conn)
+                try:
+                    status, payload = conn.recv()
+                except EOFError:
+                    p.join()
+                    status, payload = 'error', f"워커 비정상 종료(exitcode={p.exitcode})"
+                outcomes[name] = (status, payload, time.perf_counter() - t0)
+                conn.close()
+                p.join()
+
+        for conn, (name, p, t0) in running.items():
+            p.terminate()
+            p.join()
+            conn.close()
+            outcomes[name] = ('timeout', None, time.perf_counter() - t0)
+
+    return outcomes
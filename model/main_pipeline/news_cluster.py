@@ -7,17 +7,16 @@ from typing import Dict
 import warnings
 import logging
 
-from sentence_transformers import SentenceTransformer
-from sklearn.cluster import KMeans, DBSCAN
-from sklearn.metrics import silhouette_score, adjusted_rand_score
-import hdbscan
-import matplotlib.pyplot as plt
-from collections import Counter
 
+from cluster_scoring import ScoringContext
+from cluster_analytics import cluster_summaries, purity
+from pipeline_trace import PipelineTracer, traced
+from run_manifest import build_manifest, derive_seed, hash_array, hash_file, hash_frame, seed_everything
+
+# sentence_transformers / sklearn / hdbscan 은 import 비용이 커서(수 초) 실제로 쓰는 함수 안에서 지연 import 한다.
+# 오케스트레이터가 단계마다 새 프로세스로 실행하므로 모듈 로드 시간이 곧 콜드 스타트 시간이다.
 warnings.filterwarnings('ignore')
 logging.getLogger('sentence_transformers').setLevel(logging.ERROR)
-plt.rcParams['font.family'] = ['AppleGothic', 'Arial Unicode MS']
-plt.rcParams['axes.unicode_minus'] = False
 
 def convert_numpy_types(obj):
     """numpy int, float 타입을 python 기본 타입으로 변환 재귀함수"""
@@ -32,6 +31,142 @@ def convert_numpy_types(obj):
     else:
         return obj
 
+# 군집 분할 판단(쌍별 코사인 중앙값 < 임계값)용 파라미터
+SPLIT_CHECK_BLOCK_ROWS = 512       # 정확 계산 시 한 번에 만드는 유사도 블록 행 수 → 메모리 O(블록 × 군집 크기)
+SPLIT_CHECK_SAMPLE_PAIRS = 20000   # 이보다 쌍이 많으면 먼저 표본 쌍으로 판단
+SPLIT_CHECK_DELTA = 1e-6           # 표본 판단의 허용 오판 확률(Hoeffding)
+
+
+def median_pairwise_cosine_below(V: np.ndarray, threshold: float,
+                                 block_rows: int = SPLIT_CHECK_BLOCK_ROWS,
+                                 sample_pairs: int = SPLIT_CHECK_SAMPLE_PAIRS,
+                                 seed: int = 42) -> bool:
+    """정규화 벡터 V의 쌍별 코사인 중앙값이 threshold 미만인지 판단 (V @ V.T 전체를 만들지 않음)
+
+    중앙값 < t 는 't 미만 쌍의 비율 > 1/2' 와 같으므로 개수 세기로 풀 수 있다.
+    1) 쌍이 많으면 표본 쌍의 비율로 판단하되, Hoeffding 오차 범위 밖일 때만 확정
+    2) 그 외에는 블록 단위로 상삼각 쌍을 스트리밍하며 정확히 센다(np.median 결과와 동일한 판단)
+    """
+    n = len(V)
+    n_pairs = n * (n - 1) // 2
+    if n_pairs == 0:
+        return False
+
+    if n_pairs > sample_pairs:
+        rng = np.random.default_rng(seed)
+        i = rng.integers(0, n, sample_pairs)
+        j = rng.integers(0, n - 1, sample_pairs)
+        j = j + (j >= i)  # i != j 인 쌍을 균등 추출
+        frac_below = float(np.mean(np.einsum('ij,ij->i', V[i], V[j]) < threshold))
+        eps = np.sqrt(np.log(2.0 / SPLIT_CHECK_DELTA) / (2.0 * sample_pairs))
+        if frac_below > 0.5 + eps:
+            return True
+        if frac_below < 0.5 - eps:
+            return False
+
+    # 정확 판단: t 미만 개수, t 미만 최댓값, t 이상 최솟값만 유지
+    below, max_below, min_above = 0, -np.inf, np.inf
+    for start in range(0, n - 1, block_rows):
+        stop = min(start + block_rows, n)
+        S = V[start:stop] @ V[start:].T
+        rows = np.arange(stop - start)[:, None]
+        cols = np.arange(n - start)[None, :]
+        vals = S[cols > rows]
+        lo = vals < threshold
+        below += int(lo.sum())
+        if lo.any():
+            max_below = max(max_below, float(vals[lo].max()))
+        if not lo.all():
+            min_above = min(min_above, float(vals[~lo].min()))
+
+    half = n_pairs // 2
+    if n_pairs % 2 == 1:
+        return below >= half + 1
+    if below != half:
+        return below > half
+    # 짝수 개: 중앙값 = 가운데 두 값(t 미만 최댓값, t 이상 최솟값)의 평균
+    return (max_below + min_above) / 2.0 < threshold
+
+
+def _cluster_summary(labels: np.ndarray) -> str:
+    n_clusters = len(set(labels)) - (1 if -1 in labels else 0)
+    n_noise = int(np.sum(labels == -1))
+    return f"{n_clusters}개 클러스터, 노이즈 {n_noise}개"
+
+
+def cluster_hdbscan(X: np.ndarray, config: Dict):
+    """HDBSCAN → (labels, 요약 문자열)"""
+    import hdbscan
+    clusterer = hdbscan.HDBSCAN(**config['hdbscan_params'])
+    labels = clusterer.fit_predict(X)
+    return labels, _cluster_summary(labels)
+
+
+# 파이프라인의 실행당 ScoringContext(config['scorer_id'] → 컨텍스트). 같은 프로세스에서 실행되면 거리 블록 공유
+_SHARED_SCORERS = {}
+
+
+def cluster_kmeans(X: np.ndarray, config: Dict):
+    """K-Means(k 스윕) → (labels, 요약 문자열)"""
+    from sklearn.cluster import KMeans
+    from kmeans_select import select_kmeans_k
+    n = len(X)
+    k_min = max(4, int(np.sqrt(n)))           # 데이터 크기 기반 하한
+    k_max = min(24, max(6, int(np.sqrt(n)*2)))# 상한
+    # 인라인 실행이면 파이프라인이 채점에 쓰는 컨텍스트를 그대로 사용(거리 블록 1회).
+    # spawn 워커 프로세스에는 전달되지 않으므로(mmap 입력) 워커 안에서만 따로 만든다
+    scorer = _SHARED_SCORERS.get(config.get('scorer_id'))
+    if scorer is None or scorer.X is not X:
+        scorer = ScoringContext(X, config['scoring_params'])
+    best_k, best_score, best_labels, history = select_kmeans_k(
+        X, k_min, k_max, config['kmeans_params'], config['kmeans_select_params'], scorer=scorer
+    )
+
+    if best_labels is None:
+        # 안전망: 기존 방식으로라도 한 번 계산
+        fallback_k = min(15, max(2, k_min))
+        km = KMeans(n_clusters=fallback_k, **config['kmeans_params'])
+        best_labels = km.fit_predict(X)
+        best_k = fallback_k
+
+    sweep = f", k 스윕 {len(history)}개 후보" if history else ""
+    return best_labels, f"{best_k}개 클러스터{sweep}"
+
+
+def cluster_dbscan(X: np.ndarray, config: Dict):
+    """DBSCAN → (labels, 요약 문자열)"""
+    from sklearn.cluster import DBSCAN
+    labels = DBSCAN(**config['dbscan_params']).fit_predict(X)
+    return labels, _cluster_summary(labels)
+
+
+# 파이프라인이 이미 만든 ANN 인덱스(저장 경로 → 인덱스). 같은 프로세스에서 실행되면 저장본 대신 그대로 사용
+_SHARED_ANN_INDEXES = {}
+
+
+def cluster_knn_graph(X: np.ndarray, config: Dict):
+    """희소 mutual-kNN 코사인 그래프 커뮤니티(Leiden/Louvain/연결 요소) → (labels, 요약 문자열).
+    config['ann_index_path'] 가 있으면 X 위에 이미 만든 인덱스를 재사용(워커 프로세스는 저장본 로드)"""
+    from graph_clustering import graph_communities
+    index, path = None, config.get('ann_index_path')
+    if path:
+        index = _SHARED_ANN_INDEXES.get(path)
+        if index is None:
+            from ann_index import load_index
+            index = load_index(path, X)
+    labels, algorithm, n_edges = graph_communities(X, config['graph_params'], config['ann_params'], index=index)
+    return labels, f"{_cluster_summary(labels)} ({algorithm}, 간선 {n_edges}개)"
+
+
+# clustering_methods 에서 이름으로 선택되는 방법들 (모듈 최상위 함수여야 워커 프로세스로 전달 가능)
+CLUSTERING_METHODS = {
+    'HDBSCAN': cluster_hdbscan,
+    'K-Means': cluster_kmeans,
+    'DBSCAN': cluster_dbscan,
+    'KNN-Graph': cluster_knn_graph,
+}
+
+
 class KoSimCSENewsPipeline:
     def __init__(self, config: Dict = None):
         self.config = {
@@ -40,6 +175,7 @@ class KoSimCSENewsPipeline:
             'min_text_length': 50,
             'min_title_length': 10,
             'max_text_length': 1000,
+            'article_fields': None,     # None → news_loader.ARTICLE_FIELDS
             'clustering_methods': ['HDBSCAN', 'K-Means', 'DBSCAN'],
             'hdbscan_params': {
                 'min_cluster_size': 12,
@@ -52,16 +188,65 @@ class KoSimCSENewsPipeline:
                 'max_iter': 500,
                 'random_state': 42
             },
+            # k 스윕 엔진 설정 (kmeans_select.DEFAULT_SELECT_PARAMS 를 덮어씀)
+            'kmeans_select_params': {},
             'dbscan_params': {
                 'eps': 0.3,
                 'min_samples': 10,
                 'metric': 'cosine'
             },
+            # 밀도 기반 방법(reduction_methods)은 차원 축소 공간에서 실행: PCA(+선택 UMAP) 투영을 한 번 fit 해
+            # reduction_state_dir 에 저장하고 이후 실행은 transform 만 (dim_reduction.DEFAULT_REDUCTION_PARAMS 를 덮어씀)
+            'reduce_dims': True,
+            'reduction_methods': ['HDBSCAN', 'DBSCAN'],
+            'reduction_params': {},
+            'reduction_state_dir': str(Path(__file__).resolve().parents[2] / "model" / "results" / "cluster_results" / "reduction_state"),
+            # 'KNN-Graph' 방법 설정 (graph_clustering.DEFAULT_GRAPH_PARAMS 를 덮어씀, kNN 은 ann_params 인덱스 사용)
+            'graph_params': {},
+            # 방법별 프로세스 동시 실행 / 방법당 시간 예산(초, 초과 시 후보 제외)
+            'parallel_methods': True,
+            'method_time_budget_s': 900,
+            'parallel_methods_min_items': 2000,
+            # 임베딩 ANN(kNN) 인덱스 (ann_index.DEFAULT_ANN_PARAMS 를 덮어씀). 만들어진 인덱스는 결과와 함께 저장.
+            # True 면 실행마다 미리 생성(knn_graph 등 외부 사용용), 기본은 필요한 단계에서만 생성
+            'build_ann_index': False,
+            'ann_params': {},
+            # 증분 모드: 지난 실행의 스토리(군집) 중심을 유지하고 새 기사를 코사인 임계값 이상이면 기존 스토리에 배정,
+            # 나머지만 incremental_methods 로 새로 군집화. 군집 번호 = 실행 간 안정적인 스토리 ID
+            'incremental': False,
+            'incremental_methods': ['HDBSCAN'],
+            'incremental_threshold': 0.6,
+            'story_ttl_hours': 48,
+            'story_state_dir': str(Path(__file__).resolve().parents[2] / "model" / "results" / "cluster_results" / "story_state"),
+            # 롤링 윈도우 모드: 최근 window_hours 의 기사 임베딩을 실행 사이에 유지(과거 기사 재임베딩 없음).
+            # 새 기사는 시간 감쇠 가중 군집 중심에 먼저 배정하고, 배정 안 된 새 기사 + 가중치 window_min_weight 이상인
+            # 과거 노이즈만 window_methods 로 다시 군집화(나머지 과거 라벨은 고정)
+            'rolling_window': False,
+            'window_hours': 72,
+            'window_half_life_hours': 12,
+            'window_min_weight': 0.1,
+            'window_assign_threshold': 0.6,
+            'window_methods': ['HDBSCAN'],
+            'window_precision': 'float16',
+            'window_state_dir': str(Path(__file__).resolve().parents[2] / "model" / "results" / "cluster_results" / "window_state"),
+            # 실루엣 채점 설정 (cluster_scoring.DEFAULT_SCORING_PARAMS 를 덮어씀)
+            'scoring_params': {},
             'output_dir': str(Path(__file__).resolve().parents[2] / "results" / "cluster_results"),
-            'save_visualizations': True
+            'save_visualizations': True,
+            # 저장되는 임베딩 아티팩트 dtype (float16: 용량 절반, 코사인 오차 ~1e-3)
+            'embedding_dtype': 'float16',
+            # clustering_results_detailed_*.csv 도 함께 저장할지 (기본은 Parquet 만, pyarrow 없으면 CSV)
+            'save_csv': False,
+            # 단계별 계측(wall/CPU/RSS/건수) → output_dir/trace_{ts}.json
+            'trace': True,
+            # 실행 시드: 분석 샘플 등 용도별 시드를 여기서 파생하고 run_{ts}.json 에 시드·버전·해시 기록(run_manifest)
+            'seed': 42
         }
         if config:
             self.config.update(config)
+        if self.config['rolling_window'] and self.config['incremental']:
+            # 둘 다 실행 간 군집 상태를 유지하는 모드라 함께 쓰면 어느 한쪽 상태가 조용히 무시된다
+            raise ValueError("'rolling_window' 와 'incremental' 은 동시에 켤 수 없습니다. 하나만 선택하세요.")
 
         self.model = None
         self.articles_df = None
@@ -69,6 +254,15 @@ class KoSimCSENewsPipeline:
         self.cluster_labels = None
         self.best_method = None
         self.cluster_analysis = None
+        self.scorer = None
+        self.ann_index = None
+        self.reducer = None                    # DimReducer (reduce_dims)
+        self.story_updates = None
+        self.window = None                     # EmbeddingWindow (rolling_window 모드)
+        self.window_cluster_sizes = None       # 윈도우 전체 기준 군집 크기 {label: count}
+        self.tracer = PipelineTracer(enabled=self.config['trace'])
+        self.run_ts = None                     # save_results 의 결과 파일 타임스탬프(trace 파일명에 사용)
+        self.input_hashes = {}                 # 입력 파일/기사 해시 (재현성 manifest)
 
         base_dir = Path(__file__).resolve().parents[2]
         self.output_dir = (base_dir / "model" / "results" / "cluster_results").resolve()
@@ -77,9 +271,11 @@ class KoSimCSENewsPipeline:
         print(f"🚀 KoSimCSE 뉴스 클러스터링 파이프라인 초기화")
         print(f"   출력 디렉토리: {self.output_dir}")
 
+    @traced('load_model')
     def load_model(self) -> bool:
         print(f"\n🤖 모델 로딩: {self.config['model_name']}")
         try:
+            from sentence_transformers import SentenceTransformer
             self.model = SentenceTransformer(self.config['model_name'])
             print(f"✅ 모델 로드 성공!   차원: {self.model.get_sentence_embedding_dimension()}")
             return True
@@ -87,43 +283,22 @@ class KoSimCSENewsPipeline:
             print(f"❌ 모델 로딩 실패: {e}")
             return False
 
+    @traced('load_news_data', items=lambda self, _: len(self.articles_df) if self.articles_df is not None else 0)
     def load_news_data(self, file_path: str) -> bool:
         print(f"\n📊 뉴스 데이터 로딩...")
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                news_data = json.load(f)
+            # 기사 단위 스트리밍 로드: 길이 필터를 읽으면서 적용하고 필요한 필드만 컬럼으로 적재
+            from news_loader import load_articles
+            self.articles_df, category_stats = load_articles(
+                file_path,
+                min_text_length=self.config['min_text_length'],
+                max_text_length=self.config['max_text_length'],
+                min_title_length=self.config['min_title_length'],
+                fields=self.config.get('article_fields')
+            )
             print(f"✅ 파일 로드 성공: {file_path}")
-
-            if 'news' not in news_data or not isinstance(news_data['news'], dict):
-                print("❌ JSON 구조에 문제가 있습니다. 'news' 키와 딕셔너리 타입을 확인하세요.")
-                return False
-
-            articles = []
-            category_stats = {}
-
-            for category, article_list in news_data['news'].items():
-                if not isinstance(article_list, list):
-                    continue
-                for article in article_list:
-                    title = article.get('title', '').strip()
-                    content = article.get('content', '').strip()
-                    full_text = f"{title}. {content}".strip()
-                    if (len(full_text) >= self.config['min_text_length'] and
-                        len(title) >= self.config['min_title_length'] and
-                        len(full_text) <= self.config['max_text_length']):
-                        articles.append({
-                            **article,
-                            'title': title,
-                            'content': content,
-                            'fullText': full_text,
-                            'textLength': len(full_text),
-                            'category': category,
-                            'index': len(articles)
-                        })
-                        category_stats[category] = category_stats.get(category, 0) + 1
-
-            self.articles_df = pd.DataFrame(articles)
-            print(f"✅ 전처리 완료: {len(articles)}개 기사")
+            self.input_hashes = {'news_file': hash_file(file_path), 'articles': hash_frame(self.articles_df)}
+            print(f"✅ 전처리 완료: {len(self.articles_df)}개 기사")
             print("카테고리별 분포:")
             for cat, count in category_stats.items():
                 print(f"  {cat}: {count}개")
@@ -132,6 +307,7 @@ class KoSimCSENewsPipeline:
             print(f"❌ 데이터 로딩 실패: {e}")
             return False
 
+    @traced('generate_embeddings', items=lambda self, _: len(self.articles_df) if self.articles_df is not None else 0)
     def generate_embeddings(self) -> bool:
         print(f"\n⚡ KoSimCSE 임베딩 생성 중...")
         if self.model is None or self.articles_df is None:
@@ -140,193 +316,356 @@ class KoSimCSENewsPipeline:
         try:
             TITLE_WEIGHT = 2.5
 
-            titles = self.articles_df['title'].fillna('').tolist()
-            bodies = self.articles_df['content'].fillna('').map(lambda s: s[:600]).tolist()
-
-            E_t = self.model.encode(
-                titles,
-                batch_size=self.config['batch_size'],
-                show_progress_bar=True,
-                convert_to_numpy=True,
-                normalize_embeddings=True
-            )
-            E_b = self.model.encode(
-                bodies,
-                batch_size=self.config['batch_size'],
-                show_progress_bar=True,
-                convert_to_numpy=True,
-                normalize_embeddings=True
-            )
-
-            emb = (TITLE_WEIGHT * E_t + E_b) / (TITLE_WEIGHT + 1.0)
-            # L2 재정규화
-            emb = emb / (np.linalg.norm(emb, axis=1, keepdims=True) + 1e-12)
-
-            self.embeddings = emb
+            # 롤링 윈도우에 이미 있는 기사는 저장된 임베딩을 재사용하고 나머지만 인코딩
+            n = len(self.articles_df)
+            todo = np.arange(n)
+            found = np.zeros(n, dtype=bool)
+            if self.config['rolling_window']:
+                found, rows = self._load_window().lookup(self._article_keys())
+                todo = np.where(~found)[0]
+                if found.any():
+                    print(f"   ♻️ 윈도우에서 임베딩 재사용: {int(found.sum())}개, 새로 인코딩: {len(todo)}개")
+
+            titles = self.articles_df['title'].iloc[todo].fillna('').tolist()
+            bodies = self.articles_df['content'].iloc[todo].fillna('').map(lambda s: s[:600]).tolist()
+
+            if len(todo):
+                E_t = self.model.encode(
+                    titles,
+                    batch_size=self.config['batch_size'],
+                    show_progress_bar=True,
+                    convert_to_numpy=True,
+                    normalize_embeddings=True
+                )
+                E_b = self.model.encode(
+                    bodies,
+                    batch_size=self.config['batch_size'],
+                    show_progress_bar=True,
+                    convert_to_numpy=True,
+                    normalize_embeddings=True
+                )
+
+                emb = (TITLE_WEIGHT * E_t + E_b) / (TITLE_WEIGHT + 1.0)
+                # L2 재정규화
+                emb = emb / (np.linalg.norm(emb, axis=1, keepdims=True) + 1e-12)
+            else:
+                emb = np.zeros((0, self.window.store.shape[1] if found.any() else 0), dtype=np.float32)
+
+            if found.any():
+                full = np.empty((n, self.window.store.shape[1]), dtype=np.float32)
+                full[todo] = emb
+                full[found] = self.window.store.dequantize(rows[found])
+                emb = full
+            self.embeddings = emb.astype(np.float32)
             print(f"✅ 임베딩 생성 완료! 형태: {self.embeddings.shape}")
             return True
         except Exception as e:
             print(f"❌ 임베딩 생성 실패: {e}")
             return False
 
-    def run_clustering(self) -> Dict:
-        print(f"\n🔍 클러스터링 알고리즘 실행 중...")
+    @traced('build_ann_index', items=lambda self, _: len(self.articles_df) if self.articles_df is not None else 0)
+    def build_ann_index(self) -> bool:
+        print(f"\n🧭 ANN 인덱스 생성 중...")
         if self.embeddings is None:
             print("❌ 임베딩이 생성되지 않았습니다.")
-            return {}
+            return False
+        try:
+            from ann_index import build_index
+            self.ann_index = build_index(self.embeddings, self.config['ann_params'])
+            print(f"✅ ANN 인덱스 생성 완료! 백엔드: {self.ann_index.backend_name}, {len(self.embeddings)}개")
+            return True
+        except Exception as e:
+            print(f"❌ ANN 인덱스 생성 실패: {e}")
+            return False
 
+    def knn_graph(self, k: int = 15, mutual: bool = False, min_sim: float = None):
+        """ANN 인덱스로 만든 희소 kNN 코사인 유사도 그래프(N×N csr). 인덱스가 없으면 먼저 생성"""
+        if self.ann_index is None and not self.build_ann_index():
+            return None
+        return self.ann_index.knn_graph(k, mutual=mutual, min_sim=min_sim)
+
+    def _cluster_candidates(self, X: np.ndarray, method_names) -> tuple:
+        """X 에 후보 방법들을 실행하고 (방법별 labels, 선택된 방법) 반환. 후처리 전 라벨"""
+        from method_runner import run_methods
+
+        methods = [m for m in method_names if m in CLUSTERING_METHODS]
+        unknown = [m for m in method_names if m not in CLUSTERING_METHODS]
+        if unknown:
+            print(f"   ⚠️ 알 수 없는 클러스터링 방법 무시: {unknown}")
+
+        # 밀도 기반 방법은 축소 공간 입력, 나머지(K-Means 등)와 실루엣 채점은 원본 임베딩
+        views = {}
+        reduce_for = [m for m in methods if m in self.config['reduction_methods']]
+        if self.config['reduce_dims'] and reduce_for:
+            Z = self._reduce(X)
+            views = {m: Z for m in reduce_for}
+
+        # 모든 방법의 실루엣은 실행당 하나의 ScoringContext(거리 블록 캐시)로 채점 (노이즈 -1 제외).
+        # 인라인 실행되는 K-Means k 스윕도 같은 컨텍스트를 쓰도록 id 로 등록
+        scorer = ScoringContext(X, self.config['scoring_params'])
+        if X is self.embeddings:
+            self.scorer = scorer
+
+        # KNN-Graph 는 전체 임베딩 위의 ANN 인덱스를 재사용(없으면 여기서 한 번 생성 → 결과와 함께 저장).
+        # 워커 프로세스용으로 임시 디렉터리에 저장해 경로만 config 로 전달
+        config, index_dir = self.config, None
+        if 'KNN-Graph' in methods and 'KNN-Graph' not in views and X is self.embeddings:
+            if self.ann_index is not None or self.build_ann_index():
+                import tempfile
+                index_dir = tempfile.TemporaryDirectory(prefix='ann_index_')
+                path = str(self.ann_index.save(index_dir.name))
+                _SHARED_ANN_INDEXES[path] = self.ann_index
+                config = {**self.config, 'ann_index_path': path}
+
+        scorer_id = str(id(scorer))
+        _SHARED_SCORERS[scorer_id] = scorer
+        config = {**config, 'scorer_id': scorer_id}
+
+        # 방법들은 임베딩만 공유하는 독립 작업 → 방법별 프로세스에서 동시 실행
+        try:
+            outcomes = run_methods(
+                X,
+                {m: CLUSTERING_METHODS[m] for m in methods},
+                config,
+                parallel=self.config['parallel_methods'],
+                time_budget_s=self.config['method_time_budget_s'],
+                min_items=self.config['parallel_methods_min_items'],
+                views=views
+            )
+        finally:
+            _SHARED_SCORERS.pop(scorer_id, None)
+            if index_dir is not None:
+                _SHARED_ANN_INDEXES.pop(config['ann_index_path'], None)
+                index_dir.cleanup()
         results = {}
         scores = {}
-
-        if 'HDBSCAN' in self.config['clustering_methods']:
-            print("1. HDBSCAN 클러스터링...")
-            try:
-                clusterer = hdbscan.HDBSCAN(**self.config['hdbscan_params'])
-                labels = clusterer.fit_predict(self.embeddings)
-                results['HDBSCAN'] = labels
-                valid_mask = labels != -1
-                if valid_mask.sum() > 1 and len(set(labels[valid_mask])) > 1:
-                    score = silhouette_score(self.embeddings[valid_mask], labels[valid_mask])
-                    scores['HDBSCAN'] = score
-                n_clusters = len(set(labels)) - (1 if -1 in labels else 0)
-                n_noise = np.sum(labels == -1)
-                print(f"   ✅ 완료: {n_clusters}개 클러스터, 노이즈 {n_noise}개")
-            except Exception as e:
-                print(f"   ❌ HDBSCAN 실패: {e}")
-
-        if 'K-Means' in self.config['clustering_methods']:
-            print("2. K-Means 클러스터링...")
-            try:
-                n = len(self.embeddings)
-                k_min = max(4, int(np.sqrt(n)))           # 데이터 크기 기반 하한
-                k_max = min(24, max(6, int(np.sqrt(n)*2)))# 상한
-                best_k, best_score, best_labels = None, -1, None
-
-                for k in range(k_min, k_max + 1):
-                    if k >= n:
-                        break
-                    km = KMeans(n_clusters=k, **self.config['kmeans_params'])
-                    lbl = km.fit_predict(self.embeddings)
-                    # 실루엣은 군집 2개 이상일 때만 유효
-                    if len(set(lbl)) < 2:
-                        continue
-                    sc = silhouette_score(self.embeddings, lbl)
-                    if sc > best_score:
-                        best_k, best_score, best_labels = k, sc, lbl
-
-                if best_labels is None:
-                    # 안전망: 기존 방식으로라도 한 번 계산
-                    fallback_k = min(15, max(2, k_min))
-                    km = KMeans(n_clusters=fallback_k, **self.config['kmeans_params'])
-                    best_labels = km.fit_predict(self.embeddings)
-                    best_k, best_score = fallback_k, silhouette_score(self.embeddings, best_labels) if len(set(best_labels))>1 else -1
-
-                results['K-Means'] = best_labels
-                scores['K-Means'] = best_score
-                print(f"   ✅ 완료: {best_k}개 클러스터, 실루엣 {best_score:.3f}")
-
-            except Exception as e:
-                print(f"   ❌ K-Means 실패: {e}")
-
-        if 'DBSCAN' in self.config['clustering_methods']:
-            print("3. DBSCAN 클러스터링...")
-            try:
-                dbscan = DBSCAN(**self.config['dbscan_params'])
-                labels = dbscan.fit_predict(self.embeddings)
-                results['DBSCAN'] = labels
+        for i, name in enumerate(methods, start=1):
+            print(f"{i}. {name} 클러스터링...")
+            status, payload, elapsed = outcomes[name]
+            # 방법은 워커 프로세스에서 실행될 수 있어 run_methods 가 잰 시간을 그대로 기록
+            self.tracer.record(f'cluster:{name}', elapsed, status=status, items=len(X))
+            if status == 'ok':
+                labels, summary = payload
+                results[name] = labels
                 valid_mask = labels != -1
                 if valid_mask.sum() > 1 and len(set(labels[valid_mask])) > 1:
-                    score = silhouette_score(self.embeddings[valid_mask], labels[valid_mask])
-                    scores['DBSCAN'] = score
-                n_clusters = len(set(labels)) - (1 if -1 in labels else 0)
-                n_noise = np.sum(labels == -1)
-                print(f"   ✅ 완료: {n_clusters}개 클러스터, 노이즈 {n_noise}개")
-            except Exception as e:
-                print(f"   ❌ DBSCAN 실패: {e}")
+                    scores[name] = scorer.score(labels, valid_mask)
+                    summary += f", 실루엣 {scores[name]:.3f}"
+                print(f"   ✅ 완료: {summary} ({elapsed:.1f}s)")
+            elif status == 'timeout':
+                print(f"   ⏱️ {name} 시간 예산 초과({self.config['method_time_budget_s']}s) → 최적 방법 후보에서 제외")
+            else:
+                print(f"   ❌ {name} 실패: {payload}")
 
+        best_method = None
         if scores:
-            self.best_method = max(scores, key=scores.get)
-            self.cluster_labels = results[self.best_method]
-            self.cluster_labels = self._postprocess_labels(self.cluster_labels, split_threshold=0.38, min_size=8)
-            print(f"\n🎯 최적 방법: {self.best_method} (실루엣 계수: {scores[self.best_method]:.3f})")
+            best_method = max(scores, key=scores.get)
+            print(f"\n🎯 최적 방법: {best_method} (실루엣 계수: {scores[best_method]:.3f})")
         elif results:
-            if 'HDBSCAN' in results:
-                self.best_method = 'HDBSCAN'
-                self.cluster_labels = results['HDBSCAN']
-            else:
-                self.best_method = list(results.keys())[0]
-                self.cluster_labels = results[self.best_method]
-            self.cluster_labels = self._postprocess_labels(self.cluster_labels, split_threshold=0.38, min_size=8)
-            print(f"\n🎯 선택된 방법: {self.best_method}")
+            best_method = 'HDBSCAN' if 'HDBSCAN' in results else list(results.keys())[0]
+            print(f"\n🎯 선택된 방법: {best_method}")
+        return results, best_method
+
+    def _reduce(self, X: np.ndarray) -> np.ndarray:
+        """저장된 투영으로 X 를 축소. 투영이 없거나 오래됐으면 이번 실행 임베딩으로 fit 후 저장"""
+        if self.reducer is None:
+            from dim_reduction import DimReducer
+            self.reducer = DimReducer.load(self.config['reduction_state_dir'], self.config['model_name'],
+                                           self.config['reduction_params'])
+        red = self.reducer
+        fit_X = self.embeddings if self.embeddings is not None else X
+        if red.needs_fit(len(fit_X)):
+            with self.tracer.span('fit_reduction', items=len(fit_X)):
+                red.fit(fit_X)
+                red.save()
+            print(f"   📐 차원 축소 투영 학습: {fit_X.shape[1]} → {red.out_dim}차원 "
+                  f"(PCA 설명 분산 {float(red.explained.sum()):.1%}{', UMAP' if red.umap is not None else ''}, "
+                  f"저장: {red.path})")
+        with self.tracer.span('reduce_dims', items=len(X)):
+            Z = red.transform(X)
+        print(f"   📐 밀도 기반 방법 입력: {X.shape[1]} → {Z.shape[1]}차원")
+        return Z
+
+    @traced('run_clustering', items=lambda self, _: len(self.articles_df) if self.articles_df is not None else 0)
+    def run_clustering(self) -> Dict:
+        print(f"\n🔍 클러스터링 알고리즘 실행 중...")
+        if self.embeddings is None:
+            print("❌ 임베딩이 생성되지 않았습니다.")
+            return {}
 
+        if self.config['rolling_window']:
+            return self._run_window_clustering()
+        if self.config['incremental']:
+            return self._run_incremental_clustering()
+
+        results, best_method = self._cluster_candidates(self.embeddings, self.config['clustering_methods'])
+        if best_method is not None:
+            self.best_method = best_method
+            self.cluster_labels = self._postprocess_labels(results[best_method], split_threshold=0.38, min_size=8)
         return results
-    
+
+    def _run_incremental_clustering(self) -> Dict:
+        """기존 스토리 중심에 새 기사를 먼저 배정하고, 배정되지 않은 기사만 새로 군집화"""
+        from story_store import StoryStore
+
+        store = StoryStore.load(self.config['story_state_dir'], self.config['model_name'])
+        evicted = store.evict(self.config['story_ttl_hours'])
+        if evicted:
+            print(f"   🗑️ 만료 스토리 {evicted}개 제거 (TTL {self.config['story_ttl_hours']}h)")
+        # 라벨이 기존 스토리 상태에도 의존하므로 만료 처리 후 상태를 manifest 입력으로 기록
+        self.input_hashes['story_state'] = store.state_hash()
+
+        if len(store) == 0:
+            print("   기존 스토리 없음 → 전체 군집화 후 스토리 상태 초기화")
+            results, best_method = self._cluster_candidates(self.embeddings, self.config['clustering_methods'])
+            if best_method is None:
+                return results
+            # 저장소가 (TTL 만료로) 비어도 next_id 는 유지 → 만료된 스토리 ID 를 새 스토리에 재사용하지 않음
+            labels = results[best_method]
+            labels = np.where(labels == -1, -1, labels + store.next_id)
+            labels = self._postprocess_labels(labels, split_threshold=0.38, min_size=8, next_label=store.next_id)
+            self.best_method = f"INCREMENTAL+{best_method}"
+        else:
+            assigned = store.assign(self.embeddings, self.config['incremental_threshold'])
+            fresh_idx = np.where(assigned == -1)[0]
+            print(f"   기존 스토리 {len(store)}개에 {len(assigned) - len(fresh_idx)}개 배정, 신규 군집화 대상 {len(fresh_idx)}개")
+
+            labels = assigned.copy()
+            best_method = None
+            if len(fresh_idx) >= self.config['hdbscan_params']['min_cluster_size']:
+                fresh_results, best_method = self._cluster_candidates(
+                    self.embeddings[fresh_idx], self.config['incremental_methods'])
+                if best_method is not None:
+                    fresh = fresh_results[best_method]
+                    # 신규 군집 번호는 기존 스토리 ID와 겹치지 않게 next_id 부터
+                    labels[fresh_idx] = np.where(fresh == -1, -1, fresh + store.next_id)
+            self.best_method = f"INCREMENTAL+{best_method}" if best_method else "INCREMENTAL"
+            labels = self._postprocess_labels(labels, split_threshold=0.38, min_size=8, next_label=store.next_id)
+
+        self.cluster_labels = labels
+        self.story_updates = store.update(self.embeddings, labels, self.articles_df)
+        store.save()
+        print(f"   ✅ 스토리 갱신: 신규 {len(self.story_updates['new'])}개, 이어짐 {len(self.story_updates['updated'])}개 "
+              f"(저장: {store.path})")
+        return {self.best_method: labels}
+
+    def _article_keys(self) -> list:
+        """실행 간 기사 식별 키(originalUrl, 없으면 제목)"""
+        df = self.articles_df
+        urls = df['originalUrl'] if 'originalUrl' in df.columns else pd.Series([None] * len(df), index=df.index)
+        return urls.astype(object).where(urls.notna(), df['title']).astype(str).tolist()
+
+    def _load_window(self):
+        if self.window is None:
+            from embedding_window import EmbeddingWindow
+            self.window = EmbeddingWindow.load(self.config['window_state_dir'], self.config['model_name'],
+                                               self.config['window_precision'])
+            evicted = self.window.evict(self.config['window_hours'], datetime.now())
+            if evicted:
+                print(f"   🗑️ 윈도우 만료 기사 {evicted}개 제거 ({self.config['window_hours']}h)")
+            self.input_hashes['window_state'] = self.window.state_hash()
+        return self.window
+
+    def _run_window_clustering(self) -> Dict:
+        """롤링 윈도우: 감쇠 가중 중심 배정 후 최근 구간(미배정 새 기사 + 최근 과거 노이즈)만 재군집화"""
+        win = self._load_window()
+        now = datetime.now()
+        half_life = self.config['window_half_life_hours']
+        keys = self._article_keys()
+        found, rows = win.lookup(keys)
+
+        labels = win.assign(self.embeddings, self.config['window_assign_threshold'], now, half_life)
+        fresh_idx = np.where(labels == -1)[0]
+        # 이번 실행 기사와 같은 행은 과거 후보에서 제외(새 기사 쪽으로 한 번만 참여)
+        past_noise = np.where((win.labels == -1) & (win.weights(now, half_life) >= self.config['window_min_weight']))[0] \
+            if len(win) else np.zeros(0, dtype=np.int64)
+        past_noise = np.setdiff1d(past_noise, rows[found])
+        print(f"   윈도우 {len(win)}개 기사, 기존 군집에 {len(labels) - len(fresh_idx)}개 배정, "
+              f"재평가 대상: 새 기사 {len(fresh_idx)}개 + 과거 노이즈 {len(past_noise)}개")
+
+        best_method = None
+        next_label = win.next_label
+        past_labels = np.full(len(past_noise), -1, dtype=np.int64)
+        past_E = win.store.dequantize(past_noise) if len(past_noise) \
+            else np.zeros((0, self.embeddings.shape[1]), dtype=self.embeddings.dtype)
+        pool = np.vstack([self.embeddings[fresh_idx], past_E])
+        if len(pool) >= self.config['hdbscan_params']['min_cluster_size']:
+            pool_results, best_method = self._cluster_candidates(pool, self.config['window_methods'])
+            if best_method is not None:
+                pool_labels = pool_results[best_method]
+                pool_labels = np.where(pool_labels == -1, -1, pool_labels + win.next_label)
+                labels[fresh_idx] = pool_labels[:len(fresh_idx)]
+                past_labels = pool_labels[len(fresh_idx):]
+                next_label = max(next_label, int(pool_labels.max()) + 1)
+
+        self.best_method = f"WINDOW+{best_method}" if best_method else "WINDOW"
+        # 되살린 과거 기사도 같은 군집의 구성원이므로 이번 기사와 한 번에 후처리(분할·노이즈 전환 결과를 공유)
+        # 중심은 시간 감쇠 가중 합(이번 기사 가중치 1) → 오래된 과거 기사가 중심을 덜 끌어당김
+        n = len(labels)
+        merged = self._postprocess_labels(
+            np.concatenate([labels, past_labels]), split_threshold=0.38, min_size=8, next_label=next_label,
+            E=np.vstack([self.embeddings, past_E.astype(self.embeddings.dtype, copy=False)]),
+            weights=np.concatenate([np.ones(n, dtype=np.float32), win.weights(now, half_life)[past_noise]]))
+        labels, past_labels = merged[:n], merged[n:]
+        revived = int((past_labels != -1).sum())
+        if revived:
+            print(f"   🔁 과거 노이즈 {revived}개가 새 군집에 합류")
+        win.relabel(past_noise, past_labels)
+        win.add(self.embeddings, labels, keys, self.articles_df['title'].astype(str).tolist(), now)
+        win.save()
+
+        uniq, counts = np.unique(win.labels[win.labels != -1], return_counts=True)
+        self.window_cluster_sizes = dict(zip(uniq.tolist(), counts.tolist()))
+        self.cluster_labels = labels
+        print(f"   ✅ 윈도우 저장: {len(win)}개 기사 (저장: {win.path})")
+        return {self.best_method: labels}
+
+    @traced('analyze_clusters', items=lambda self, result: len(result))
     def analyze_clusters(self) -> Dict:
         print(f"\n📊 클러스터 분석 중...")
         if self.cluster_labels is None:
             print("❌ 클러스터링이 실행되지 않았습니다.")
             return {}
 
-        unique_clusters = sorted(set(self.cluster_labels))
-        analysis = {}
-        
-        for cluster_id in unique_clusters:
-            mask = self.cluster_labels == cluster_id
-            cluster_articles = self.articles_df[mask]
-            
-            if cluster_id == -1:  # 노이즈
-                analysis[cluster_id] = {
-                    'size': len(cluster_articles),
-                    'type': '노이즈',
-                    'sample_titles': cluster_articles['title'].head(3).tolist()
-                }
-            else:
-                cat_dist = cluster_articles['category'].value_counts()
-                dominant_cat = cat_dist.index[0] if len(cat_dist) > 0 else 'Unknown'
-                purity = (cat_dist.iloc[0] / len(cluster_articles)) if len(cat_dist) > 0 else 0
-                top_articles = cluster_articles.nlargest(3, 'textLength')
-                analysis[cluster_id] = {
-                    'size': len(cluster_articles),
-                    'dominant_category': dominant_cat,
-                    'purity': purity,
-                    'categories': dict(cat_dist.head(3)),
-                    'representative_titles': top_articles['title'].tolist(),
-                    'avg_text_length': cluster_articles['textLength'].mean(),
-                    'sample_articles': cluster_articles.sample(min(3, len(cluster_articles)))['title'].tolist()
-                }
+        # 군집별 마스크 반복 대신 한 번의 그룹 집계로 모든 군집 통계 계산
+        analysis = cluster_summaries(self.cluster_labels, self.articles_df,
+                                     seed=derive_seed(self.config['seed'], 'analyze'))
         # numpy 타입을 json 호환 기본 타입으로 변환
         analysis_conv = {str(int(k)): convert_numpy_types(v) for k, v in analysis.items()}
         self.cluster_analysis = analysis_conv
         return analysis_conv
     
+    @traced('calculate_metrics', items=lambda self, _: len(self.articles_df) if self.articles_df is not None else 0)
     def calculate_metrics(self) -> Dict:
         print(f"\n📏 품질 지표 계산 중...")
         if self.cluster_labels is None:
             return {}
 
-        category_to_id = {cat: i for i, cat in enumerate(self.articles_df['category'].unique())}
-        true_labels = np.array([category_to_id[cat] for cat in self.articles_df['category']])
+        true_labels = pd.factorize(self.articles_df['category'])[0]
         metrics = {}
 
         valid_mask = self.cluster_labels != -1
         if valid_mask.sum() > 0:
             valid_pred = self.cluster_labels[valid_mask]
             valid_true = true_labels[valid_mask]
-            valid_embeddings = self.embeddings[valid_mask]
             if len(set(valid_pred)) > 1:
-                silhouette = silhouette_score(valid_embeddings, valid_pred)
+                from sklearn.metrics import adjusted_rand_score
+                if self.scorer is not None:
+                    # 군집화 단계의 캐시된 거리 블록 재사용
+                    sil = self.scorer.silhouette(self.cluster_labels, valid_mask)
+                else:
+                    # 증분/윈도우 모드처럼 군집화가 일부 행(새 기사 등)에서만 돌아 전체 임베딩 캐시가 없을 때만
+                    # 노이즈를 뺀 유효 행으로 채점(전체 N 거리 블록을 만들지 않음)
+                    sil = ScoringContext(self.embeddings[valid_mask], self.config['scoring_params']).silhouette(
+                        valid_pred)
+                silhouette = sil['score']
                 metrics['silhouette'] = silhouette
+                metrics['silhouette_method'] = sil['method']
+                if sil['method'] == 'stratified':
+                    metrics['silhouette_ci95'] = [sil['ci_low'], sil['ci_high']]
                 ari = adjusted_rand_score(valid_true, valid_pred)
                 metrics['ari'] = ari
-                total_purity = 0
-                for cluster_id in set(valid_pred):
-                    cluster_mask = valid_pred == cluster_id
-                    if cluster_mask.sum() > 0:
-                        cluster_true = valid_true[cluster_mask]
-                        most_common_count = Counter(cluster_true).most_common(1)[0][1]
-                        cluster_purity = most_common_count / len(cluster_true)
-                        total_purity += cluster_purity * len(cluster_true)
-                overall_purity = total_purity / len(valid_pred)
+                overall_purity = purity(valid_pred, valid_true)  # contingency 행렬 기반
                 metrics['purity'] = overall_purity
                 metrics['n_clusters'] = len(set(valid_pred))
                 metrics['noise_ratio'] = (self.cluster_labels == -1).sum() / len(self.cluster_labels)
@@ -337,10 +676,14 @@ class KoSimCSENewsPipeline:
                 print(f"  노이즈 비율: {metrics['noise_ratio']:.1%}")
         return metrics
     
-    def _postprocess_labels(self, labels, split_threshold=0.38, min_size=8):
+    @traced('postprocess_labels', items=lambda self, result: len(result))
+    def _postprocess_labels(self, labels, split_threshold=0.38, min_size=8, next_label=0, E=None, weights=None):
+        """군집 분할 + 중심에서 먼 점 노이즈 전환. E 는 labels 와 같은 행 순서의 임베딩(기본 self.embeddings),
+        weights 를 주면 중심을 가중 합으로 계산(롤링 윈도우의 시간 감쇠)"""
         labels = labels.copy()
         if len(labels) == 0:
             return labels
+        E = self.embeddings if E is None else E
 
         # 군집 내부 중앙 유사도가 낮으면 2-way 분할
         for cid in sorted(set(labels)):
@@ -349,36 +692,38 @@ class KoSimCSENewsPipeline:
             idx = np.where(labels == cid)[0]
             if len(idx) < min_size:
                 continue
-            V = self.embeddings[idx]
-            sim = V @ V.T  # 정규화 임베딩 → 코사인 유사도
-            tri = sim[np.triu_indices(len(idx), 1)]
-            med = float(np.median(tri))
-            if med < split_threshold:
+            V = E[idx]
+            # 정규화 임베딩 → 내적 = 코사인 유사도 (전체 유사도 행렬 없이 중앙값 판단)
+            if median_pairwise_cosine_below(V, split_threshold):
+                from sklearn.cluster import KMeans
                 km = KMeans(n_clusters=2, random_state=42, n_init=10).fit(V)
                 sub = km.labels_
-                # 새 라벨 할당(최댓값 다음부터)
-                base = np.max(labels) if np.max(labels) >= 0 else -1
+                # 새 라벨 할당(최댓값 다음부터, 증분 모드에서는 기존 스토리 ID와 겹치지 않게 next_label 이상)
+                base = max(int(np.max(labels)), next_label - 1)
                 a_lbl, b_lbl = base + 1, base + 2
                 for j, s in enumerate(sub):
                     labels[idx[j]] = a_lbl if s == 0 else b_lbl
 
         # 각 포인트가 자기 군집 중심과 너무 멀면 노이즈(-1)로 전환
-        for i in range(len(labels)):
-            if labels[i] == -1:
-                continue
-            cid = labels[i]
-            members = np.where(labels == cid)[0]
-            if len(members) < 3:
-                continue
-            center = self.embeddings[members].mean(axis=0)
-            center = center / (np.linalg.norm(center) + 1e-12)
-            cos = float(np.dot(self.embeddings[i], center))
-            if cos < 0.20:
-                labels[i] = -1
+        # 군집별 중심은 한 번만(segment-sum) 계산하고, 포인트-중심 코사인은 행렬 연산 한 번으로 구한다.
+        member_idx = np.where(labels != -1)[0]
+        if len(member_idx) == 0:
+            return labels
+        _, inv, counts = np.unique(labels[member_idx], return_inverse=True, return_counts=True)
+        order = np.argsort(inv, kind='stable')
+        starts = np.concatenate(([0], np.cumsum(counts)[:-1]))
+        M = E[member_idx]
+        W = M if weights is None else M * np.asarray(weights, dtype=M.dtype)[member_idx, None]
+        centers = np.add.reduceat(W[order], starts, axis=0)  # 합의 방향 == 평균의 방향
+        centers = centers / (np.linalg.norm(centers, axis=1, keepdims=True) + 1e-12)
+        cos = np.einsum('ij,ij->i', M, centers[inv])
+        drop = (counts[inv] >= 3) & (cos < 0.20)
+        labels[member_idx[drop]] = -1
 
         return labels
 
     
+    @traced('save_results', items=lambda self, _: len(self.articles_df) if self.articles_df is not None else 0)
     def save_results(self):
         print(f"\n💾 결과 저장 중...")
         if self.articles_df is None or self.cluster_labels is None:
@@ -388,66 +733,87 @@ class KoSimCSENewsPipeline:
             results_df = self.articles_df.copy()
             results_df['cluster'] = self.cluster_labels
             results_df['method'] = self.best_method
+            if self.story_updates is not None:
+                # 증분 모드: 스토리(=cluster) 가 이번에 새로 생겼는지, 이전 실행에서 이어졌는지
+                status = {sid: 'new' for sid in self.story_updates['new']}
+                status.update({sid: 'updated' for sid in self.story_updates['updated']})
+                results_df['story_status'] = [status.get(int(c), '') for c in self.cluster_labels]
+            if self.window_cluster_sizes is not None:
+                # 롤링 윈도우 모드: 과거 기사까지 포함한 군집 크기
+                results_df['window_cluster_size'] = [self.window_cluster_sizes.get(int(c), 0) for c in self.cluster_labels]
 
             # 1) 군집별 원 카테고리 다수결 (economy/society/entertainment 중 하나)
             maj_raw = results_df.groupby("cluster")["category"].agg(lambda s: s.value_counts().idxmax())
             results_df = results_df.merge(maj_raw.rename("cluster_majority_raw"),
                                         left_on="cluster", right_index=True, how="left")
 
-            # 2) 한글 4종으로 보조 매핑 (economy는 텍스트로 국내/해외 분기)
-            GLOBAL_HINTS = ["미국","중국","일본","유럽","EU","글로벌","세계","월가","연준","Fed","ECB","BOJ",
-                            "해외","국제","달러","엔","유로","위안","수입","수출","환율"]
-
-            def _raw_to_ko(raw, text):
-                raw = (raw or "").lower()
-                if raw == "society": return "사회"
-                if raw == "entertainment": return "트렌드"
-                if raw == "economy":
-                    t = (text or "")
-                    return "해외경제" if any(k.lower() in t.lower() for k in GLOBAL_HINTS) else "국내경제"
-                return None
-
-            results_df["cluster_majority_ko"] = results_df.apply(
-                lambda r: _raw_to_ko(r.get("cluster_majority_raw"), r.get("fullText") or r.get("content") or ""), axis=1
-            )
-            
+            # 2) 한글 4종으로 보조 매핑 (economy는 텍스트로 국내/해외 분기, 컬럼 단위 정규식 1회 스캔)
+            from category_rules import majority_to_ko
+            full_text = results_df["fullText"]
+            # 기존 `fullText or content` 와 같게 빈 문자열 fullText 도 content 로 대체
+            texts = full_text.where(full_text.notna() & (full_text.astype(str) != ""), results_df["content"]).fillna("")
+            results_df["cluster_majority_ko"] = majority_to_ko(results_df["cluster_majority_raw"], texts)
+
             ts = datetime.utcnow().isoformat().replace(":", "-").replace(".", "-")
-            csv_path = self.output_dir / f'clustering_results_detailed_{ts}.csv'
-            results_df.to_csv(csv_path, index=False, encoding='utf-8')
+            self.run_ts = ts
+            # articles_generator 로 넘기는 군집 결과: Parquet(categorical/정수 dtype 고정), 필요 시 CSV 병행
+            from cluster_handoff import write_cluster_results
+            results_path = write_cluster_results(results_df, self.output_dir, ts, save_csv=self.config['save_csv'])
+            print(f"   ✅ 군집 결과: {results_path}")
             
             if self.cluster_analysis:
                 summary_path = self.output_dir / f'cluster_summary_{ts}.json'
                 with open(summary_path, 'w', encoding='utf-8') as f:
                     json.dump(self.cluster_analysis, f, ensure_ascii=False, indent=2)
             
-            embeddings_data = {
-                'articles': self.articles_df.to_dict('records'),
-                'embeddings': self.embeddings.tolist(),
-                'cluster_labels': self.cluster_labels.tolist(),
-                'metadata': {
+            # 임베딩/라벨은 .npy(float16/int32), 기사 메타는 Parquet(또는 NDJSON) + run_{ts}.json manifest
+            from cluster_artifacts import save_run_artifacts
+            manifest_path = save_run_artifacts(
+                self.output_dir, ts, self.embeddings, self.cluster_labels, self.articles_df,
+                metadata={
                     'model': self.config['model_name'],
                     'method': self.best_method,
                     'dimensions': self.embeddings.shape[1],
                     'total_articles': len(self.articles_df),
-                    'timestamp': datetime.now().isoformat()
-                }
-            }
-            
-            embeddings_path = self.output_dir / f'embeddings_and_clusters_{ts}.json'
-            with open(embeddings_path, 'w', encoding='utf-8') as f:
-                json.dump(embeddings_data, f, ensure_ascii=False, indent=2)
-            print(f"   ✅ 임베딩 데이터: {embeddings_path}")
+                    'timestamp': datetime.now().isoformat(),
+                    # 같은 입력·설정·시드·모델이면 outputs 해시가 같아야 함. run_key 는 하위 단계 캐시 키
+                    'reproducibility': build_manifest(
+                        self.config['seed'], self.config,
+                        inputs={**self.input_hashes, 'embeddings': hash_array(self.embeddings),
+                                # 저장된 차원 축소 투영을 재사용하면 결과가 그 투영에도 의존
+                                'reduction': hash_array(self.reducer.components) if self.reducer is not None
+                                and self.reducer.fitted else None},
+                        outputs={'labels': hash_array(np.asarray(self.cluster_labels, dtype=np.int32)),
+                                 'cluster_results': hash_file(results_path)},
+                        model_name=self.config['model_name'])
+                },
+                embedding_dtype=self.config['embedding_dtype']
+            )
+            print(f"   ✅ 임베딩 데이터: {manifest_path}")
+
+            if self.ann_index is not None:
+                ann_path = self.ann_index.save(self.output_dir / f'ann_index_{ts}')
+                print(f"   ✅ ANN 인덱스: {ann_path}")
         except Exception as e:
             print(f"   ❌ 저장 실패: {e}")
     
     def run_full_pipeline(self, news_file_path: str) -> bool:
         print("🚀 KoSimCSE 뉴스 클러스터링 파이프라인 시작\n")
+        seed_everything(self.config['seed'])
+        try:
+            return self._run_steps(news_file_path)
+        finally:
+            self._write_trace()
+
+    def _run_steps(self, news_file_path: str) -> bool:
         if not self.load_model():
             return False
         if not self.load_news_data(news_file_path):
             return False
         if not self.generate_embeddings():
             return False
+        if self.config['build_ann_index']:
+            self.build_ann_index()
         clustering_results = self.run_clustering()
         if not clustering_results:
             return False
@@ -458,6 +824,17 @@ class KoSimCSENewsPipeline:
         print(f"📂 결과 위치: {self.output_dir}")
         return True
 
+    def _write_trace(self):
+        """단계별 계측 결과를 군집 결과 옆(trace_{ts}.json)에 저장"""
+        if not self.tracer.enabled:
+            return
+        ts = self.run_ts or datetime.utcnow().isoformat().replace(":", "-").replace(".", "-")
+        try:
+            path = self.tracer.write(self.output_dir / f'trace_{ts}.json')
+            print(f"   🧭 단계별 계측: {path}")
+        except OSError as e:
+            print(f"   ⚠️ 계측 저장 실패: {e}")
+
 def main():
     NEWS_DIR = Path(__file__).resolve().parents[2] / "model" / "results" / "collect_results"
     latest = max(NEWS_DIR.glob("news_collected_*h_*.json"), key=lambda p: p.stat().st_mtime)
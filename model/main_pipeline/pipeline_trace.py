@@ -0,0 +1,117 @@
+"""
+파이프라인 단계별 계측(span) → JSON trace
+
+with tracer.span('generate_embeddings', items=n): ... 또는 메서드에 @traced('이름', items=...) 를 붙이면
+단계마다 wall time, CPU time(프로세스), RSS 시작/끝/증감, 최대 RSS, 처리 건수, 성공 여부를 기록한다.
+span 은 중첩 가능(parent/depth 기록). 워커 프로세스에서 잰 시간처럼 직접 측정한 값은 record() 로 추가.
+측정 비용은 span 당 /proc 한 번 읽기 수준(수십 µs)이라 항상 켜 둘 수 있다.
+결과는 군집 결과와 같은 폴더에 trace_{ts}.json 으로 저장한다.
+"""
+import json
+import os
+import sys
+import time
+import resource
+import functools
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+_PAGE_MB = os.sysconf('SC_PAGE_SIZE') / (1024.0 * 1024.0) if hasattr(os, 'sysconf') else None
+
+
+def rss_mb() -> float:
+    """현재 RSS(MB). /proc 가 없으면 최대 RSS 로 대신한다"""
+    try:
+        with open('/proc/self/statm', 'r') as f:
+            return int(f.read().split()[1]) * _PAGE_MB
+    except (OSError, TypeError, ValueError, IndexError):
+        return peak_rss_mb()
+
+
+def peak_rss_mb() -> float:
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024.0 * 1024.0) if sys.platform == 'darwin' else peak / 1024.0
+
+
+class PipelineTracer:
+    def __init__(self, enabled: bool = True):
+        self.enabled = enabled
+        self.spans: List[Dict] = []
+        self._stack: List[Dict] = []
+        self._t0 = time.perf_counter()
+        self.started_at = datetime.now().isoformat()
+
+    @contextmanager
+    def span(self, name: str, items: Optional[int] = None, **fields):
+        """단계 하나를 측정. yield 된 dict 에 items 등을 나중에 채워도 된다"""
+        if not self.enabled:
+            yield {}
+            return
+        rec = {'name': name, 'parent': self._stack[-1]['name'] if self._stack else None,
+               'depth': len(self._stack), 'items': items, **fields}
+        rss0, wall0, cpu0 = rss_mb(), time.perf_counter(), time.process_time()
+        rec['start_s'] = round(wall0 - self._t0, 4)
+        self._stack.append(rec)
+        try:
+            yield rec
+            rec.setdefault('status', 'ok')
+        except BaseException as e:
+            rec['status'] = 'error'
+            rec['error'] = f"{type(e).__name__}: {e}"
+            raise
+        finally:
+            self._stack.pop()
+            rss1 = rss_mb()
+            rec.update(wall_s=round(time.perf_counter() - wall0, 4), cpu_s=round(time.process_time() - cpu0, 4),
+                       rss_start_mb=round(rss0, 1), rss_end_mb=round(rss1, 1),
+                       rss_delta_mb=round(rss1 - rss0, 1), peak_rss_mb=round(peak_rss_mb(), 1))
+            self.spans.append(rec)
+
+    def record(self, name: str, wall_s: float, **fields):
+        """다른 프로세스 등에서 이미 잰 구간 추가(CPU/RSS 없음)"""
+        if not self.enabled:
+            return
+        self.spans.append({'name': name, 'parent': self._stack[-1]['name'] if self._stack else None,
+                           'depth': len(self._stack), 'wall_s': round(float(wall_s), 4),
+                           'end_s': round(time.perf_counter() - self._t0, 4), **fields})
+
+    def to_dict(self) -> Dict:
+        return {
+            'started_at': self.started_at,
+            'total_wall_s': round(time.perf_counter() - self._t0, 4),
+            'peak_rss_mb': round(peak_rss_mb(), 1),
+            'spans': sorted(self.spans, key=lambda s: s.get('start_s', s.get('end_s', 0.0))),
+        }
+
+    def write(self, path) -> Optional[Path]:
+        if not self.enabled:
+            return None
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.to_dict(), f, ensure_ascii=False, indent=2, default=str)
+        return path
+
+
+def traced(name: str, items: Callable = None):
+    """self.tracer 의 span 으로 메서드 감싸기. items(self, result) 로 처리 건수 지정"""
+    def deco(fn):
+        @functools.wraps(fn)
+        def wrapper(self, *args, **kwargs):
+            tracer = getattr(self, 'tracer', None)
+            if tracer is None:
+                return fn(self, *args, **kwargs)
+            with tracer.span(name) as rec:
+                result = fn(self, *args, **kwargs)
+                if result is False:            # 단계 메서드는 실패 시 예외 대신 False 반환
+                    rec['status'] = 'failed'
+                if items is not None and rec is not None and tracer.enabled:
+                    try:
+                        rec['items'] = items(self, result)
+                    except Exception:
+                        rec['items'] = None
+                return result
+        return wrapper
+    return deco
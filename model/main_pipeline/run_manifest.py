@@ -0,0 +1,139 @@
+"""
+실행 단위 재현성: 시드 파생 · 입력/설정/출력 해시 · 실행 manifest
+
+같은 입력 파일 + 같은 설정 + 같은 시드 + 같은 모델이면 군집 결과(labels/parquet)가 바이트 단위로 같아야 한다.
+  - 실행 시드 하나(config['seed'])에서 용도별 시드를 derive_seed(seed, '용도', ...) 로 파생(전역 random 상태와 무관)
+  - seed_everything 으로 random / numpy 전역 상태도 고정(시드 인자를 받지 않는 서드파티 코드 대비)
+  - manifest 에 시드 전체(설정 안의 seed/random_state 포함), 모델·패키지 버전, 설정/입력/출력 해시를 기록
+  - run_key = hash(모든 입력 해시, 설정, 시드, 모델, 라벨) → 하위 단계 캐시(요약·이미지·DB 행)의 키
+    입력에는 뉴스 파일뿐 아니라 임베딩·저장된 차원 축소 투영·스토리/윈도우 상태 해시까지 포함되고,
+    상태에 기록되지 않은 요인(윈도우 시간 감쇠 등)도 라벨 해시로 반영된다
+manifest 는 군집 아티팩트 run_{ts}.json 의 'reproducibility' 항목으로 저장되고,
+articles_generator 는 군집 결과 파일과 같은 ts 의 manifest 에서 시드와 run_key 를 읽는다.
+"""
+import os
+import sys
+import json
+import random
+import hashlib
+from pathlib import Path
+from typing import Dict, Iterable, Optional
+
+import numpy as np
+
+DEFAULT_SEED = 42
+SEED_KEYS = ('seed', 'random_state', 'random_seed')
+PACKAGES = ('numpy', 'pandas', 'scikit-learn', 'hdbscan', 'torch', 'sentence-transformers', 'transformers')
+
+
+def stable_hash(obj) -> str:
+    """JSON 직렬화 가능한 값의 안정적 해시(키 정렬, sha256 앞 16자리)"""
+    payload = json.dumps(obj, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()[:16]
+
+
+def derive_seed(seed: int, *parts) -> int:
+    """실행 시드 + 용도 이름(+ 군집 번호 등) → 0 ~ 2**31-1 시드. 호출 순서와 무관하게 항상 같은 값"""
+    key = '|'.join(str(p) for p in (seed,) + parts).encode('utf-8')
+    return int.from_bytes(hashlib.blake2b(key, digest_size=8).digest(), 'little') & 0x7fffffff
+
+
+def seed_everything(seed: int):
+    random.seed(seed)
+    np.random.seed(derive_seed(seed, 'numpy'))
+    if 'torch' in sys.modules:               # torch 는 이미 로드된 경우만(import 비용 회피)
+        sys.modules['torch'].manual_seed(derive_seed(seed, 'torch'))
+
+
+def hash_file(path, chunk_size: int = 1 << 20) -> str:
+    h = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            h.update(chunk)
+    return h.hexdigest()[:16]
+
+
+def hash_array(arr: np.ndarray) -> str:
+    arr = np.ascontiguousarray(arr)
+    h = hashlib.sha256(f"{arr.dtype.str}{arr.shape}".encode('utf-8'))
+    h.update(arr.data)
+    return h.hexdigest()[:16]
+
+
+def hash_frame(df, columns: Iterable[str] = None) -> str:
+    import pandas as pd
+    cols = [c for c in (columns or df.columns) if c in df.columns]
+    h = hashlib.sha256(stable_hash(cols).encode('utf-8'))
+    h.update(np.ascontiguousarray(pd.util.hash_pandas_object(df[cols], index=False).to_numpy()).data)
+    return h.hexdigest()[:16]
+
+
+def config_for_hash(config: Dict) -> Dict:
+    """결과에 영향 없는 항목(경로, 계측) 제외"""
+    return {k: v for k, v in config.items() if not k.endswith('_dir') and k != 'trace'}
+
+
+def collect_seeds(config: Dict, prefix: str = '') -> Dict[str, int]:
+    """설정 안의 seed / random_state / random_seed 전부를 'a.b.seed' 경로로 수집"""
+    found = {}
+    for k, v in config.items():
+        path = f"{prefix}{k}"
+        if isinstance(v, dict):
+            found.update(collect_seeds(v, prefix=f"{path}."))
+        elif k in SEED_KEYS and v is not None:
+            found[path] = v
+    return found
+
+
+def package_versions(names: Iterable[str] = PACKAGES) -> Dict[str, Optional[str]]:
+    from importlib import metadata
+    out = {}
+    for name in names:
+        try:
+            out[name] = metadata.version(name)
+        except metadata.PackageNotFoundError:
+            out[name] = None
+    return out
+
+
+def model_revision(model_name: str) -> Optional[str]:
+    """로컬 Hugging Face 캐시에 받아 둔 모델의 커밋 해시(없으면 None)"""
+    hub = Path(os.environ.get('HF_HUB_CACHE') or
+               Path(os.environ.get('HF_HOME', Path.home() / '.cache' / 'huggingface')) / 'hub')
+    ref = hub / f"models--{model_name.replace('/', '--')}" / 'refs' / 'main'
+    try:
+        return ref.read_text(encoding='utf-8').strip()
+    except OSError:
+        return None
+
+
+def build_manifest(seed: int, config: Dict, inputs: Dict[str, str], outputs: Dict[str, str] = None,
+                   model_name: str = None) -> Dict:
+    """run_{ts}.json 의 'reproducibility' 항목"""
+    cfg = config_for_hash(config)
+    model = {'name': model_name, 'revision': model_revision(model_name) if model_name else None}
+    return {
+        'seed': seed,
+        'seeds': collect_seeds(cfg),
+        'python_hash_seed': os.environ.get('PYTHONHASHSEED'),
+        'model': model,
+        'packages': package_versions(),
+        'config_hash': stable_hash(cfg),
+        'inputs': inputs,
+        'outputs': outputs or {},
+        'run_key': stable_hash({'inputs': inputs, 'config': stable_hash(cfg), 'seed': seed, 'model': model,
+                                'labels': (outputs or {}).get('labels')}),
+    }
+
+
+def find_run_manifest(results_path) -> Optional[Dict]:
+    """군집 결과 파일(clustering_results_detailed_{ts}.*)과 같은 실행의 reproducibility 항목"""
+    from cluster_handoff import RESULTS_PREFIX
+    path = Path(results_path)
+    if not path.stem.startswith(RESULTS_PREFIX):
+        return None
+    manifest_path = path.parent / f'run_{path.stem[len(RESULTS_PREFIX):]}.json'
+    if not manifest_path.exists():
+        return None
+    with open(manifest_path, 'r', encoding='utf-8') as f:
+        return json.load(f).get('reproducibility')
@@ -0,0 +1,134 @@
+"""
+증분(온라인) 클러스터링용 스토리 상태 저장소
+
+실행 사이에 스토리(군집)별 임베딩 합·기사 수·최초/최근 등장 시각을 유지한다.
+  - assign : 새 임베딩을 가장 가까운 스토리 중심(코사인)에 배정, 임계값 미만이면 -1
+  - update : 이번 실행의 최종 라벨로 통계 갱신(라벨 = 스토리 ID), 신규/이어진 스토리 ID 반환
+  - evict  : 마지막 등장 후 TTL 이 지난 스토리 제거
+저장 형식: <dir>/stories.npz (ids, sums, counts) + <dir>/stories.json (next_id, 모델명, 스토리 메타)
+임베딩 모델이 바뀌면 벡터 공간이 달라지므로 기존 상태를 버리고 새로 시작한다.
+"""
+import json
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Dict, Optional
+
+import numpy as np
+import pandas as pd
+
+from run_manifest import hash_array, stable_hash
+
+ARRAYS_FILE = 'stories.npz'
+META_FILE = 'stories.json'
+
+
+class StoryStore:
+    def __init__(self, path, model_name: str):
+        self.path = Path(path)
+        self.model_name = model_name
+        self.ids = np.zeros(0, dtype=np.int64)
+        self.sums = None                       # K×d 멤버 임베딩 합
+        self.counts = np.zeros(0, dtype=np.int64)
+        self.meta = {}                         # story_id(str) -> {first_seen, last_seen, title, category}
+        self.next_id = 0
+
+    def __len__(self):
+        return len(self.ids)
+
+    @classmethod
+    def load(cls, path, model_name: str) -> "StoryStore":
+        store = cls(path, model_name)
+        meta_path, arr_path = store.path / META_FILE, store.path / ARRAYS_FILE
+        if not (meta_path.exists() and arr_path.exists()):
+            return store
+        with open(meta_path, 'r', encoding='utf-8') as f:
+            meta = json.load(f)
+        if meta.get('model_name') != model_name:
+            print(f"   ⚠️ 스토리 상태의 모델({meta.get('model_name')})이 현재 모델과 달라 초기화합니다.")
+            return store
+        arrays = np.load(arr_path)
+        store.ids, store.sums, store.counts = arrays['ids'], arrays['sums'], arrays['counts']
+        store.meta = meta.get('stories', {})
+        store.next_id = int(meta.get('next_id', 0))
+        return store
+
+    def state_hash(self) -> str:
+        """배정에 쓰이는 상태(스토리 ID·중심·기사 수·next_id) 해시 → 실행 manifest 입력"""
+        sums = self.sums if self.sums is not None else np.zeros((0, 0), dtype=np.float32)
+        return stable_hash([hash_array(self.ids), hash_array(sums), hash_array(self.counts), self.next_id])
+
+    def centroids(self) -> np.ndarray:
+        return self.sums / (np.linalg.norm(self.sums, axis=1, keepdims=True) + 1e-12)
+
+    def assign(self, E: np.ndarray, threshold: float) -> np.ndarray:
+        """각 임베딩의 스토리 ID(가장 가까운 중심과의 코사인 >= threshold), 없으면 -1"""
+        if len(self) == 0:
+            return np.full(len(E), -1, dtype=np.int64)
+        sims = E @ self.centroids().T
+        best = np.argmax(sims, axis=1)
+        best_sim = sims[np.arange(len(E)), best]
+        return np.where(best_sim >= threshold, self.ids[best], -1).astype(np.int64)
+
+    def update(self, E: np.ndarray, labels: np.ndarray, articles_df: Optional[pd.DataFrame] = None,
+               now: datetime = None) -> Dict:
+        """최종 라벨로 스토리 통계 갱신 → {'new': [...], 'updated': [...]}"""
+        now_iso = (now or datetime.now()).isoformat()
+        valid = labels != -1
+        uniq, inv = np.unique(labels[valid], return_inverse=True)
+        sums = np.zeros((len(uniq), E.shape[1]), dtype=np.float64)
+        np.add.at(sums, inv, E[valid])
+        counts = np.bincount(inv, minlength=len(uniq))
+
+        if self.sums is None:
+            self.sums = np.zeros((0, E.shape[1]), dtype=np.float32)
+        pos = {int(sid): i for i, sid in enumerate(self.ids)}
+        new_ids, updated_ids = [], []
+        add_ids, add_sums, add_counts = [], [], []
+        valid_idx = np.where(valid)[0]
+        for j, sid in enumerate(uniq.tolist()):
+            if sid in pos:
+                i = pos[sid]
+                self.sums[i] += sums[j].astype(np.float32)
+                self.counts[i] += counts[j]
+                self.meta[str(sid)]['last_seen'] = now_iso
+                updated_ids.append(sid)
+            else:
+                add_ids.append(sid)
+                add_sums.append(sums[j])
+                add_counts.append(counts[j])
+                info = {'first_seen': now_iso, 'last_seen': now_iso}
+                if articles_df is not None:
+                    first = articles_df.iloc[valid_idx[inv == j][0]]
+                    info.update(title=str(first.get('title', '')), category=str(first.get('category', '')))
+                self.meta[str(sid)] = info
+                new_ids.append(sid)
+
+        if add_ids:
+            self.ids = np.concatenate([self.ids, np.asarray(add_ids, dtype=np.int64)])
+            self.sums = np.vstack([self.sums, np.asarray(add_sums, dtype=np.float32)])
+            self.counts = np.concatenate([self.counts, np.asarray(add_counts, dtype=np.int64)])
+        if len(uniq):
+            self.next_id = max(self.next_id, int(uniq.max()) + 1)
+        return {'new': new_ids, 'updated': updated_ids}
+
+    def evict(self, ttl_hours: float, now: datetime = None) -> int:
+        """마지막 등장 후 ttl_hours 가 지난 스토리 제거, 제거 수 반환"""
+        if len(self) == 0:
+            return 0
+        cutoff = (now or datetime.now()) - timedelta(hours=ttl_hours)
+        keep = np.array([
+            datetime.fromisoformat(self.meta[str(int(sid))]['last_seen']) >= cutoff for sid in self.ids
+        ])
+        removed = int((~keep).sum())
+        for sid in self.ids[~keep]:
+            self.meta.pop(str(int(sid)), None)
+        self.ids, self.sums, self.counts = self.ids[keep], self.sums[keep], self.counts[keep]
+        return removed
+
+    def save(self):
+        self.path.mkdir(parents=True, exist_ok=True)
+        sums = self.sums if self.sums is not None else np.zeros((0, 0), dtype=np.float32)
+        np.savez(self.path / ARRAYS_FILE, ids=self.ids, sums=sums, counts=self.counts)
+        with open(self.path / META_FILE, 'w', encoding='utf-8') as f:
+            json.dump({'model_name': self.model_name, 'next_id': self.next_id, 'stories': self.meta},
+                      f, ensure_ascii=False, indent=2)
@@ -0,0 +1,214 @@
+"""
+OpenAI API 비동기 호출 스케줄러: 동시 실행 상한 + RPM/TPM 토큰 버킷 + 429 retry-after 처리
+
+  limiter = RateLimiter(rpm=500, tpm=200_000)
+  results = await gather_ordered(jobs, fn, concurrency=8)      # 결과는 jobs 순서 그대로(실패는 예외 객체)
+  async def fn(job):
+      await limiter.acquire(tokens=추정 토큰)                   # 버킷이 빌 때까지 대기(FIFO)
+      ...호출...
+      limiter.settle(추정 토큰, 실제 사용 토큰)                   # 응답 usage 로 TPM 버킷 보정
+
+429 를 받으면 retry_after_seconds(e) 만큼 limiter.pause() 로 모든 호출을 멈춘 뒤 재시도한다
+(개별 재시도만 하면 다른 코루틴이 곧바로 다시 429 를 맞는다).
+버킷 용량은 1분치라 실행 시작 직후에는 1분 예산까지 한꺼번에 나갈 수 있다.
+
+제출하는 쪽이 결과를 기다리지 않아야 하는 작업(이미지 생성 등)은 BackgroundPool 로 별도 스레드의
+이벤트 루프에서 워커 concurrency 개가 큐를 소비하게 하고, 끝나는 대로 on_result 콜백을 부른다.
+이후 단계가 실패하면 cancel() 로 남은 작업을 버린다(스레드가 non-daemon 이라 그대로 두면 프로세스가 끝까지 기다림).
+"""
+import time
+import asyncio
+import threading
+from email.utils import parsedate_to_datetime
+from typing import Any, Awaitable, Callable, List, Optional, Sequence, Tuple
+
+
+class TokenBucket:
+    """분당 per_minute 만큼 채워지는 버킷(용량 = capacity, 기본 1분치)"""
+
+    def __init__(self, per_minute: float, capacity: float = None):
+        self.rate = per_minute / 60.0
+        self.capacity = float(capacity or per_minute)
+        self.level = self.capacity
+        self.updated = time.monotonic()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.level = min(self.capacity, self.level + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def wait_time(self, amount: float) -> float:
+        """amount 를 꺼낼 수 있을 때까지 남은 초(용량보다 큰 요청은 용량만큼으로 본다)"""
+        self._refill()
+        amount = min(amount, self.capacity)
+        return 0.0 if self.level >= amount else (amount - self.level) / self.rate
+
+    def take(self, amount: float):
+        self._refill()
+        self.level -= min(amount, self.capacity)
+
+    def refund(self, amount: float):
+        self._refill()
+        self.level = min(self.capacity, self.level + amount)
+
+
+class RateLimiter:
+    def __init__(self, rpm: Optional[float] = None, tpm: Optional[float] = None):
+        self.requests = TokenBucket(rpm) if rpm else None
+        self.tokens = TokenBucket(tpm) if tpm else None
+        self.paused_until = 0.0
+        self._lock = asyncio.Lock()
+
+    async def acquire(self, tokens: float = 0):
+        """요청 1건 + tokens 만큼 예산이 생길 때까지 대기 후 차감(대기 순서대로)"""
+        async with self._lock:
+            while True:
+                wait = self.paused_until - time.monotonic()
+                if self.requests is not None:
+                    wait = max(wait, self.requests.wait_time(1))
+                if self.tokens is not None and tokens:
+                    wait = max(wait, self.tokens.wait_time(tokens))
+                if wait <= 0:
+                    break
+                await asyncio.sleep(wait)
+            if self.requests is not None:
+                self.requests.take(1)
+            if self.tokens is not None and tokens:
+                self.tokens.take(tokens)
+
+    def settle(self, estimated: float, actual: Optional[float]):
+        """추정 토큰과 실제 사용량의 차이를 TPM 버킷에 반영"""
+        if self.tokens is None or actual is None:
+            return
+        if actual < estimated:
+            self.tokens.refund(estimated - actual)
+        else:
+            self.tokens.take(actual - estimated)
+
+    def pause(self, seconds: float):
+        self.paused_until = max(self.paused_until, time.monotonic() + seconds)
+
+
+def retry_after_seconds(exc: BaseException) -> Optional[float]:
+    """429 응답의 retry-after-ms / retry-after(초 또는 HTTP 날짜) 헤더 → 초"""
+    headers = getattr(getattr(exc, 'response', None), 'headers', None)
+    if not headers:
+        return None
+    try:
+        if headers.get('retry-after-ms'):
+            return float(headers['retry-after-ms']) / 1000.0
+        value = headers.get('retry-after')
+        if value is None:
+            return None
+        try:
+            return float(value)
+        except ValueError:
+            return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+async def gather_ordered(items: Sequence[Any], fn: Callable[[Any], Awaitable[Any]], concurrency: int) -> List[Any]:
+    """최대 concurrency 개씩 동시에 fn(item) 실행 → items 순서의 결과 목록(실패 항목은 예외 객체)"""
+    sem = asyncio.Semaphore(max(1, concurrency))
+
+    async def run(item):
+        async with sem:
+            return await fn(item)
+
+    return await asyncio.gather(*(run(item) for item in items), return_exceptions=True)
+
+
+_STOP = object()
+
+
+class BackgroundPool:
+    """별도 스레드의 asyncio 루프에서 worker(item) 를 최대 concurrency 개 동시에 실행하는 작업 큐.
+    submit() 은 바로 반환하고, 완료 순서대로 on_result(item, 결과 | 예외) 가 (루프 스레드에서) 호출된다.
+    join() 은 더 이상 제출이 없음을 알리고 남은 작업이 끝날 때까지 기다린다(timeout 이 지나도 작업은 계속됨 → running 확인).
+    cancel() 은 대기 중·실행 중 작업을 취소한다(on_close 는 그대로 호출)."""
+
+    def __init__(self, worker: Callable[[Any], Awaitable[Any]], concurrency: int,
+                 on_result: Callable[[Any, Any], None] = None, on_close: Callable[[], Awaitable[None]] = None,
+                 name: str = 'background-pool'):
+        self.worker = worker
+        self.concurrency = max(1, concurrency)
+        self.on_result = on_result
+        self.on_close = on_close
+        self.name = name
+        self.results: List[Tuple[Any, Any]] = []   # 완료 순서
+        self._loop = None
+        self._queue = None
+        self._workers = None
+        self._thread = None
+        self._closed = False
+
+    def start(self) -> "BackgroundPool":
+        ready = threading.Event()
+        self._loop = asyncio.new_event_loop()
+
+        def run():
+            asyncio.set_event_loop(self._loop)
+            try:
+                self._loop.run_until_complete(self._main(ready))
+            finally:
+                self._loop.close()
+
+        self._thread = threading.Thread(target=run, name=self.name)
+        self._thread.start()
+        ready.wait()
+        return self
+
+    async def _main(self, ready: threading.Event):
+        self._queue = asyncio.Queue()
+        self._workers = asyncio.gather(*(self._work() for _ in range(self.concurrency)))
+        ready.set()
+        try:
+            await self._workers
+        except asyncio.CancelledError:
+            pass
+        finally:
+            if self.on_close is not None:
+                await self.on_close()
+
+    async def _work(self):
+        while True:
+            item = await self._queue.get()
+            if item is _STOP:
+                return
+            try:
+                result = await self.worker(item)
+            except Exception as e:
+                result = e
+            self.results.append((item, result))
+            if self.on_result is not None:
+                try:
+                    self.on_result(item, result)
+                except Exception as e:
+                    print(f"[WARN] {self.name} 결과 처리 실패: {type(e).__name__}: {e}")
+
+    def submit(self, item):
+        if self._closed:
+            raise RuntimeError(f"{self.name} 는 이미 닫혔습니다.")
+        self._loop.call_soon_threadsafe(self._queue.put_nowait, item)
+
+    def join(self, timeout: float = None) -> List[Tuple[Any, Any]]:
+        if not self._closed:
+            self._closed = True
+            for _ in range(self.concurrency):
+                self._loop.call_soon_threadsafe(self._queue.put_nowait, _STOP)
+        self._thread.join(timeout)
+        return list(self.results)
+
+    def cancel(self):
+        """남은 작업 취소(제출도 막음). 스레드 종료는 join() 으로 기다린다"""
+        self._closed = True
+        if self.running:
+            try:
+                self._loop.call_soon_threadsafe(self._workers.cancel)
+            except RuntimeError:       # 그 사이 루프가 이미 끝나 닫힘
+                pass
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
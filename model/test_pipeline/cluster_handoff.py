@@ -0,0 +1,76 @@
+"""
+news_cluster → articles_generator 단계 간 군집 결과 전달(columnar handoff)
+
+clustering_results_detailed_{ts}.parquet 로 저장한다.
+  - category / cluster / method 등 반복 값 컬럼은 categorical(사전 인코딩)
+  - index / textLength 등은 정수 dtype 고정(CSV 왕복 시 float 로 바뀌던 문제 방지)
+  - 읽는 쪽은 필요한 컬럼만 골라 읽을 수 있음(Parquet 컬럼 프로젝션)
+pyarrow 가 없으면 기존 CSV(clustering_results_detailed_{ts}.csv)로 저장/로드한다.
+"""
+from pathlib import Path
+from typing import Iterable, Optional
+
+import pandas as pd
+
+RESULTS_PREFIX = "clustering_results_detailed_"
+
+CATEGORICAL_COLUMNS = ["category", "cluster", "method", "cluster_majority_raw", "cluster_majority_ko",
+                       "top_category", "story_status"]
+INTEGER_COLUMNS = {"index": "int32", "textLength": "int32", "contentLength": "Int32"}
+
+
+def _typed(df: pd.DataFrame) -> pd.DataFrame:
+    out = df.copy()
+    for col, dtype in INTEGER_COLUMNS.items():
+        if col in out.columns:
+            out[col] = pd.to_numeric(out[col], errors="coerce").astype(dtype if out[col].notna().all() else "Int32")
+    for col in CATEGORICAL_COLUMNS:
+        if col in out.columns:
+            out[col] = out[col].astype("category")
+    return out
+
+
+def write_cluster_results(df: pd.DataFrame, out_dir, ts: str, save_csv: bool = False) -> Path:
+    """군집 결과 저장 후 기본 handoff 파일 경로 반환 (Parquet, 불가하면 CSV)"""
+    out_dir = Path(out_dir)
+    csv_path = out_dir / f"{RESULTS_PREFIX}{ts}.csv"
+    pq_path = out_dir / f"{RESULTS_PREFIX}{ts}.parquet"
+    try:
+        _typed(df).to_parquet(pq_path, index=False)
+        path = pq_path
+    except (ImportError, ValueError, TypeError):
+        pq_path.unlink(missing_ok=True)
+        save_csv, path = True, csv_path
+    if save_csv:
+        df.to_csv(csv_path, index=False, encoding="utf-8")
+    return path
+
+
+def latest_cluster_results(in_dir) -> Optional[Path]:
+    """가장 최근 군집 결과 파일(Parquet 우선, 같은 실행이면 Parquet 선택)"""
+    in_dir = Path(in_dir)
+    files = list(in_dir.glob(f"{RESULTS_PREFIX}*.parquet")) + list(in_dir.glob(f"{RESULTS_PREFIX}*.csv"))
+    if not files:
+        return None
+    newest = max(files, key=lambda p: p.stat().st_mtime)
+    pq_path = newest.with_suffix(".parquet")
+    return pq_path if pq_path.exists() else newest
+
+
+def available_columns(path) -> list:
+    path = Path(path)
+    if path.suffix == ".parquet":
+        import pyarrow.parquet as pq
+        return list(pq.read_schema(path).names)
+    return list(pd.read_csv(path, nrows=0).columns)
+
+
+def read_cluster_results(path, columns: Optional[Iterable[str]] = None) -> pd.DataFrame:
+    """군집 결과 로드. columns 를 주면 존재하는 컬럼 중 그것만 읽는다"""
+    path = Path(path)
+    if columns is not None:
+        have = set(available_columns(path))
+        columns = [c for c in columns if c in have]
+    if path.suffix == ".parquet":
+        return pd.read_parquet(path, columns=columns)
+    return pd.read_csv(path, usecols=columns)
@@ -0,0 +1,160 @@
+"""
+군집 품질(실루엣) 점수 계산 공용 모듈
+
+silhouette_score 를 방법마다/k마다/지표 계산마다 전체 임베딩에 호출하면 매번 O(N²) 이다.
+ScoringContext 는 실행(run)당 한 번 거리 블록을 계산해 캐시하고, 모든 라벨링을 그 블록으로 채점한다.
+  - N <= exact_max_items       : 전체 N×N 거리 캐시 → sklearn silhouette_score 와 같은 정확값
+  - 그 외(블록 예산 이내)       : 고정 표본 행 m개 × 전체 N 거리 캐시 → 군집별 사후층화 평균 + 95% 신뢰구간
+  - N 이 매우 크면              : 중심 기반 단순 실루엣(simplified silhouette, O(N·K·d))
+"""
+from typing import Dict, Optional
+
+import numpy as np
+
+DEFAULT_SCORING_PARAMS = {
+    'exact_max_items': 3000,        # 3000² float32 ≈ 36MB
+    'sample_size': 1000,            # 표본 행 수(상한)
+    'min_sample_size': 200,         # 블록 예산 때문에 이보다 작아지면 중심 기반으로 전환
+    'max_block_entries': 25_000_000,  # 캐시 거리 블록 원소 수 상한(float32 ≈ 100MB)
+    'seed': 42,
+}
+
+
+def pairwise_euclidean(A: np.ndarray, B: np.ndarray) -> np.ndarray:
+    """유클리드 거리 행렬(float32). sklearn silhouette_score 기본 metric 과 동일"""
+    A = np.asarray(A, dtype=np.float32)
+    B = np.asarray(B, dtype=np.float32)
+    d2 = np.einsum('ij,ij->i', A, A)[:, None] - 2.0 * (A @ B.T) + np.einsum('ij,ij->i', B, B)[None, :]
+    np.maximum(d2, 0.0, out=d2)
+    return np.sqrt(d2, out=d2)
+
+
+def _silhouette_from_rows(D_rows: np.ndarray, col_labels: np.ndarray, row_labels: np.ndarray) -> np.ndarray:
+    """거리 행(D_rows: r×n, 자기 자신 거리 0)과 열 라벨로 행별 실루엣 값 계산"""
+    from scipy.sparse import csr_matrix
+    uniq, inv = np.unique(col_labels, return_inverse=True)
+    K = len(uniq)
+    counts = np.bincount(inv, minlength=K).astype(np.float64)
+    onehot = csr_matrix((np.ones(len(inv), dtype=np.float32), (np.arange(len(inv)), inv)), shape=(len(inv), K))
+    sums = np.asarray((onehot.T @ D_rows.T).T, dtype=np.float64)  # r×K 군집별 거리 합
+
+    own = np.searchsorted(uniq, row_labels)
+    rows = np.arange(len(row_labels))
+    own_count = counts[own]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        a = sums[rows, own] / (own_count - 1)
+        means = sums / counts[None, :]
+    means[rows, own] = np.inf
+    b = means.min(axis=1)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        s = (b - a) / np.maximum(a, b)
+    s[own_count <= 1] = 0.0  # sklearn 과 동일: 단일 원소 군집의 실루엣은 0
+    return np.nan_to_num(s)
+
+
+def centroid_silhouette(X: np.ndarray, labels: np.ndarray) -> float:
+    """중심 기반 단순 실루엣: a=자기 군집 중심 거리, b=가장 가까운 다른 군집 중심 거리"""
+    uniq, inv = np.unique(labels, return_inverse=True)
+    if len(uniq) < 2:
+        return -1.0
+    X = np.asarray(X, dtype=np.float32)
+    counts = np.bincount(inv)
+    centers = np.zeros((len(uniq), X.shape[1]), dtype=np.float64)
+    np.add.at(centers, inv, X)
+    centers /= counts[:, None]
+    D = pairwise_euclidean(X, centers)
+    rows = np.arange(len(X))
+    a = D[rows, inv].astype(np.float64)
+    D[rows, inv] = np.inf
+    b = D.min(axis=1).astype(np.float64)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        s = np.nan_to_num((b - a) / np.maximum(a, b))
+    s[counts[inv] <= 1] = 0.0
+    return float(s.mean())
+
+
+class ScoringContext:
+    """한 번의 실행에서 같은 임베딩 X 에 대한 여러 라벨링을 채점"""
+
+    def __init__(self, X: np.ndarray, params: Dict = None):
+        self.params = dict(DEFAULT_SCORING_PARAMS)
+        if params:
+            self.params.update(params)
+        self.X = X
+        n = len(X)
+
+        if n <= self.params['exact_max_items']:
+            self.mode = 'exact'
+            self.rows = np.arange(n)
+        else:
+            m = min(self.params['sample_size'], int(self.params['max_block_entries'] // max(n, 1)))
+            if m >= self.params['min_sample_size']:
+                self.mode = 'stratified'
+                rng = np.random.default_rng(self.params['seed'])
+                self.rows = np.sort(rng.choice(n, size=m, replace=False))
+            else:
+                self.mode = 'centroid'
+                self.rows = None
+
+        self._D = None  # rows × n 거리 블록(첫 채점 시 한 번 계산)
+
+    def prepare(self):
+        """거리 블록을 미리 계산(여러 스레드에서 채점하기 전에 호출)"""
+        if self.mode != 'centroid':
+            self._block()
+        return self
+
+    def _block(self) -> np.ndarray:
+        if self._D is None:
+            D = pairwise_euclidean(self.X[self.rows], self.X)
+            D[np.arange(len(self.rows)), self.rows] = 0.0
+            self._D = D
+        return self._D
+
+    def silhouette(self, labels: np.ndarray, mask: Optional[np.ndarray] = None) -> Dict:
+        """labels(mask 로 제한 가능)의 실루엣 추정치와 95% 신뢰구간"""
+        labels = np.asarray(labels)
+        if mask is None:
+            mask = np.ones(len(labels), dtype=bool)
+        valid_labels = labels[mask]
+        n_valid = int(mask.sum())
+        if n_valid < 2 or len(np.unique(valid_labels)) < 2:
+            return {'score': -1.0, 'ci_low': None, 'ci_high': None, 'method': self.mode, 'n_used': 0}
+
+        if self.mode == 'centroid':
+            score = centroid_silhouette(self.X[mask], valid_labels)
+            return {'score': score, 'ci_low': None, 'ci_high': None, 'method': 'centroid', 'n_used': n_valid}
+
+        row_mask = mask[self.rows]
+        if not row_mask.any():
+            # 표본 행이 모두 mask 밖이면 중심 기반으로 대체
+            score = centroid_silhouette(self.X[mask], valid_labels)
+            return {'score': score, 'ci_low': None, 'ci_high': None, 'method': 'centroid', 'n_used': n_valid}
+        D = self._block()[row_mask][:, mask]
+        s = _silhouette_from_rows(D, valid_labels, labels[self.rows][row_mask])
+
+        if self.mode == 'exact':
+            score = float(s.mean())
+            return {'score': score, 'ci_low': score, 'ci_high': score, 'method': 'exact', 'n_used': len(s)}
+
+        # 사후층화: 군집 비율(전체 기준)로 표본 군집 평균을 가중
+        row_lbl = labels[self.rows][row_mask]
+        uniq, counts = np.unique(valid_labels, return_counts=True)
+        weights = dict(zip(uniq.tolist(), (counts / n_valid).tolist()))
+        pooled_var = float(s.var(ddof=1)) if len(s) > 1 else 0.0
+        est, var, w_total = 0.0, 0.0, 0.0
+        for c in np.unique(row_lbl):
+            sc = s[row_lbl == c]
+            w = weights[c]
+            v = float(sc.var(ddof=1)) if len(sc) > 1 else pooled_var
+            est += w * float(sc.mean())
+            var += w * w * v / len(sc)
+            w_total += w
+        # 표본에 없는 군집의 가중치는 나머지에 재분배
+        est /= w_total
+        se = np.sqrt(var) / w_total
+        return {'score': est, 'ci_low': float(est - 1.96 * se), 'ci_high': float(est + 1.96 * se),
+                'method': 'stratified', 'n_used': len(s)}
+
+    def score(self, labels: np.ndarray, mask: Optional[np.ndarray] = None) -> float:
+        return self.silhouette(labels, mask)['score']
@@ -1,7 +1,8 @@
 import os
+import json
 import pandas as pd
 from pathlib import Path
-from typing import List, Tuple
+from typing import Dict, List, Tuple
 
 import pymysql
 from dotenv import load_dotenv, find_dotenv
@@ -21,6 +22,10 @@ UNIQUE_SRC_CSV = _latest_or_default("article_sources_unique_*.csv", "article_sou
 STAGING_CSV    = _latest_or_default("article_sources_staging_*.csv", "article_sources_staging.csv")
 DIGEST_CSV    = _latest_or_default("daily_digest_staging_*.csv", "daily_digest_staging.csv")
 
+# 증분 군집 스토리 ID → article_no (articles_generator 가 같은 파일에 cluster_key 와 함께 기록)
+# 이미 저장한 스토리가 다시 생성되면 새 행을 넣지 않고 그 Article 행을 UPDATE
+GENERATED_STORIES_PATH = Path(os.getenv("GENERATED_STORIES_PATH", str(GEN_DIR / "generated_stories.json")))
+
 # ---- Cloud SQL Connector (옵션) ----
 USE_CONNECTOR = bool(os.getenv("INSTANCE_CONNECTION_NAME"))
 connector = None
@@ -91,6 +96,32 @@ def _chunked(iterable, size=1000):
     for i in range(0, len(iterable), size):
         yield iterable[i:i+size]
 
+def _existing_article_nos(cur, arts: pd.DataFrame) -> set:
+    """CSV 의 article_no(이어진 스토리의 기존 행) 중 DB 에 아직 있는 것"""
+    if "article_no" not in arts.columns:
+        return set()
+    nos = sorted({_int_or_zero(x) for x in arts["article_no"].dropna()} - {0})
+    found = set()
+    for batch in _chunked(nos, 1000):
+        cur.execute(f"SELECT article_no FROM Article WHERE article_no IN ({','.join(['%s'] * len(batch))})", batch)
+        found.update(row[0] for row in cur.fetchall())
+    return found
+
+def _record_story_articles(arts: pd.DataFrame, tmpid_to_real: Dict[int, int]):
+    """스토리 ID → article_no 를 생성 스토리 기록에 추가(다음 실행에서 UPDATE 대상)"""
+    if "story_id" not in arts.columns or not GENERATED_STORIES_PATH.exists():
+        return
+    with open(GENERATED_STORIES_PATH, "r", encoding="utf-8") as f:
+        stories = json.load(f)
+    for _, r in arts.iterrows():
+        sid, tmp_id = r.get("story_id"), _int_or_zero(r.get("article_tmp_id"))
+        if pd.notna(sid) and str(int(sid)) in stories and tmp_id in tmpid_to_real:
+            stories[str(int(sid))]["article_no"] = int(tmpid_to_real[tmp_id])
+    tmp = GENERATED_STORIES_PATH.with_suffix(".tmp")
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(stories, f, ensure_ascii=False, indent=2)
+    os.replace(tmp, GENERATED_STORIES_PATH)
+
 def main():
     ok, missing = _exists_all([ARTICLES_CSV, UNIQUE_SRC_CSV, STAGING_CSV, DIGEST_CSV])
     if not ok:
@@ -113,7 +144,15 @@ def main():
     conn = get_connection()
     try:
         with conn.cursor() as cur:
-            # --- 1) Article INSERT ---
+            # --- 1) Article INSERT (이어진 스토리의 기존 행은 UPDATE) ---
+            sql_upd = """
+            UPDATE Article
+            SET article_title = %s, article_summary = %s, article_content = %s,
+                article_category = %s, article_update_at = %s
+            WHERE article_no = %s
+            """
+            existing = _existing_article_nos(cur, arts)
+            updated = 0
             sql_art = """
             INSERT INTO Article
             (article_title, article_summary, article_content, article_image_url,
@@ -123,6 +162,25 @@ def main():
             """
             tmpid_to_real = {}
             for i, r in arts.iterrows():
+                tmp_id_csv = r.get("article_tmp_id")
+                try:
+                    tmp_id = int(tmp_id_csv) if pd.notna(tmp_id_csv) else (i + 1)
+                except Exception:
+                    tmp_id = i + 1
+                art_no = _int_or_zero(r.get("article_no"))
+                if art_no in existing:
+                    # 등록 시각·좋아요/평점/조회수는 유지하고 내용만 갱신(갱신 시각 = 이번 생성 시각)
+                    cur.execute(sql_upd, (
+                        str(r.get("article_title","") or "")[:255],
+                        str(r.get("article_summary","") or "")[:500],
+                        str(r.get("article_content","") or ""),
+                        str(r.get("article_category","") or "")[:50],
+                        str(r.get("article_reg_at","") or ""),
+                        art_no,
+                    ))
+                    tmpid_to_real[tmp_id] = art_no
+                    updated += 1
+                    continue
                 upd_at = _none_if_blank(r.get("article_update_at"))
                 cur.execute(sql_art, (
                     str(r.get("article_title","") or "")[:255],
@@ -136,11 +194,6 @@ def main():
                     _round_to_1_decimal(r.get("article_rate_avg", 0.0)),
                     _int_or_zero(r.get("article_view_count", 0)),
                 ))
-                tmp_id_csv = r.get("article_tmp_id")
-                try:
-                    tmp_id = int(tmp_id_csv) if pd.notna(tmp_id_csv) else (i + 1)
-                except Exception:
-                    tmp_id = i + 1
                 tmpid_to_real[tmp_id] = cur.lastrowid  # CSV의 article_tmp_id 우선, 없으면 enumerate 기반
 
             # --- 2) Article_Source UPSERT (press_name UNIQUE) ---
@@ -170,6 +223,7 @@ def main():
                 cur.executemany(sql_map, batch)
 
         conn.commit()
+        _record_story_articles(arts, tmpid_to_real)
         # --- 4) DailyDigest UPSERT ---
         if 'article_tmp_id' not in arts.columns:
             print("[WARN] articles CSV에 'article_tmp_id' 컬럼이 없습니다. DailyDigest 매핑을 건너뜁니다.")
@@ -215,8 +269,39 @@ def main():
                     print("[SKIP] DailyDigest 입력할 행이 없습니다.")
 
         print(f"[OK] DB 저장 완료 "
-              f"(articles={len(arts)}, sources upsert={len(uniq)}, mappings inserted={len(map_rows)})")
+              f"(articles={len(arts)}, 기존 스토리 갱신={updated}, sources upsert={len(uniq)}, mappings inserted={len(map_rows)})")
+        return tmpid_to_real
+
+    except Exception as e:
+        conn.rollback()
+        print(f"[ERR] 롤백됨: {type(e).__name__}: {e}")
+        raise
+    finally:
+        try:
+            conn.close()
+        except Exception:
+            pass
+        if connector is not None:
+            try:
+                connector.close()
+            except Exception:
+                pass
 
+def update_image_urls(image_urls: Dict[int, str], tmpid_to_real: Dict[int, int]) -> int:
+    """백그라운드 이미지 생성이 끝난 뒤 저장된 Article 의 article_image_url 만 갱신 → 갱신 행 수"""
+    rows = [(str(url)[:500], tmpid_to_real[tmp_id]) for tmp_id, url in image_urls.items()
+            if url and tmp_id in tmpid_to_real]
+    if not rows:
+        print("[SKIP] 갱신할 이미지 URL이 없습니다.")
+        return 0
+    conn = get_connection()
+    try:
+        with conn.cursor() as cur:
+            for batch in _chunked(rows, 1000):
+                cur.executemany("UPDATE Article SET article_image_url = %s WHERE article_no = %s", batch)
+        conn.commit()
+        print(f"[OK] Article 이미지 URL 갱신 완료 (rows={len(rows)})")
+        return len(rows)
     except Exception as e:
         conn.rollback()
         print(f"[ERR] 롤백됨: {type(e).__name__}: {e}")
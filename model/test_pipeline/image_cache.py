@@ -0,0 +1,138 @@
+"""
+기사 썸네일 이미지 캐시(내용 주소 방식, 디스크 예산 LRU)
+
+build_image_prompt 는 (제목, 카테고리) 로 시드를 고정하므로 같은 기사는 항상 같은 프롬프트가 나온다.
+  - 키     = sha256(이미지 모델, 크기, 프롬프트) → 같은 프롬프트면 API 호출 없이 저장된 이미지를 재사용
+  - 별칭 키 = sha256(이미지 모델, 크기, 스토리 식별자, 카테고리, 정규화한 제목) → 본문만 조금 다른(키워드가 달라진)
+              같은 스토리도 재사용. 스토리 식별자(증분 모드의 스토리 ID 또는 구성 기사 해시)를 넣어
+              '속보'처럼 흔한 제목의 다른 스토리끼리 이미지를 공유하지 않는다
+  - 크기 상한 : put() 할 때마다 파일 크기 합이 max_bytes 를 넘으면 마지막 사용 시각이 오래된 것부터 삭제(LRU)
+저장 형식: <dir>/<키>.<확장자> + <dir>/index.json (키별 파일명·크기·생성/사용 시각·적중 수·별칭 키)
+기사에 게시되는 파일은 link_to() 로 하드링크(불가 시 복사)해 두므로, 캐시에서 삭제돼도 기존 기사 이미지는 남는다.
+게시 사본은 캐시 밖 파일이라 max_bytes 예산에 포함되지 않는다(게시 폴더 용량은 기사 보존 정책으로 따로 관리).
+"""
+import os
+import re
+import json
+import time
+import shutil
+import hashlib
+import unicodedata
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+INDEX_FILE = 'index.json'
+
+
+def image_key(model: str, size: str, prompt: str) -> str:
+    payload = json.dumps([model, size, prompt], ensure_ascii=False)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+def story_key(model: str, size: str, title: str, category: str, story_ref: str = None) -> str:
+    """공백·문장부호·대소문자 차이를 무시한 (스토리 식별자, 카테고리, 제목) 키"""
+    norm = re.sub(r'[\W_]+', '', unicodedata.normalize('NFKC', title or '')).lower()
+    payload = json.dumps([model, size, story_ref or '', category or '', norm], ensure_ascii=False)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+class ImageCache:
+    def __init__(self, path, max_bytes: int = 500 * 1024 * 1024, ext: str = 'png'):
+        self.path = Path(path)
+        self.path.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self.ext = ext
+        self.hits = 0
+        self.misses = 0
+        self.entries: Dict[str, Dict[str, Any]] = {}
+        self.aliases: Dict[str, str] = {}          # 별칭 키 → 키
+        index_path = self.path / INDEX_FILE
+        if index_path.exists():
+            try:
+                with open(index_path, 'r', encoding='utf-8') as f:
+                    self.entries = json.load(f).get('entries', {})
+            except (OSError, ValueError):
+                print("   ⚠️ 이미지 캐시 인덱스를 읽지 못해 비어 있는 캐시로 시작합니다.")
+        for key, entry in list(self.entries.items()):
+            if not (self.path / entry['file']).exists():
+                del self.entries[key]
+            elif entry.get('story'):
+                self.aliases[entry['story']] = key
+
+    def get(self, key: str, story: str = None) -> Optional[Path]:
+        """키(없으면 별칭 키)로 저장된 이미지 경로. 적중 시 사용 시각 갱신"""
+        if key not in self.entries and story:
+            key = self.aliases.get(story, key)
+        entry = self.entries.get(key)
+        fpath = self.path / entry['file'] if entry else None
+        if fpath is None or not fpath.exists():
+            self.misses += 1
+            return None
+        entry['last_used'] = time.time()
+        entry['hits'] = entry.get('hits', 0) + 1
+        self.hits += 1
+        return fpath
+
+    def put(self, key: str, data: bytes, story: str = None, **meta) -> Path:
+        fname = f"{key}.{self.ext}"
+        tmp = self.path / f".{fname}.tmp"
+        with open(tmp, 'wb') as f:
+            f.write(data)
+        os.replace(tmp, self.path / fname)
+        now = time.time()
+        self.entries[key] = {'file': fname, 'size': len(data), 'story': story, 'created_at': now,
+                             'last_used': now, 'hits': 0, **meta}
+        if story:
+            self.aliases[story] = key
+        self.save()
+        self.evict(keep=key)
+        return self.path / fname
+
+    def evict(self, keep: str = None) -> int:
+        """크기 상한을 넘으면 LRU 순으로 삭제(keep 키는 제외) → 삭제 건수"""
+        total = sum(e['size'] for e in self.entries.values())
+        if self.max_bytes is None or total <= self.max_bytes:
+            return 0
+        removed = 0
+        for key, entry in sorted(self.entries.items(), key=lambda kv: kv[1]['last_used']):
+            if total <= self.max_bytes:
+                break
+            if key == keep:
+                continue
+            try:
+                (self.path / entry['file']).unlink()
+            except FileNotFoundError:
+                pass
+            del self.entries[key]
+            if entry.get('story') and self.aliases.get(entry['story']) == key:
+                del self.aliases[entry['story']]
+            total -= entry['size']
+            removed += 1
+        self.save()
+        return removed
+
+    @staticmethod
+    def link_to(src: Path, dst: Path) -> Path:
+        """캐시 파일을 게시 경로로 하드링크(다른 파일시스템 등으로 실패하면 복사)"""
+        if dst.exists():
+            if os.path.samefile(src, dst):
+                return dst
+            dst.unlink()
+        try:
+            os.link(src, dst)
+        except OSError:
+            shutil.copyfile(src, dst)
+        return dst
+
+    def save(self):
+        tmp = self.path / f".{INDEX_FILE}.tmp"
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump({'entries': self.entries}, f, ensure_ascii=False)
+        os.replace(tmp, self.path / INDEX_FILE)
+
+    def stats(self) -> Dict[str, Any]:
+        return {'hits': self.hits, 'misses': self.misses, 'entries': len(self.entries),
+                'bytes': sum(e['size'] for e in self.entries.values())}
+
+    def close(self):
+        self.save()
@@ -0,0 +1,91 @@
+"""
+LLM 응답 영구 캐시(SQLite)
+
+키 = sha256(모델, 시스템 프롬프트, 렌더링된 사용자 프롬프트, temperature) → 군집의 선택 기사와 프롬프트가
+지난 실행과 같으면 API 호출 없이 저장된 응답(JSON)을 그대로 돌려준다(매시간 재실행되는 진행 중 스토리 비용 ~0).
+  - TTL      : 저장 후 ttl_hours 가 지난 항목은 적중으로 치지 않고 evict() 에서 삭제
+  - 크기 상한 : 응답 바이트 합이 max_bytes 를 넘으면 마지막 사용 시각이 오래된 것부터 삭제(LRU)
+파일 하나(WAL 모드)라 여러 프로세스가 같은 캐시를 읽고 써도 된다.
+"""
+import json
+import time
+import sqlite3
+import hashlib
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS llm_cache (
+    key         TEXT PRIMARY KEY,
+    model       TEXT NOT NULL,
+    response    TEXT NOT NULL,
+    size        INTEGER NOT NULL,
+    created_at  REAL NOT NULL,
+    last_used   REAL NOT NULL,
+    hits        INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS idx_llm_cache_last_used ON llm_cache(last_used);
+"""
+
+
+def prompt_key(model: str, system_prompt: str, user_prompt: str, temperature: float) -> str:
+    payload = json.dumps([model, system_prompt, user_prompt, float(temperature)], ensure_ascii=False)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+class LLMCache:
+    def __init__(self, path, ttl_hours: float = 72, max_bytes: int = 200 * 1024 * 1024):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.ttl_s = None if ttl_hours is None else ttl_hours * 3600.0
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.conn = sqlite3.connect(str(self.path), timeout=30)
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.executescript(_SCHEMA)
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        row = self.conn.execute('SELECT response, created_at FROM llm_cache WHERE key = ?', (key,)).fetchone()
+        now = time.time()
+        if row is None or (self.ttl_s is not None and now - row[1] > self.ttl_s):
+            self.misses += 1
+            return None
+        with self.conn:
+            self.conn.execute('UPDATE llm_cache SET last_used = ?, hits = hits + 1 WHERE key = ?', (now, key))
+        self.hits += 1
+        return json.loads(row[0])
+
+    def put(self, key: str, model: str, response: Dict[str, Any]):
+        text = json.dumps(response, ensure_ascii=False)
+        now = time.time()
+        with self.conn:
+            self.conn.execute(
+                'INSERT OR REPLACE INTO llm_cache (key, model, response, size, created_at, last_used, hits) '
+                'VALUES (?, ?, ?, ?, ?, ?, 0)', (key, model, text, len(text.encode('utf-8')), now, now))
+
+    def evict(self) -> int:
+        """만료 항목 삭제 후 크기 상한을 넘으면 LRU 순으로 삭제 → 삭제 건수"""
+        removed = 0
+        with self.conn:
+            if self.ttl_s is not None:
+                removed += self.conn.execute('DELETE FROM llm_cache WHERE created_at < ?',
+                                             (time.time() - self.ttl_s,)).rowcount
+            total = self.conn.execute('SELECT COALESCE(SUM(size), 0) FROM llm_cache').fetchone()[0]
+            if self.max_bytes is not None and total > self.max_bytes:
+                excess, doomed = total - self.max_bytes, []
+                for key, size in self.conn.execute('SELECT key, size FROM llm_cache ORDER BY last_used'):
+                    if excess <= 0:
+                        break
+                    doomed.append((key,))
+                    excess -= size
+                self.conn.executemany('DELETE FROM llm_cache WHERE key = ?', doomed)
+                removed += len(doomed)
+        return removed
+
+    def stats(self) -> Dict[str, Any]:
+        n, size = self.conn.execute('SELECT COUNT(*), COALESCE(SUM(size), 0) FROM llm_cache').fetchone()
+        return {'hits': self.hits, 'misses': self.misses, 'entries': n, 'bytes': size}
+
+    def close(self):
+        self.conn.close()
@@ -7,18 +7,18 @@ from typing import Dict
 import warnings
 import logging
 
-from sentence_transformers import SentenceTransformer
-from sklearn.cluster import KMeans, DBSCAN
-from sklearn.metrics import silhouette_score, adjusted_rand_score
-import hdbscan
-import matplotlib.pyplot as plt
-from collections import Counter
-from sklearn.metrics.pairwise import cosine_similarity
 
+from cluster_scoring import ScoringContext
+from cluster_analytics import cluster_summaries, purity
+from category_rules import top_categories
+from pipeline_trace import PipelineTracer, traced
+from run_manifest import build_manifest, derive_seed, hash_array, hash_file, hash_frame, seed_everything
+from story_anchors import select_story_anchors
+
+# sentence_transformers / sklearn / hdbscan 은 import 비용이 커서(수 초) 실제로 쓰는 함수 안에서 지연 import 한다.
+# 오케스트레이터가 단계마다 새 프로세스로 실행하므로 모듈 로드 시간이 곧 콜드 스타트 시간이다.
 warnings.filterwarnings('ignore')
 logging.getLogger('sentence_transformers').setLevel(logging.ERROR)
-plt.rcParams['font.family'] = ['AppleGothic', 'Arial Unicode MS']
-plt.rcParams['axes.unicode_minus'] = False
 
 
 def convert_numpy_types(obj):
@@ -37,40 +37,11 @@ def convert_numpy_types(obj):
 # --- CATEGORY_TOP3 전용 헬퍼 함수들 ---
 TARGET_CATEGORIES = ["국내경제", "해외경제", "사회", "연예"]
 
-ECON_FOREIGN_KEYWORDS = [
-    "해외", "국제", "세계", "글로벌", "대외", "대외요인", "IMF", "WB", "WTO", "OECD",
-    "미국", "중국", "일본", "유럽", "EU", "유로존", "영국", "독일", "프랑스", "인도",
-    "싱가포르", "베트남", "대만", "홍콩", "러시아", "우크라이나", "중동", "UAE", "사우디",
-    "Fed", "연준", "FOMC", "ECB", "BOJ", "BOE", "달러", "엔화", "위안화"
-]
-
-def normalize_top_category(row: dict) -> str:
-    """원본 category와 텍스트를 바탕으로 최종 카테고리를 [국내경제, 해외경제, 사회, 연예] 중 하나로 매핑"""
-    raw_cat = str(row.get("category", "")).lower()
-    title = str(row.get("title", ""))
-    content = str(row.get("content", ""))
-    text = f"{title} {content}"
-
-    # economy 분기: 국내/해외
-    if "economy" in raw_cat or "경제" in raw_cat:
-        if any(kw in text for kw in ECON_FOREIGN_KEYWORDS):
-            return "해외경제"
-        return "국내경제"
-
-    if "society" in raw_cat or "사회" in raw_cat:
-        return "사회"
-
-    if "entertainment" in raw_cat or "연예" in raw_cat or "culture" in raw_cat:
-        return "연예"
-
-    # 기타는 사회로 귀속 (보수적 기본값)
-    return "사회"
-
-
 def compute_importance_scores(embeds_cat: np.ndarray, text_lengths: np.ndarray) -> np.ndarray:
     """카테고리 내 대표성(centroid 유사도) + 텍스트 길이 정규화를 합쳐 중요도 산출"""
     if embeds_cat.shape[0] == 0:
         return np.array([])
+    from sklearn.metrics.pairwise import cosine_similarity
     centroid = embeds_cat.mean(axis=0, keepdims=True)
     sim = cosine_similarity(embeds_cat, centroid).ravel()  # 0~1 근처
 
@@ -92,6 +63,7 @@ class KoSimCSENewsPipeline:
             'min_text_length': 50,
             'min_title_length': 10,
             'max_text_length': 1000,
+            'article_fields': None,     # None → news_loader.ARTICLE_FIELDS
             'clustering_methods': ['CATEGORY_TOP3'],
             'hdbscan_params': {
                 'min_cluster_size': 20,
@@ -110,7 +82,18 @@ class KoSimCSENewsPipeline:
                 'metric': 'cosine'
             },
             'output_dir': str(Path(__file__).resolve().parents[2] / "results" / "cluster_results"),
-            'save_visualizations': True
+            'save_visualizations': True,
+            # 저장되는 임베딩 아티팩트 dtype (float16: 용량 절반, 코사인 오차 ~1e-3)
+            'embedding_dtype': 'float16',
+            # CATEGORY_TOP3: kNN 그래프 facility-location 으로 서로 다른 스토리 앵커를 고르고 이웃 기사를 합류
+            # (story_anchors.DEFAULT_TOP3_PARAMS 를 덮어씀)
+            'top3_params': {},
+            # clustering_results_detailed_*.csv 도 함께 저장할지 (기본은 Parquet 만, pyarrow 없으면 CSV)
+            'save_csv': False,
+            # 단계별 계측(wall/CPU/RSS/건수) → output_dir/trace_{ts}.json
+            'trace': True,
+            # 실행 시드: 분석 샘플 등 용도별 시드를 여기서 파생하고 run_{ts}.json 에 시드·버전·해시 기록(run_manifest)
+            'seed': 42
         }
         if config:
             self.config.update(config)
@@ -121,6 +104,9 @@ class KoSimCSENewsPipeline:
         self.cluster_labels = None
         self.best_method = None
         self.cluster_analysis = None
+        self.tracer = PipelineTracer(enabled=self.config['trace'])
+        self.run_ts = None                     # save_results 의 결과 파일 타임스탬프(trace 파일명에 사용)
+        self.input_hashes = {}                 # 입력 파일/기사 해시 (재현성 manifest)
 
         base_dir = Path(__file__).resolve().parents[2]
         self.output_dir = (base_dir / "model" / "results" / "cluster_results").resolve()
@@ -129,9 +115,11 @@ class KoSimCSENewsPipeline:
         print(f"🚀 KoSimCSE 뉴스 클러스터링 파이프라인 초기화")
         print(f"   출력 디렉토리: {self.output_dir}")
 
+    @traced('load_model')
     def load_model(self) -> bool:
         print(f"\n🤖 모델 로딩: {self.config['model_name']}")
         try:
+            from sentence_transformers import SentenceTransformer
             self.model = SentenceTransformer(self.config['model_name'])
             print(f"✅ 모델 로드 성공!   차원: {self.model.get_sentence_embedding_dimension()}")
             return True
@@ -139,44 +127,28 @@ class KoSimCSENewsPipeline:
             print(f"❌ 모델 로딩 실패: {e}")
             return False
 
+    @traced('load_news_data', items=lambda self, _: len(self.articles_df) if self.articles_df is not None else 0)
     def load_news_data(self, file_path: str) -> bool:
         print(f"\n📊 뉴스 데이터 로딩...")
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                news_data = json.load(f)
+            # 기사 단위 스트리밍 로드: 길이 필터를 읽으면서 적용하고 필요한 필드만 컬럼으로 적재
+            from news_loader import load_articles
+            self.articles_df, category_stats = load_articles(
+                file_path,
+                min_text_length=self.config['min_text_length'],
+                max_text_length=self.config['max_text_length'],
+                min_title_length=self.config['min_title_length'],
+                fields=self.config.get('article_fields')
+            )
             print(f"✅ 파일 로드 성공: {file_path}")
-
-            if 'news' not in news_data or not isinstance(news_data['news'], dict):
-                print("❌ JSON 구조에 문제가 있습니다. 'news' 키와 딕셔너리 타입을 확인하세요.")
-                return False
-
-            articles = []
-            category_stats = {}
-
-            for category, article_list in news_data['news'].items():
-                if not isinstance(article_list, list):
-                    continue
-                for article in article_list:
-                    title = article.get('title', '').strip()
-                    content = article.get('content', '').strip()
-                    full_text = f"{title}. {content}".strip()
-                    if (len(full_text) >= self.config['min_text_length'] and
-                        len(title) >= self.config['min_title_length'] and
-                        len(full_text) <= self.config['max_text_length']):
-                        articles.append({
-                            **article,
-                            'title': title,
-                            'content': content,
-                            'fullText': full_text,
-                            'textLength': len(full_text),
-                            'category': category,
-                            'top_category': normalize_top_category({'category': category, 'title': title, 'content': content}),
-                            'index': len(articles)
-                        })
-                        category_stats[category] = category_stats.get(category, 0) + 1
-
-            self.articles_df = pd.DataFrame(articles)
-            print(f"✅ 전처리 완료: {len(articles)}개 기사")
+            self.input_hashes = {'news_file': hash_file(file_path)}
+            if len(self.articles_df):
+                self.articles_df['top_category'] = top_categories(
+                    self.articles_df['category'],
+                    self.articles_df['title'] + ' ' + self.articles_df['content']
+                )
+            self.input_hashes['articles'] = hash_frame(self.articles_df)
+            print(f"✅ 전처리 완료: {len(self.articles_df)}개 기사")
             print("카테고리별 분포:")
             for cat, count in category_stats.items():
                 print(f"  {cat}: {count}개")
@@ -185,6 +157,7 @@ class KoSimCSENewsPipeline:
             print(f"❌ 데이터 로딩 실패: {e}")
             return False
 
+    @traced('generate_embeddings', items=lambda self, _: len(self.articles_df) if self.articles_df is not None else 0)
     def generate_embeddings(self) -> bool:
         print(f"\n⚡ KoSimCSE 임베딩 생성 중...")
         if self.model is None or self.articles_df is None:
@@ -205,6 +178,7 @@ class KoSimCSENewsPipeline:
             print(f"❌ 임베딩 생성 실패: {e}")
             return False
 
+    @traced('run_clustering', items=lambda self, _: len(self.articles_df) if self.articles_df is not None else 0)
     def run_clustering(self) -> Dict:
         print(f"\n🔍 카테고리 TOP3 선별 모드 실행 중...")
         if self.embeddings is None or self.articles_df is None:
@@ -226,20 +200,17 @@ class KoSimCSENewsPipeline:
             embeds_cat = self.embeddings[idx_cat]
             text_len_cat = df_cat['textLength'].to_numpy()
 
-            # 중요도 스코어 계산
+            # 중요도 스코어 = facility-location 가중치 (많이, 중요하게 덮는 기사가 앵커)
             scores = compute_importance_scores(embeds_cat, text_len_cat)
-            # 상위 3개 인덱스 선택 (데이터가 적으면 있는 만큼)
-            top_k = min(3, len(scores))
-            top_idx_local = np.argsort(-scores)[:top_k]
-            chosen_global_idx = idx_cat[top_idx_local]
-
-            # 각 선택 기사 주변으로 유사한 기사들을 묶는 간단한 군집(옵션)
-            # 여기서는 선택 기사 자신만 포함(대표 기사 3개를 선택) — 필요 시 확장 가능
-            for j, g_idx in enumerate(chosen_global_idx):
+            # 서로 다른 스토리의 앵커 최대 3개 + 각 앵커의 가까운 이웃 기사(다중 출처 맥락)
+            for anchor, members in select_story_anchors(embeds_cat, scores, self.config['top3_params']):
+                g_idx = idx_cat[anchor]
                 labels[g_idx] = cluster_id_counter
+                labels[idx_cat[members]] = cluster_id_counter
                 mapping_info[int(cluster_id_counter)] = {
                     'top_category': cat,
-                    'anchor_title': self.articles_df.loc[g_idx, 'title']
+                    'anchor_title': self.articles_df.loc[g_idx, 'title'],
+                    'size': 1 + len(members)
                 }
                 cluster_id_counter += 1
 
@@ -250,75 +221,49 @@ class KoSimCSENewsPipeline:
         self.best_method = 'CATEGORY_TOP3'
         self.cluster_labels = labels
         results['CATEGORY_TOP3'] = labels
-        print(f"   ✅ 카테고리별 대표 기사 선별 완료: 총 {cluster_id_counter}개 (카테고리당 최대 3개)")
+        print(f"   ✅ 카테고리별 대표 스토리 선별 완료: 총 {cluster_id_counter}개 (카테고리당 최대 3개), "
+              f"묶인 기사 {int((labels != -1).sum())}개")
         return results
     
+    @traced('analyze_clusters', items=lambda self, result: len(result))
     def analyze_clusters(self) -> Dict:
         print(f"\n📊 클러스터 분석 중...")
         if self.cluster_labels is None:
             print("❌ 클러스터링이 실행되지 않았습니다.")
             return {}
 
-        unique_clusters = sorted(c for c in set(self.cluster_labels) if c != -1)
-        analysis = {}
-        
-        for cluster_id in unique_clusters:
-            mask = self.cluster_labels == cluster_id
-            cluster_articles = self.articles_df[mask]
-            
-            if cluster_id == -1:  # 노이즈
-                analysis[cluster_id] = {
-                    'size': len(cluster_articles),
-                    'type': '노이즈',
-                    'sample_titles': cluster_articles['title'].head(3).tolist()
-                }
-            else:
-                cat_dist = cluster_articles['category'].value_counts()
-                dominant_cat = cat_dist.index[0] if len(cat_dist) > 0 else 'Unknown'
-                purity = (cat_dist.iloc[0] / len(cluster_articles)) if len(cat_dist) > 0 else 0
-                top_articles = cluster_articles.nlargest(3, 'textLength')
-                analysis[cluster_id] = {
-                    'size': len(cluster_articles),
-                    'dominant_category': dominant_cat,
-                    'purity': purity,
-                    'categories': dict(cat_dist.head(3)),
-                    'representative_titles': top_articles['title'].tolist(),
-                    'avg_text_length': cluster_articles['textLength'].mean(),
-                    'sample_articles': cluster_articles.sample(min(3, len(cluster_articles)))['title'].tolist()
-                }
+        # 군집별 마스크 반복 대신 한 번의 그룹 집계로 모든 군집 통계 계산
+        analysis = cluster_summaries(self.cluster_labels, self.articles_df, include_noise=False,
+                                     seed=derive_seed(self.config['seed'], 'analyze'))
         # numpy 타입을 json 호환 기본 타입으로 변환
         analysis_conv = {str(int(k)): convert_numpy_types(v) for k, v in analysis.items()}
         self.cluster_analysis = analysis_conv
         return analysis_conv
     
+    @traced('calculate_metrics', items=lambda self, _: len(self.articles_df) if self.articles_df is not None else 0)
     def calculate_metrics(self) -> Dict:
         print(f"\n📏 품질 지표 계산 중...")
         if self.cluster_labels is None:
             return {}
 
-        category_to_id = {cat: i for i, cat in enumerate(self.articles_df['category'].unique())}
-        true_labels = np.array([category_to_id[cat] for cat in self.articles_df['category']])
+        true_labels = pd.factorize(self.articles_df['category'])[0]
         metrics = {}
 
         valid_mask = self.cluster_labels != -1
         if valid_mask.sum() > 0:
             valid_pred = self.cluster_labels[valid_mask]
             valid_true = true_labels[valid_mask]
-            valid_embeddings = self.embeddings[valid_mask]
             if len(set(valid_pred)) > 1 and sum((valid_pred == cid).sum() >= 2 for cid in set(valid_pred)) >= 2:
-                silhouette = silhouette_score(valid_embeddings, valid_pred)
+                from sklearn.metrics import adjusted_rand_score
+                # 노이즈(앵커 밖 기사)를 뺀 유효 행만으로 채점(전체 N 거리 블록을 만들지 않음)
+                sil = ScoringContext(self.embeddings[valid_mask], self.config.get('scoring_params')).silhouette(
+                    valid_pred)
+                silhouette = sil['score']
                 metrics['silhouette'] = silhouette
+                metrics['silhouette_method'] = sil['method']
                 ari = adjusted_rand_score(valid_true, valid_pred)
                 metrics['ari'] = ari
-                total_purity = 0
-                for cluster_id in set(valid_pred):
-                    cluster_mask = valid_pred == cluster_id
-                    if cluster_mask.sum() > 0:
-                        cluster_true = valid_true[cluster_mask]
-                        most_common_count = Counter(cluster_true).most_common(1)[0][1]
-                        cluster_purity = most_common_count / len(cluster_true)
-                        total_purity += cluster_purity * len(cluster_true)
-                overall_purity = total_purity / len(valid_pred)
+                overall_purity = purity(valid_pred, valid_true)  # contingency 행렬 기반
                 metrics['purity'] = overall_purity
                 metrics['n_clusters'] = len(set(valid_pred))
                 metrics['noise_ratio'] = (self.cluster_labels == -1).sum() / len(self.cluster_labels)
@@ -329,6 +274,7 @@ class KoSimCSENewsPipeline:
                 print(f"  노이즈 비율: {metrics['noise_ratio']:.1%}")
         return metrics
     
+    @traced('save_results', items=lambda self, _: len(self.articles_df) if self.articles_df is not None else 0)
     def save_results(self):
         print(f"\n💾 결과 저장 중...")
         if self.articles_df is None or self.cluster_labels is None:
@@ -342,36 +288,50 @@ class KoSimCSENewsPipeline:
             results_df['method'] = self.best_method
             
             ts = datetime.utcnow().isoformat().replace(":", "-").replace(".", "-")
-            csv_path = self.output_dir / f'clustering_results_detailed_{ts}.csv'
-            results_df.to_csv(csv_path, index=False, encoding='utf-8')
+            self.run_ts = ts
+            # articles_generator 로 넘기는 군집 결과: Parquet(categorical/정수 dtype 고정), 필요 시 CSV 병행
+            from cluster_handoff import write_cluster_results
+            results_path = write_cluster_results(results_df, self.output_dir, ts, save_csv=self.config['save_csv'])
+            print(f"   ✅ 군집 결과: {results_path}")
             
             if self.cluster_analysis:
                 summary_path = self.output_dir / f'cluster_summary_{ts}.json'
                 with open(summary_path, 'w', encoding='utf-8') as f:
                     json.dump(self.cluster_analysis, f, ensure_ascii=False, indent=2)
             
-            embeddings_data = {
-                'articles': self.articles_df.to_dict('records'),
-                'embeddings': self.embeddings.tolist(),
-                'cluster_labels': self.cluster_labels.tolist(),
-                'metadata': {
+            # 임베딩/라벨은 .npy(float16/int32), 기사 메타는 Parquet(또는 NDJSON) + run_{ts}.json manifest
+            from cluster_artifacts import save_run_artifacts
+            manifest_path = save_run_artifacts(
+                self.output_dir, ts, self.embeddings, self.cluster_labels, self.articles_df,
+                metadata={
                     'model': self.config['model_name'],
                     'method': self.best_method,
                     'dimensions': self.embeddings.shape[1],
                     'total_articles': len(self.articles_df),
-                    'timestamp': datetime.now().isoformat()
-                }
-            }
-            
-            embeddings_path = self.output_dir / f'embeddings_and_clusters_{ts}.json'
-            with open(embeddings_path, 'w', encoding='utf-8') as f:
-                json.dump(embeddings_data, f, ensure_ascii=False, indent=2)
-            print(f"   ✅ 임베딩 데이터: {embeddings_path}")
+                    'timestamp': datetime.now().isoformat(),
+                    # 같은 입력·설정·시드·모델이면 outputs 해시가 같아야 함. run_key 는 하위 단계 캐시 키
+                    'reproducibility': build_manifest(
+                        self.config['seed'], self.config,
+                        inputs={**self.input_hashes, 'embeddings': hash_array(self.embeddings)},
+                        outputs={'labels': hash_array(np.asarray(self.cluster_labels, dtype=np.int32)),
+                                 'cluster_results': hash_file(results_path)},
+                        model_name=self.config['model_name'])
+                },
+                embedding_dtype=self.config['embedding_dtype']
+            )
+            print(f"   ✅ 임베딩 데이터: {manifest_path}")
         except Exception as e:
             print(f"   ❌ 저장 실패: {e}")
     
     def run_full_pipeline(self, news_file_path: str) -> bool:
         print("🚀 KoSimCSE 뉴스 클러스터링 파이프라인 시작\n")
+        seed_everything(self.config['seed'])
+        try:
+            return self._run_steps(news_file_path)
+        finally:
+            self._write_trace()
+
+    def _run_steps(self, news_file_path: str) -> bool:
         if not self.load_model():
             return False
         if not self.load_news_data(news_file_path):
@@ -388,6 +348,17 @@ class KoSimCSENewsPipeline:
         print(f"📂 결과 위치: {self.output_dir}")
         return True
 
+    def _write_trace(self):
+        """단계별 계측 결과를 군집 결과 옆(trace_{ts}.json)에 저장"""
+        if not self.tracer.enabled:
+            return
+        ts = self.run_ts or datetime.utcnow().isoformat().replace(":", "-").replace(".", "-")
+        try:
+            path = self.tracer.write(self.output_dir / f'trace_{ts}.json')
+            print(f"   🧭 단계별 계측: {path}")
+        except OSError as e:
+            print(f"   ⚠️ 계측 저장 실패: {e}")
+
 def main():
     NEWS_DIR = Path(__file__).resolve().parents[2] / "model" / "results" / "collect_results"
     latest = max(NEWS_DIR.glob("news_collected_*h_*.json"), key=lambda p: p.stat().st_mtime)
@@ -323,6 +323,9 @@ def main():
     out = os.path.join(args.outdir, f"news_collected_{args.hours}h_{ts}.json")
     with open(out, "w", encoding="utf-8") as f:
         json.dump(result, f, ensure_ascii=False, indent=2)
+    # 군집 단계 스트리밍 로더용 사이드카(한 줄 = 기사 1건)
+    from news_loader import write_ndjson_sidecar
+    write_ndjson_sidecar(out, collected)
 
     logging.info(f"\n저장 완료: {out}")
     logging.info(json.dumps({**result, "news": "omitted-for-logs"}, ensure_ascii=False, indent=2))
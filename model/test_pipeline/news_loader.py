@@ -0,0 +1,145 @@
+"""
+수집 결과(news_collected_*.json) 스트리밍 로더
+
+json.load 로 파일 전체를 파싱한 뒤 기사 dict 를 펼쳐 DataFrame 을 만들던 방식 대신
+기사를 한 건씩 읽으면서 길이 필터를 적용하고, 통과한 기사의 필요한 필드만 컬럼 버퍼에 쌓는다.
+최대 메모리는 원본 파일 크기가 아니라 남긴 기사 수에 비례한다.
+
+입력 형식(우선순위):
+  1) 같은 이름의 .ndjson 사이드카(수집기가 함께 저장, 한 줄 = 기사 1건 + category) - 추가 의존성 없음
+  2) ijson (pip install ijson) 으로 {"news": {category: [article, ...]}} 를 이벤트 단위 파싱
+  3) 둘 다 없으면 기존처럼 json.load 후 순회
+"""
+import json
+from array import array
+from pathlib import Path
+from typing import Dict, Iterator, Optional, Sequence, Tuple
+
+import pandas as pd
+
+# 파이프라인/articles_generator 가 쓰는 수집 필드(그 외 필드는 버린다)
+ARTICLE_FIELDS = ["title", "originalUrl", "naverUrl", "description", "pubDate", "category",
+                  "content", "contentLength", "isQualityContent", "source"]
+
+
+def ndjson_sidecar(path) -> Path:
+    return Path(path).with_suffix('.ndjson')
+
+
+def write_ndjson_sidecar(path, news: Dict[str, list]) -> Path:
+    """{category: [article, ...]} → 한 줄에 기사 하나(category 포함)인 NDJSON"""
+    out = ndjson_sidecar(path)
+    with open(out, 'w', encoding='utf-8') as f:
+        for category, article_list in news.items():
+            for article in article_list:
+                f.write(json.dumps({**article, 'category': category}, ensure_ascii=False))
+                f.write('\n')
+    return out
+
+
+def _iter_ndjson(path: Path) -> Iterator[Tuple[str, dict]]:
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            line = line.strip()
+            if line:
+                article = json.loads(line)
+                yield article.get('category', ''), article
+
+
+def _iter_ijson(path: Path, ijson) -> Iterator[Tuple[str, dict]]:
+    """news.<category>.item 아래 객체만 조립해서 하나씩 반환"""
+    with open(path, 'rb') as f:
+        category, builder, depth, seen_news = None, None, 0, False
+        for prefix, event, value in ijson.parse(f):
+            if builder is not None:
+                builder.event(event, value)
+                if event in ('start_map', 'start_array'):
+                    depth += 1
+                elif event in ('end_map', 'end_array'):
+                    depth -= 1
+                    if depth == 0:
+                        yield category, builder.value
+                        builder = None
+                continue
+            if prefix == 'news':
+                if event == 'start_map':
+                    seen_news = True
+                elif event == 'map_key':
+                    category = value
+            elif event == 'start_map' and category is not None and prefix == f'news.{category}.item':
+                builder = ijson.ObjectBuilder()
+                builder.event(event, value)
+                depth = 1
+        if not seen_news:
+            raise ValueError("JSON 구조에 문제가 있습니다. 'news' 키와 딕셔너리 타입을 확인하세요.")
+
+
+def _iter_json(path: Path) -> Iterator[Tuple[str, dict]]:
+    with open(path, 'r', encoding='utf-8') as f:
+        news_data = json.load(f)
+    if 'news' not in news_data or not isinstance(news_data['news'], dict):
+        raise ValueError("JSON 구조에 문제가 있습니다. 'news' 키와 딕셔너리 타입을 확인하세요.")
+    for category, article_list in news_data.pop('news').items():
+        if isinstance(article_list, list):
+            for article in article_list:
+                yield category, article
+
+
+def iter_articles(path) -> Iterator[Tuple[str, dict]]:
+    """(category, article) 를 한 건씩 반환"""
+    path = Path(path)
+    if path.suffix in ('.ndjson', '.jsonl'):
+        return _iter_ndjson(path)
+    sidecar = ndjson_sidecar(path)
+    if sidecar.exists():
+        return _iter_ndjson(sidecar)
+    try:
+        import ijson
+    except ImportError:
+        return _iter_json(path)
+    return _iter_ijson(path, ijson)
+
+
+def load_articles(path, min_text_length: int, max_text_length: int, min_title_length: int,
+                  fields: Optional[Sequence[str]] = None) -> Tuple[pd.DataFrame, Dict[str, int]]:
+    """길이 필터를 통과한 기사만 컬럼 단위로 적재 → (articles_df, 카테고리별 건수)"""
+    fields = list(fields or ARTICLE_FIELDS)
+    cols = {name: [] for name in fields if name != 'category'}
+    present = {'title', 'content'}  # 한 번이라도 등장한 필드만 컬럼으로 남긴다(기존 DataFrame(articles) 와 동일)
+    categories, full_texts = [], []
+    text_lengths = array('i')
+    category_stats = {}
+
+    for category, article in iter_articles(path):
+        title = (article.get('title') or '').strip()
+        content = (article.get('content') or '').strip()
+        full_text = f"{title}. {content}".strip()
+        if not (min_text_length <= len(full_text) <= max_text_length and len(title) >= min_title_length):
+            continue
+        for name, buf in cols.items():
+            buf.append(article.get(name))
+        present.update(article.keys())
+        if 'title' in cols:
+            cols['title'][-1] = title
+        if 'content' in cols:
+            cols['content'][-1] = content
+        categories.append(category)
+        full_texts.append(full_text)
+        text_lengths.append(len(full_text))
+        category_stats[category] = category_stats.get(category, 0) + 1
+
+    n = len(full_texts)
+    data = {}
+    for name in fields:
+        if name == 'category':
+            data[name] = pd.Categorical(categories)
+        elif name in present:
+            data[name] = cols[name]
+    if 'contentLength' in data:
+        data['contentLength'] = pd.array(data['contentLength'], dtype='Int32')
+    if 'isQualityContent' in data:
+        data['isQualityContent'] = pd.array(data['isQualityContent'], dtype='boolean')
+    data['fullText'] = full_texts
+    data['textLength'] = pd.array(text_lengths, dtype='int32')
+    data['index'] = pd.RangeIndex(n).to_numpy(dtype='int32')
+    return pd.DataFrame(data, index=pd.RangeIndex(n)), category_stats
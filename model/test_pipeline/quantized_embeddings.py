@@ -0,0 +1,87 @@
+"""
+임베딩 저정밀 저장(float16 / int8 스칼라 양자화)
+
+롤링 윈도우(embedding_window)가 실행 사이에 보관하는 과거 기사 임베딩의 저장 형식이다. 768차원 기준 1건당
+float64 6KB → float32 3KB → float16 1.5KB → int8 0.77KB(+행 스케일 4B).
+  - float16 : 값 그대로 반정밀 저장
+  - int8    : 행별 대칭 스케일 s = max|x| / 127, q = round(x / s)
+군집화·후처리는 dequantize() 로 float32 로 되돌린 행렬에서 수행한다.
+dot 은 역양자화된 전체 행렬을 만들지 않도록 block_rows 단위로 self @ Q.T 를 계산한다
+(int8 은 q·Q 후 행 스케일만 곱함, story_anchors 의 kNN 에서 사용).
+"""
+from typing import Optional
+
+import numpy as np
+
+PRECISIONS = ('float32', 'float16', 'int8')
+DEFAULT_BLOCK_ROWS = 4096
+
+
+class QuantizedEmbeddings:
+    """N×d 임베딩 저장소. precision='float32' 는 변환 없이 감싼 것과 같다."""
+
+    def __init__(self, data: np.ndarray, scales: Optional[np.ndarray], precision: str,
+                 block_rows: int = DEFAULT_BLOCK_ROWS):
+        self.data = data
+        self.scales = scales          # int8 일 때만 (N,) float32
+        self.precision = precision
+        self.block_rows = block_rows
+
+    @classmethod
+    def from_array(cls, X: np.ndarray, precision: str = 'float32',
+                   block_rows: int = DEFAULT_BLOCK_ROWS) -> "QuantizedEmbeddings":
+        if precision not in PRECISIONS:
+            raise ValueError(f"지원하지 않는 precision: {precision} (가능: {PRECISIONS})")
+        X = np.asarray(X)
+        if precision == 'int8':
+            scales = (np.abs(X).max(axis=1) / 127.0).astype(np.float32)
+            safe = np.where(scales > 0, scales, 1.0)[:, None]
+            q = np.clip(np.rint(X / safe), -127, 127).astype(np.int8)
+            return cls(q, scales, precision, block_rows)
+        return cls(np.ascontiguousarray(X, dtype=precision), None, precision, block_rows)
+
+    # ---- 기본 정보 ----
+    def __len__(self):
+        return self.data.shape[0]
+
+    @property
+    def shape(self):
+        return self.data.shape
+
+    @property
+    def nbytes(self) -> int:
+        return int(self.data.nbytes + (self.scales.nbytes if self.scales is not None else 0))
+
+    def take(self, idx) -> "QuantizedEmbeddings":
+        scales = self.scales[idx] if self.scales is not None else None
+        return QuantizedEmbeddings(self.data[idx], scales, self.precision, self.block_rows)
+
+    def dequantize(self, idx=None) -> np.ndarray:
+        """float32 행렬(idx 가 주어지면 그 행만)"""
+        data = self.data if idx is None else self.data[idx]
+        out = data.astype(np.float32)
+        if self.scales is not None:
+            out *= (self.scales if idx is None else self.scales[idx])[:, None]
+        return out
+
+    def _blocks(self):
+        for s in range(0, len(self), self.block_rows):
+            yield s, min(s + self.block_rows, len(self))
+
+    def _raw_block(self, s: int, e: int) -> np.ndarray:
+        """스케일을 곱하지 않은 float32 블록(int8 은 정수값 그대로)"""
+        return self.data[s:e].astype(np.float32, copy=False)
+
+    def dot(self, Q: np.ndarray) -> np.ndarray:
+        """self @ Q.T (N×m, float32). int8 은 q·Q 후 행 스케일만 곱한다"""
+        Q = np.ascontiguousarray(np.atleast_2d(Q), dtype=np.float32)
+        out = np.empty((len(self), Q.shape[0]), dtype=np.float32)
+        for s, e in self._blocks():
+            out[s:e] = self._raw_block(s, e) @ Q.T
+        if self.scales is not None:
+            out *= self.scales[:, None]
+        return out
+
+
+def as_quantized(X, precision: str = 'float32') -> QuantizedEmbeddings:
+    return X if isinstance(X, QuantizedEmbeddings) else QuantizedEmbeddings.from_array(X, precision)
@@ -0,0 +1,95 @@
+"""
+CATEGORY_TOP3 용 스토리 앵커 선택(다양성 고려) + 앵커 주변 기사 묶기
+
+카테고리 중심과의 유사도 순 상위 3개만 고르면 같은 사건의 거의 같은 기사들이 3칸을 모두 차지한다.
+대신 kNN 그래프 위의 가중 facility-location 을 탐욕적으로 최대화한다.
+  F(S) = Σ_i w_i · max_{s∈S} sim(i, s)      (i 는 s 의 kNN 이웃, w = 중요도 점수)
+  - 앵커 후보 c 의 이득 = Σ_{i∈kNN(c)∪{c}} w_i · max(0, sim(i, c) − cover_i)
+  - 앵커를 고르면 전체 기사와의 유사도(n×d 내적 1회)로 cover 를 갱신 → 같은 스토리 기사들은 이득이 거의 없어 밀려난다
+  - 추가로 이미 고른 앵커와 sim ≥ duplicate_sim 인 후보는 제외(MMR 식 중복 방지)
+앵커 하나당 이득 계산 O(n·k) + 유사도 갱신 O(n·d) 이라 기사 수에 선형이다.
+kNN 은 n ≤ exact_knn_max 이면 블록 단위 정확 계산, 그보다 크면 ann_index(HNSW/IVF)를 쓴다.
+앵커와 sim ≥ member_min_sim 인 기사 중 가까운 순 max_members 개를 같은 군집으로 묶는다(여러 앵커면 더 가까운 쪽).
+"""
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+from quantized_embeddings import QuantizedEmbeddings, as_quantized
+
+DEFAULT_TOP3_PARAMS = {
+    'anchors_per_category': 3,
+    'knn_k': 10,
+    'member_min_sim': 0.6,      # 앵커 군집에 합류할 최소 코사인
+    'max_members': 6,           # 앵커 외 합류 기사 수 상한
+    'duplicate_sim': 0.9,       # 이미 고른 앵커와 이 이상 비슷하면 앵커 후보 제외
+    'exact_knn_max': 4000,
+    'block_rows': 1024,
+    'ann_params': {},
+}
+
+
+def knn_neighbors(E: QuantizedEmbeddings, k: int, exact_max: int = 4000, block_rows: int = 1024,
+                  ann_params: Dict = None) -> Tuple[np.ndarray, np.ndarray]:
+    """자기 자신을 포함한 kNN → (idx[n×K], sims[n×K]) (유사도 내림차순, 부족하면 -1 / -inf)"""
+    n = len(E)
+    K = min(k + 1, n)
+    if n > exact_max:
+        from ann_index import build_index
+        return build_index(E.dequantize(), ann_params).knn(E.dequantize(), K)
+    idx = np.empty((n, K), dtype=np.int64)
+    sims = np.empty((n, K), dtype=np.float32)
+    for s in range(0, n, block_rows):
+        S = E.dot(E.dequantize(np.arange(s, min(s + block_rows, n)))).T   # (b × n)
+        part = np.argpartition(-S, K - 1, axis=1)[:, :K]
+        ps = np.take_along_axis(S, part, axis=1)
+        order = np.argsort(-ps, axis=1)
+        idx[s:s + len(S)] = np.take_along_axis(part, order, axis=1)
+        sims[s:s + len(S)] = np.take_along_axis(ps, order, axis=1)
+    return idx, sims
+
+
+def select_story_anchors(embeds, weights: np.ndarray, params: Dict = None) -> List[Tuple[int, np.ndarray]]:
+    """[(앵커 로컬 인덱스, 합류 기사 로컬 인덱스 배열), ...] (선택 순서대로, 앵커 미포함)"""
+    p = dict(DEFAULT_TOP3_PARAMS)
+    if params:
+        p.update(params)
+    E = as_quantized(embeds)
+    n = len(E)
+    if n == 0:
+        return []
+    idx, sims = knn_neighbors(E, p['knn_k'], p['exact_knn_max'], p['block_rows'], p['ann_params'])
+    valid = idx >= 0
+    safe_idx = np.where(valid, idx, 0)
+    sims = np.where(valid, sims, 0.0).astype(np.float32)
+    w = np.maximum(np.asarray(weights, dtype=np.float32), 0.0) + 1e-6
+
+    cover = np.zeros(n, dtype=np.float32)
+    blocked = np.zeros(n, dtype=bool)
+    anchors, anchor_sims = [], []
+    for _ in range(min(p['anchors_per_category'], n)):
+        gain = (w[safe_idx] * np.maximum(sims - cover[safe_idx], 0.0) * valid).sum(axis=1)
+        gain[blocked] = -np.inf
+        c = int(np.argmax(gain))
+        if not np.isfinite(gain[c]):
+            break
+        sim_c = E.dot(E.dequantize([c]))[:, 0]
+        anchors.append(c)
+        anchor_sims.append(sim_c)
+        np.maximum(cover, sim_c, out=cover)
+        blocked[c] = True
+        blocked[sim_c >= p['duplicate_sim']] = True
+    if not anchors:
+        return []
+
+    # 합류: 앵커와 임계값 이상인 기사 중 가까운 순 max_members 개, 여러 앵커에 걸리면 더 가까운 앵커로
+    S = np.stack(anchor_sims)                     # (앵커 수 × n)
+    S[:, anchors] = -np.inf
+    owner = np.argmax(S, axis=0)
+    best = S[owner, np.arange(n)]
+    out = []
+    for a, c in enumerate(anchors):
+        cand = np.where((owner == a) & (best >= p['member_min_sim']))[0]
+        cand = cand[np.argsort(-best[cand], kind='stable')[:p['max_members']]]
+        out.append((c, np.sort(cand)))
+    return out
@@ -0,0 +1,34 @@
+"""
+main_pipeline 모듈 단위 테스트 공통 설정
+
+파이프라인 모듈은 같은 폴더 기준 평면 import(from run_manifest import ...)를 쓰므로 main_pipeline 을 경로에 추가한다.
+시간에 의존하는 코드는 FakeClock 으로 time.monotonic / time.time 을 고정해 결정적으로 검사한다.
+
+    python -m pytest -q model/tests
+"""
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / 'main_pipeline'))
+
+
+class FakeClock:
+    def __init__(self, start: float = 1_000_000.0):
+        self.now = start
+
+    def __call__(self) -> float:
+        return self.now
+
+    def advance(self, seconds: float):
+        self.now += seconds
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """time.monotonic / time.time 을 같은 가짜 시계로 교체"""
+    fake = FakeClock()
+    monkeypatch.setattr('time.monotonic', fake)
+    monkeypatch.setattr('time.time', fake)
+    return fake
@@ -0,0 +1,132 @@
+import asyncio
+from email.utils import formatdate
+from types import SimpleNamespace
+
+import pytest
+
+from api_scheduler import BackgroundPool, RateLimiter, TokenBucket, retry_after_seconds
+
+
+def _error(headers):
+    return Exception() if headers is None else SimpleNamespace(response=SimpleNamespace(headers=headers))
+
+
+def test_bucket_starts_full_and_refills_per_second(clock):
+    bucket = TokenBucket(per_minute=60)
+    assert bucket.wait_time(60) == 0.0
+    bucket.take(60)
+    assert bucket.wait_time(1) == pytest.approx(1.0)
+    clock.advance(0.5)
+    assert bucket.wait_time(1) == pytest.approx(0.5)
+    clock.advance(10)
+    assert bucket.wait_time(10) == 0.0
+    assert bucket.level == pytest.approx(10.5)
+
+
+def test_bucket_refill_is_capped_at_capacity(clock):
+    bucket = TokenBucket(per_minute=60, capacity=5)
+    bucket.take(5)
+    clock.advance(3600)
+    bucket.take(0)
+    assert bucket.level == pytest.approx(5)
+
+
+def test_bucket_oversized_request_waits_for_capacity_only(clock):
+    bucket = TokenBucket(per_minute=120)
+    bucket.take(120)
+    # 용량(120)보다 큰 요청도 버킷이 가득 차면 나갈 수 있어야 함(영원히 대기하지 않음)
+    assert bucket.wait_time(1000) == pytest.approx(60.0)
+    bucket.take(1000)
+    assert bucket.level == pytest.approx(-120)
+
+
+def test_bucket_refund_is_capped_at_capacity(clock):
+    bucket = TokenBucket(per_minute=100)
+    bucket.take(30)
+    bucket.refund(50)
+    assert bucket.level == pytest.approx(100)
+
+
+def test_acquire_takes_request_and_tokens(clock):
+    limiter = RateLimiter(rpm=10, tpm=1000)
+    asyncio.run(limiter.acquire(tokens=400))
+    assert limiter.requests.level == pytest.approx(9)
+    assert limiter.tokens.level == pytest.approx(600)
+
+
+def test_settle_refunds_overestimate_and_charges_underestimate(clock):
+    limiter = RateLimiter(rpm=10, tpm=1000)
+    asyncio.run(limiter.acquire(tokens=400))
+    limiter.settle(400, 100)
+    assert limiter.tokens.level == pytest.approx(900)
+    limiter.settle(100, 350)
+    assert limiter.tokens.level == pytest.approx(650)
+    limiter.settle(100, None)          # usage 없는 응답은 보정하지 않음
+    assert limiter.tokens.level == pytest.approx(650)
+
+
+def test_settle_without_token_budget_is_noop(clock):
+    limiter = RateLimiter(rpm=10)
+    limiter.settle(100, 50)
+    assert limiter.tokens is None
+
+
+def test_pause_only_extends(clock):
+    limiter = RateLimiter(rpm=10)
+    limiter.pause(30)
+    limiter.pause(5)
+    assert limiter.paused_until == pytest.approx(clock.now + 30)
+
+
+def test_retry_after_ms_header_wins():
+    assert retry_after_seconds(_error({'retry-after-ms': '1500', 'retry-after': '9'})) == pytest.approx(1.5)
+
+
+def test_retry_after_seconds_header():
+    assert retry_after_seconds(_error({'retry-after': '7'})) == pytest.approx(7.0)
+    assert retry_after_seconds(_error({'retry-after': '0.25'})) == pytest.approx(0.25)
+
+
+def test_retry_after_http_date_header(clock):
+    assert retry_after_seconds(_error({'retry-after': formatdate(clock.now + 30, usegmt=True)})) == pytest.approx(30.0)
+    # 이미 지난 날짜는 0초
+    assert retry_after_seconds(_error({'retry-after': formatdate(clock.now - 30, usegmt=True)})) == 0.0
+
+
+@pytest.mark.parametrize('headers', [None, {}, {'x-other': '1'}, {'retry-after': 'soon'}, {'retry-after-ms': 'x'}])
+def test_retry_after_missing_or_invalid(headers):
+    assert retry_after_seconds(_error(headers)) is None
+
+
+def test_background_pool_join_returns_all_results():
+    async def double(x):
+        await asyncio.sleep(0)
+        return x * 2
+
+    pool = BackgroundPool(double, concurrency=2).start()
+    for i in range(5):
+        pool.submit(i)
+    results = pool.join()
+    assert sorted(results) == [(i, i * 2) for i in range(5)]
+    assert not pool.running
+    with pytest.raises(RuntimeError):
+        pool.submit(5)
+
+
+def test_background_pool_cancel_stops_pending_work_and_closes():
+    closed = []
+
+    async def forever(x):
+        await asyncio.Event().wait()
+
+    async def on_close():
+        closed.append(True)
+
+    pool = BackgroundPool(forever, concurrency=1, on_close=on_close).start()
+    for i in range(3):
+        pool.submit(i)
+    assert pool.join(timeout=0.05) == [] and pool.running    # timeout 이 지나도 스레드는 계속 실행 중
+    pool.cancel()
+    assert pool.join(timeout=5) == []
+    assert not pool.running
+    assert closed == [True]
@@ -0,0 +1,89 @@
+from image_cache import ImageCache, image_key, story_key
+from llm_cache import LLMCache, prompt_key
+
+
+def _llm_keys(cache):
+    return {row[0] for row in cache.conn.execute('SELECT key FROM llm_cache')}
+
+
+def test_llm_cache_evicts_least_recently_used_first(tmp_path, clock):
+    cache = LLMCache(tmp_path / 'llm.sqlite', ttl_hours=None, max_bytes=None)
+    for key in ('a', 'b', 'c'):
+        cache.put(key, 'm', {'text': 'x' * 90})
+        clock.advance(1)
+    size = cache.stats()['bytes'] // 3
+    assert cache.get('a') is not None            # a 를 최근 사용으로 → b 가 가장 오래됨
+    cache.max_bytes = 2 * size
+    assert cache.evict() == 1
+    assert _llm_keys(cache) == {'a', 'c'}
+    cache.max_bytes = size
+    assert cache.evict() == 1
+    assert _llm_keys(cache) == {'a'}
+    cache.close()
+
+
+def test_llm_cache_ttl_uses_creation_time(tmp_path, clock):
+    cache = LLMCache(tmp_path / 'llm.sqlite', ttl_hours=1, max_bytes=None)
+    cache.put('old', 'm', {'text': 'x'})
+    clock.advance(1800)
+    cache.put('new', 'm', {'text': 'y'})
+    clock.advance(2400)
+    assert cache.get('old') is None              # 사용 시각과 무관하게 저장 후 TTL 이 지나면 만료
+    assert cache.evict() == 1
+    assert _llm_keys(cache) == {'new'}
+    cache.close()
+
+
+def test_prompt_key_depends_on_every_part():
+    base = prompt_key('m', 's', 'u', 0.2)
+    assert base == prompt_key('m', 's', 'u', 0.2)
+    assert len({base, prompt_key('m2', 's', 'u', 0.2), prompt_key('m', 's2', 'u', 0.2),
+                prompt_key('m', 's', 'u2', 0.2), prompt_key('m', 's', 'u', 0.3)}) == 5
+
+
+def test_image_cache_evicts_least_recently_used_first(tmp_path, clock):
+    cache = ImageCache(tmp_path / 'img', max_bytes=None)
+    for key in ('a', 'b', 'c'):
+        cache.put(key, b'x' * 100, story=f's-{key}')
+        clock.advance(1)
+    assert cache.get('a') is not None
+    cache.max_bytes = 200
+    assert cache.evict() == 1
+    assert set(cache.entries) == {'a', 'c'}
+    assert not (tmp_path / 'img' / 'b.png').exists()
+    assert cache.get('zz', story='s-b') is None  # 삭제된 항목의 별칭 키도 제거
+    cache.max_bytes = 100
+    assert cache.evict() == 1
+    assert set(cache.entries) == {'a'}
+
+
+def test_image_cache_index_survives_reopen(tmp_path, clock):
+    cache = ImageCache(tmp_path / 'img')
+    cache.put('a', b'png', story='s-a')
+    cache.close()
+    reopened = ImageCache(tmp_path / 'img')
+    assert reopened.get('other', story='s-a') == tmp_path / 'img' / 'a.png'
+
+
+def test_story_key_ignores_spacing_and_punctuation():
+    assert story_key('m', '1024x1024', '금리 인하, 발표!', '국내경제') == \
+        story_key('m', '1024x1024', '금리인하 발표', '국내경제')
+    assert story_key('m', '1024x1024', '금리 인하', '국내경제') != story_key('m', '1024x1024', '금리 인하', '사회')
+    assert image_key('m', '1024x1024', 'p') != image_key('m', '512x512', 'p')
+
+
+def test_story_key_separates_stories_with_the_same_title():
+    assert story_key('m', '1024x1024', '속보', '사회', 'story-3') != story_key('m', '1024x1024', '속보', '사회', 'story-7')
+    assert story_key('m', '1024x1024', '속보', '사회', 'story-3') == story_key('m', '1024x1024', '속보!', '사회', 'story-3')
+
+
+def test_image_cache_put_enforces_budget_and_keeps_new_entry(tmp_path, clock):
+    cache = ImageCache(tmp_path / 'img', max_bytes=250)
+    for key in ('a', 'b'):
+        cache.put(key, b'x' * 100)
+        clock.advance(1)
+    cache.put('c', b'x' * 100)                   # 300 > 250 → 가장 오래된 a 삭제
+    assert set(cache.entries) == {'b', 'c'}
+    cache.put('big', b'x' * 400)                 # 예산보다 커도 방금 저장한 항목은 남김
+    assert set(cache.entries) == {'big'}
+    assert (tmp_path / 'img' / 'big.png').exists()
@@ -0,0 +1,11 @@
+import pandas as pd
+
+from category_rules import majority_to_ko, top_categories
+
+
+def test_categorical_input_with_nulls():
+    # 군집 결과를 category dtype 으로 읽으면 결측이 있어도 fillna("") 에서 실패하지 않아야 함
+    raw = pd.Series(['economy', None, 'society'], dtype='category')
+    texts = pd.Series(['금리 인하', None, '사건 사고'], dtype='category')
+    assert list(majority_to_ko(raw, texts)) == ['국내경제', None, '사회']
+    assert len(top_categories(raw, texts)) == 3